@@ -2,6 +2,7 @@
 Django settings for backend project.
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,12 +32,17 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'orders.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'orders.routing.SiteMiddleware',
+    'orders.profiling.ProfilingMiddleware',
+    'orders.querylog.SlowQueryLogMiddleware',
+    'orders.throttling.LoadSheddingMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -64,9 +70,163 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Transações que leem antes de gravar (reservas da doca, tarefas,
+            # alterações em lote) pegam o bloqueio de escrita já no BEGIN e
+            # esperam a vez em vez de falhar com "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Várias plantas (orders/routing.py): um banco por site, escolhido pelo
+# cabeçalho X-Site ou pelo host. O "default" guarda o catálogo
+# (fornecedores, usuários, tarefas). Sem SITE_DATABASES, um único banco.
+# Ex.: SITE_DATABASES="planta1=/dados/planta1.sqlite3,planta2=/dados/planta2.sqlite3"
+# Armazéns e hosts: SITES['planta1'].update(warehouses=['01', '02'], hosts=['planta1.local'])
+SITES = {}
+for _entry in filter(None, os.environ.get('SITE_DATABASES', '').split(',')):
+    _site, _path = _entry.split('=', 1)
+    DATABASES[_site] = {**DATABASES['default'], 'NAME': _path}
+    SITES[_site] = {'database': _site, 'warehouses': [], 'hosts': []}
+
+DATABASE_ROUTERS = ['orders.routing.SiteRouter']
+
+# Cache
+# Memória local por padrão; defina CACHE_REDIS_URL para compartilhar o
+# cache entre processos/servidores (ex.: redis://localhost:6379/1,
+# requer o pacote redis)
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'compras-chi',
+        }
+    }
+
+# Cache de respostas das listagens (orders/cache.py)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300  # segundos
+RESPONSE_CACHE_LOCK_TIMEOUT = 10  # espera máxima por outro processo
+
+# Profiling de requisições (orders/profiling.py)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+PROFILING_SAMPLE_RATE = 0.0  # fração das requisições perfiladas sem cabeçalho
+PROFILING_PATH_PREFIXES = ['/api/']
+PROFILING_RING_SIZE = 50  # perfis mantidos em memória
+PROFILING_TOP_FUNCTIONS = 30
+PROFILING_TREE_DEPTH = 25
+PROFILING_TREE_MIN_RATIO = 0.01  # omite nós com menos de 1% do tempo
+
+# Registro de consultas lentas (orders/querylog.py)
+SLOW_QUERY_LOG_ENABLED = True
+SLOW_QUERY_THRESHOLD_MS = 200
+SLOW_QUERY_LOG_MAX_ENTRIES = 1000
+
+# Diagnóstico de desempenho (orders/diagnostics.py)
+DIAGNOSTICS_BASELINE_FILE = BASE_DIR / 'diagnostics_baseline.json'
+DIAGNOSTICS_TOLERANCE = 0.5  # regressão quando o p95 piora mais de 50%
+
+# Change-log de alterações (orders/changelog.py)
+CHANGELOG_RETENTION_DAYS = 7
+
+# Endpoint de lote /api/batch/ (orders/batch.py)
+BATCH_MAX_REQUESTS = 10
+
+# Consulta por código de barras /api/lookup/ (orders/lookup.py)
+LOOKUP_CACHE_SIZE = 256  # acertos recentes guardados por processo; 0 desativa
+
+# Inclusão de recebimentos em lote via POST /api/deliveries/ (orders/duplicates.py)
+RECEIPT_CREATE_MAX_ROWS = 500
+
+# Calendário de follow-up /api/calendar/ (orders/followup.py)
+FOLLOWUP_CALENDAR_DAYS = 30
+FOLLOWUP_CALENDAR_MAX_DAYS = 366
+
+# Previsão do volume de recebimento /api/forecast/ (orders/forecast.py, requer numpy)
+FORECAST_DAYS = 14
+FORECAST_MAX_DAYS = 90
+FORECAST_HISTORY_DAYS = 3 * 365
+FORECAST_WINDOW_DAYS = 28
+FORECAST_SEASON_WEEKS = 52
+FORECAST_CACHE_TIMEOUT = 86400  # segundos; dados novos invalidam antes
+
+# Limite de requisições por cliente e rota (orders/throttling.py)
+THROTTLE_ENABLED = True
+# Estado dos baldes: memória do processo, ou o cache compartilhado quando há Redis
+THROTTLE_CACHE_ALIAS = 'default' if CACHE_REDIS_URL else None
+THROTTLE_BUDGETS = {
+    # escopo: (fichas por segundo, capacidade do balde)
+    'default': (10, 50),
+    'stats': (2, 20),
+    'health': (1, 10),
+}
+THROTTLE_ROUTES = {
+    'dashboard-stats': 'stats',
+    'health-check': 'health',
+}
+
+# Descarte de carga quando o banco fica lento (orders/throttling.py)
+LOAD_SHED_ENABLED = True
+LOAD_SHED_LATENCY_MS = 500  # média móvel da duração das consultas
+LOAD_SHED_WINDOW = 10  # segundos sem amostras até a média deixar de valer
+LOAD_SHED_EXEMPT = ['health-check', 'dashboard-stats']
+
+# Exportação colunar para BI (orders/columnar.py, comando export_columnar, requer pyarrow)
+EXPORT_DIR = BASE_DIR / 'exports'
+EXPORT_CHUNK_SIZE = 10000
+EXPORT_COMPRESSION = 'zstd'
+
+# Indicadores dos fornecedores /api/suppliers/scorecards/ (orders/scorecards.py)
+SCORECARDS_AUTO_UPDATE = True  # enfileira a atualização após o commit (run_jobs)
+SCORECARDS_BATCH_SIZE = 500
+SCORECARDS_REBUILD_CHUNK = 100  # fornecedores por transação no rebuild_scorecards
+
+# Alteração de status em lote /api/bulk-status/ (orders/bulk.py)
+BULK_STATUS_MAX_ROWS = 500
+
+# Reserva de recebimentos na doca (orders/dock.py)
+DOCK_CLAIM_LEASE_SECONDS = 300
+DOCK_CLAIM_MAX = 50
+DOCK_LOCK_TIMEOUT = 20  # segundos repetindo uma reserva com o banco bloqueado
+
+# Conciliação automática pedido <-> recebimento (orders/reconciliation.py)
+RECONCILIATION_WINDOW_DAYS = 90
+RECONCILIATION_BATCH_SIZE = 500
+
+# Arquivamento de pedidos encerrados (orders/archive.py)
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 500
+
+# Backup e restauração (orders/maintenance.py, tarefas backup e restore)
+BACKUP_CHUNK_SIZE = 1000  # registros entre dois avisos de progresso
+
+# Fila de tarefas em segundo plano (orders/jobs.py, comando run_jobs)
+JOBS_WORKER_PROCESSES = int(os.environ.get('JOBS_WORKER_PROCESSES', '2'))
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_DELAY = 10
+JOBS_POLL_INTERVAL = 1.0
+JOBS_STALE_AFTER = 300  # segundos sem sinal até a tarefa voltar à fila
+JOBS_HEARTBEAT_INTERVAL = 30  # sinal enviado por uma thread do worker durante a execução
+
+# Testes (orders/testing.py): classes distribuídas entre processos e tempo
+# total de cada execução completa registrado em TEST_TIMINGS_FILE
+TEST_RUNNER = 'orders.testing.FastTestRunner'
+TEST_PARALLEL = os.environ.get('TEST_PARALLEL', 'auto')  # 'auto' = um por núcleo; --parallel N tem precedência
+TEST_TARGET_SECONDS = 30
+TEST_TIMINGS_FILE = BASE_DIR / 'test_timings.jsonl'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -93,6 +253,30 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic gera nomes com hash e variantes .gz/.br (orders/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'orders.storage.PrecompressedManifestStaticFilesStorage',
+    },
+}
+
+# Servir STATIC_ROOT pelo Django (sem nginx na frente), com as variantes
+# pré-comprimidas e cache imutável para nomes com hash (orders/static.py)
+SERVE_STATIC = os.environ.get('SERVE_STATIC') == '1'
+STATIC_MAX_AGE = 3600  # segundos, para arquivos sem hash no nome
+
+# Compressão das respostas (orders/compression.py). O brotli só é usado
+# com o pacote `brotli` instalado.
+COMPRESSION_MIN_SIZE = 1024  # bytes
+COMPRESSION_LEVELS = {
+    'application/json': {'br': 4, 'gzip': 6},
+    'text/*': {'br': 5, 'gzip': 6},
+    'application/javascript': {'br': 5, 'gzip': 6},
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -106,6 +290,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'orders.throttling.TokenBucketThrottle',
+    ],
 }
 
 # CORS configuration - CORRIGIDO
@@ -130,8 +317,13 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'x-site',  # site escolhido pelo frontend (orders/routing.py)
 ]
 
+# Lido pelo frontend para esperar antes de repetir uma requisição após 429
+# (orders/throttling.py); sem isso o navegador o esconde em chamadas cross-origin
+CORS_EXPOSE_HEADERS = ['Retry-After']
+
 # Logging
 LOGGING = {
     'version': 1,
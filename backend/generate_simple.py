@@ -14,14 +14,13 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 from orders.models import Supplier, PurchaseOrder, DeliveryReceipt
+from orders.purge import purge_all
 
 
 def clear_data():
     """Remove todos os dados"""
     print("🗑️  Removendo dados existentes...")
-    DeliveryReceipt.objects.all().delete()
-    PurchaseOrder.objects.all().delete()
-    Supplier.objects.all().delete()
+    purge_all(progress=print)
     print("✅ Dados removidos!")
 
 
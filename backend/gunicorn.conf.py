@@ -0,0 +1,22 @@
+"""
+Configuração do gunicorn: gunicorn -c gunicorn.conf.py backend.wsgi:application
+
+Com preload_app o Django e os apps são carregados uma única vez no processo
+mestre e compartilhados (copy-on-write) pelos workers, em vez de cada worker
+repetir toda a inicialização.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+max_requests = 1000
+max_requests_jitter = 100
+
+
+def post_fork(server, worker):
+    # Conexões abertas no mestre não podem ser compartilhadas entre processos
+    from django.db import connections
+    connections.close_all()
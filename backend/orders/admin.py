@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Supplier, PurchaseOrder, DeliveryReceipt
+from .models import Supplier, PurchaseOrder, DeliveryReceipt, SlowQuery, ArchivedPurchaseOrder, ArchivedDeliveryReceipt, Job, SupplierScorecard
 
 @admin.register(Supplier)
 class SupplierAdmin(admin.ModelAdmin):
@@ -28,3 +28,46 @@ class DeliveryReceiptAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('supplier')
 
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'view', 'filters', 'duration_ms']
+    list_filter = ['view']
+    search_fields = ['sql', 'filters']
+    readonly_fields = ['created_at', 'duration_ms', 'sql', 'params', 'view', 'filters', 'plan']
+
+
+@admin.register(ArchivedPurchaseOrder)
+class ArchivedPurchaseOrderAdmin(admin.ModelAdmin):
+    list_display = ['numero_pc', 'fornecedor', 'data_emissao', 'status', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['numero_pc', 'fornecedor__name']
+    date_hierarchy = 'data_emissao'
+    list_select_related = ['fornecedor']
+
+
+@admin.register(ArchivedDeliveryReceipt)
+class ArchivedDeliveryReceiptAdmin(admin.ModelAdmin):
+    list_display = ['cargo_number', 'supplier', 'manifest_date', 'status', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['cargo_number', 'invoice_number']
+    list_select_related = ['supplier']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'progress', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['status', 'progress', 'message', 'result', 'error', 'attempts', 'worker',
+                       'heartbeat_at', 'created_at', 'started_at', 'finished_at']
+
+
+@admin.register(SupplierScorecard)
+class SupplierScorecardAdmin(admin.ModelAdmin):
+    list_display = ['supplier', 'orders_delivered', 'on_time_rate', 'avg_delay_days', 'p95_delay_days',
+                    'partial_ratio', 'avg_dwell_minutes', 'updated_at']
+    search_fields = ['supplier__code', 'supplier__name']
+    list_select_related = ['supplier']
+    readonly_fields = ['supplier', 'orders_total', 'orders_delivered', 'orders_on_time', 'orders_partial',
+                       'receipts_timed', 'on_time_rate', 'avg_delay_days', 'p95_delay_days', 'partial_ratio',
+                       'avg_dwell_minutes', 'updated_at']
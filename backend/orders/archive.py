@@ -0,0 +1,100 @@
+"""
+Arquivamento de pedidos encerrados (hot/cold).
+
+Pedidos FINALIZADO/CANCELADO emitidos há mais de ARCHIVE_AFTER_DAYS dias
+são movidos, com seus recebimentos, para ArchivedPurchaseOrder e
+ArchivedDeliveryReceipt. Cada lote é copiado e removido da tabela ativa na
+mesma transação, então o processo pode ser interrompido e executado de novo
+a qualquer momento: ele continua do que ainda está na tabela ativa.
+
+A cópia não ignora conflitos: se o arquivo já tiver um registro com o
+mesmo id ou número, ou se o número de linhas copiadas não bater com o
+lote, a transação é desfeita e nada sai da tabela ativa. A remoção é uma
+exclusão comum (os sinais gravam tombstones, change-log e invalidam o
+cache), e as listagens com ?include_archived=1 consultam as views
+PurchaseOrderHistory/DeliveryReceiptHistory.
+"""
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+
+from .models import ArchivedDeliveryReceipt, ArchivedPurchaseOrder, DeliveryReceipt, PurchaseOrder
+
+CLOSED_STATUSES = ['FINALIZADO', 'CANCELADO']
+
+ORDER_FIELDS = ['id', 'numero_pc', 'data_emissao', 'fornecedor_id', 'quantidade_itens',
+                'followup_date', 'armazenamento', 'status', 'updated_at']
+RECEIPT_FIELDS = ['id', 'cargo_number', 'manifest_date', 'supplier_id', 'invoice_number', 'issue_date',
+                  'manifest_time', 'entry_time', 'exit_time', 'status', 'purchase_order_id', 'updated_at']
+
+
+class ArchiveError(RuntimeError):
+    """Lote copiado de forma incompleta; a transação é desfeita"""
+
+
+def include_archived(request):
+    """Indica se a requisição pediu os registros arquivados (?include_archived=1)"""
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def archive_cutoff(today=None):
+    """Pedidos emitidos antes desta data podem ser arquivados"""
+    days = getattr(settings, 'ARCHIVE_AFTER_DAYS', 90)
+    return (today or date.today()) - timedelta(days=days)
+
+
+def candidates(cutoff):
+    return PurchaseOrder.objects.filter(status__in=CLOSED_STATUSES, data_emissao__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size):
+    """Move um lote de pedidos e seus recebimentos; retorna (pedidos, recebimentos)"""
+    with transaction.atomic(using=router.db_for_write(PurchaseOrder)):
+        orders = list(candidates(cutoff).order_by('id').values(*ORDER_FIELDS)[:batch_size])
+        if not orders:
+            return 0, 0
+        order_ids = [order['id'] for order in orders]
+        receipts = list(DeliveryReceipt.objects.filter(purchase_order_id__in=order_ids).values(*RECEIPT_FIELDS))
+        receipt_ids = [receipt['id'] for receipt in receipts]
+
+        ArchivedPurchaseOrder.objects.bulk_create([ArchivedPurchaseOrder(**order) for order in orders])
+        ArchivedDeliveryReceipt.objects.bulk_create([ArchivedDeliveryReceipt(**receipt) for receipt in receipts])
+        copied = (ArchivedPurchaseOrder.objects.filter(id__in=order_ids).count(),
+                  ArchivedDeliveryReceipt.objects.filter(id__in=receipt_ids).count())
+        if copied != (len(order_ids), len(receipt_ids)):
+            raise ArchiveError(f'Cópia incompleta: {copied} de {(len(order_ids), len(receipt_ids))}')
+
+        # Recebimentos antes dos pedidos: a cascata não pode levar nenhum
+        # recebimento que não foi copiado
+        receipt_label, order_label = DeliveryReceipt._meta.label, PurchaseOrder._meta.label
+        deleted = 0
+        if receipt_ids:
+            deleted = DeliveryReceipt.objects.filter(id__in=receipt_ids).delete()[1].get(receipt_label, 0)
+        by_model = PurchaseOrder.objects.filter(id__in=order_ids).delete()[1]
+        deleted += by_model.get(receipt_label, 0)
+        if (by_model.get(order_label, 0), deleted) != (len(order_ids), len(receipt_ids)):
+            raise ArchiveError('A tabela ativa mudou durante o arquivamento do lote')
+        return len(order_ids), len(receipt_ids)
+
+
+def archive_orders(cutoff=None, batch_size=None, max_batches=None):
+    """
+    Arquiva os pedidos encerrados em lotes. Retorna o total de pedidos e
+    recebimentos movidos.
+    """
+    if cutoff is None:
+        cutoff = archive_cutoff()
+    if batch_size is None:
+        batch_size = getattr(settings, 'ARCHIVE_BATCH_SIZE', 500)
+
+    totals = {'orders': 0, 'receipts': 0, 'batches': 0}
+    while max_batches is None or totals['batches'] < max_batches:
+        orders, receipts = archive_batch(cutoff, batch_size)
+        if not orders:
+            break
+        totals['orders'] += orders
+        totals['receipts'] += receipts
+        totals['batches'] += 1
+    return totals
@@ -0,0 +1,90 @@
+"""
+Execução de várias requisições GET da API numa única requisição HTTP.
+
+As sub-requisições são despachadas diretamente para as views de orders/urls.py,
+sem passar de novo por middleware, sessão e CORS, e compartilham a conexão
+com o banco e a data de referência da requisição principal.
+"""
+
+from datetime import date
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+# Cabeçalhos do corpo da requisição principal, sem sentido nas sub-requisições
+BODY_META_KEYS = ('CONTENT_LENGTH', 'CONTENT_TYPE')
+
+
+class BatchError(ValueError):
+    """Lote inválido (formato, tamanho ou rota não permitida)"""
+
+
+def reference_date(request):
+    """Data de referência da requisição, compartilhada pelas sub-requisições"""
+    return getattr(request, 'reference_date', None) or date.today()
+
+
+def parse_batch(payload):
+    """Valida o corpo {"requests": [{"id": ..., "path": ...}, ...]}"""
+    if not isinstance(payload, dict) or not isinstance(payload.get('requests'), list):
+        raise BatchError('Envie {"requests": [{"id": ..., "path": ...}]}.')
+
+    items = payload['requests']
+    max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 10)
+    if len(items) > max_requests:
+        raise BatchError(f'No máximo {max_requests} sub-requisições por lote.')
+
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError(f'Sub-requisição {index} sem "path".')
+        parsed.append((str(item.get('id', index)), item['path']))
+    return parsed
+
+
+def _sub_request(request, path, query_string, today):
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in BODY_META_KEYS}
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query_string)
+    sub.GET = QueryDict(query_string)
+    sub.COOKIES = request.COOKIES
+    sub.user = request.user
+    if hasattr(request, 'session'):
+        sub.session = request.session
+    sub.reference_date = today
+    return sub
+
+
+def run_batch(request, items):
+    """Executa as sub-requisições em ordem e retorna {id: {status, body}}"""
+    today = reference_date(request)
+    results = {}
+    for request_id, url in items:
+        parts = urlsplit(url)
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            results[request_id] = {'status': 404, 'body': {'detail': 'Rota não encontrada.'}}
+            continue
+
+        if not match.func.__module__.startswith('orders.') or match.url_name == 'batch':
+            results[request_id] = {'status': 400, 'body': {'detail': 'Rota não permitida em lote.'}}
+            continue
+
+        sub = _sub_request(request, parts.path, parts.query, today)
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Http404:
+            results[request_id] = {'status': 404, 'body': {'detail': 'Não encontrado.'}}
+            continue
+
+        body = getattr(response, 'data', None)
+        if body is None:
+            body = response.content.decode(response.charset or 'utf-8')
+        results[request_id] = {'status': response.status_code, 'body': body}
+    return results
@@ -0,0 +1,110 @@
+"""
+Alteração de status em lote, com controle otimista de concorrência.
+
+Cada linha traz a versão (sync_seq) que o cliente leu. Dentro de uma única
+transação as linhas são bloqueadas, as versões conferidas e, se nenhuma
+mudou, tudo é gravado com bulk_update: um UPDATE por lote em vez de um
+save() por registro. Qualquer conflito cancela o lote inteiro.
+
+O sinal bulk_updated é enviado uma vez por modelo, e não um post_save por
+linha, então o cache das listagens é invalidado uma única vez.
+"""
+
+from django.conf import settings
+from django.db import router, transaction
+
+from .models import DeliveryReceipt, PurchaseOrder
+from .signals import bulk_updated
+
+# recurso -> modelo
+RESOURCES = {
+    'orders': PurchaseOrder,
+    'deliveries': DeliveryReceipt,
+}
+
+
+class BulkStatusError(ValueError):
+    """Lote inválido (formato, tamanho ou status desconhecido)"""
+
+
+class VersionConflict(Exception):
+    """Linhas alteradas por outra pessoa desde a leitura, ou inexistentes"""
+
+    def __init__(self, conflicts):
+        super().__init__(f'{len(conflicts)} conflitos')
+        self.conflicts = conflicts
+
+
+def parse_bulk_status(payload):
+    """
+    Valida {"orders": [{"id", "status", "version"}], "deliveries": [...]}.
+    Retorna {recurso: {id: (status, versão)}}.
+    """
+    if not isinstance(payload, dict) or not set(payload) & set(RESOURCES):
+        raise BulkStatusError('Envie {"orders": [...]} e/ou {"deliveries": [...]}.')
+    unknown = sorted(set(payload) - set(RESOURCES))
+    if unknown:
+        raise BulkStatusError(f"Recursos desconhecidos: {', '.join(unknown)}")
+
+    max_rows = getattr(settings, 'BULK_STATUS_MAX_ROWS', 500)
+    if sum(len(rows) for rows in payload.values() if isinstance(rows, list)) > max_rows:
+        raise BulkStatusError(f'No máximo {max_rows} linhas por lote.')
+
+    changes = {}
+    for resource, rows in payload.items():
+        if not isinstance(rows, list):
+            raise BulkStatusError(f'"{resource}" deve ser uma lista.')
+        statuses = {choice for choice, _label in RESOURCES[resource].STATUS_CHOICES}
+        parsed = {}
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                raise BulkStatusError(f'{resource}[{index}] deve ser um objeto.')
+            pk, status, version = row.get('id'), row.get('status'), row.get('version')
+            if not isinstance(pk, int) or not isinstance(version, int):
+                raise BulkStatusError(f'{resource}[{index}]: "id" e "version" devem ser inteiros.')
+            if status not in statuses:
+                raise BulkStatusError(f'{resource}[{index}]: status inválido "{status}".')
+            if pk in parsed:
+                raise BulkStatusError(f'{resource}[{index}]: id {pk} repetido.')
+            parsed[pk] = (status, version)
+        changes[resource] = parsed
+    return changes
+
+
+def apply_bulk_status(changes):
+    """
+    Grava os novos status ou levanta VersionConflict sem alterar nada.
+    Retorna {recurso: [{"id", "version"}]} com as novas versões.
+    """
+    with transaction.atomic(using=router.db_for_write(PurchaseOrder)):
+        conflicts = []
+        pending = {}
+        for resource, rows in changes.items():
+            model = RESOURCES[resource]
+            current = {
+                obj.pk: obj
+                for obj in model.objects.select_for_update().filter(pk__in=rows).only('id', 'status', 'sync_seq')
+            }
+            pending[resource] = []
+            for pk, (status, version) in rows.items():
+                obj = current.get(pk)
+                if obj is None:
+                    conflicts.append({'resource': resource, 'id': pk, 'reason': 'not_found'})
+                elif obj.sync_seq != version:
+                    conflicts.append({'resource': resource, 'id': pk, 'reason': 'version',
+                                      'current_version': obj.sync_seq, 'current_status': obj.status})
+                elif obj.status != status:
+                    obj.status = status
+                    pending[resource].append(obj)
+
+        if conflicts:
+            raise VersionConflict(conflicts)
+
+        updated = {}
+        for resource, objs in pending.items():
+            model = RESOURCES[resource]
+            if objs:
+                model.objects.bulk_update(objs, ['status'])
+                bulk_updated.send(sender=model, ids=[obj.pk for obj in objs], fields=['status'])
+            updated[resource] = [{'id': obj.pk, 'version': obj.sync_seq} for obj in objs]
+        return updated
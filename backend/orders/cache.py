@@ -0,0 +1,144 @@
+"""
+Cache de respostas das listagens com invalidação por tags.
+
+Cada entrada é indexada pelos parâmetros normalizados da requisição e pela
+versão atual das tags (uma por modelo). Invalidar uma tag troca sua versão,
+o que torna todas as entradas antigas inalcançáveis sem precisar varrê-las.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .routing import current_site
+
+# Tags por modelo
+TAG_ORDERS = 'orders'
+TAG_SUPPLIERS = 'suppliers'
+TAG_DELIVERIES = 'deliveries'
+
+# Locks locais por faixa de hash: coalescem requisições do mesmo processo
+_LOCK_STRIPES = [threading.Lock() for _ in range(64)]
+
+
+def get_cache():
+    """Retorna o backend de cache configurado para as respostas"""
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _tag_key(tag):
+    return f'resp-tag:{tag}'
+
+
+def get_tag_versions(tags):
+    """Retorna a versão atual de cada tag, criando as que não existem"""
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() evita sobrescrever uma versão criada por outro processo
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    """Invalida todas as respostas associadas às tags"""
+    get_cache().set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+
+
+def normalize_query_params(query_params):
+    """Normaliza os parâmetros: ordem fixa e sem valores vazios"""
+    normalized = []
+    for key in sorted(query_params.keys()):
+        values = sorted(v for v in query_params.getlist(key) if v != '')
+        if values:
+            normalized.append((key, values))
+    return normalized
+
+
+def build_cache_key(prefix, query_params, tags):
+    """Monta a chave a partir dos parâmetros e das versões das tags"""
+    material = repr((
+        normalize_query_params(query_params),
+        get_tag_versions(tags),
+        # is_delayed/delay_days dependem da data atual
+        date.today().isoformat(),
+        # Cada site tem seus próprios dados (orders/routing.py)
+        current_site(),
+    ))
+    digest = hashlib.sha1(material.encode('utf-8')).hexdigest()
+    return f'resp:{prefix}:{digest}'
+
+
+def get_or_compute(key, compute, timeout=None):
+    """
+    Busca a chave no cache ou calcula o valor uma única vez.
+
+    Após uma invalidação, apenas uma requisição recalcula a resposta; as
+    demais aguardam o resultado em vez de repetir as mesmas consultas.
+    """
+    cache = get_cache()
+    if timeout is None:
+        timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+    value = cache.get(key)
+    if value is not None:
+        return value, True
+
+    with _LOCK_STRIPES[hash(key) % len(_LOCK_STRIPES)]:
+        value = cache.get(key)
+        if value is not None:
+            return value, True
+
+        # Lock distribuído entre processos (cache.add é atômico)
+        lock_key = f'{key}:lock'
+        lock_timeout = getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 10)
+        if cache.add(lock_key, 1, lock_timeout):
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+            finally:
+                cache.delete(lock_key)
+            return value, False
+
+        # Outro processo está calculando: aguardar o resultado
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value, True
+
+        value = compute()
+        cache.set(key, value, timeout)
+        return value, False
+
+
+class CachedListMixin:
+    """Mixin para ListAPIView que guarda a resposta serializada no cache"""
+
+    cache_prefix = None
+    cache_tags = ()
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+            return super().list(request, *args, **kwargs)
+
+        prefix = self.cache_prefix or type(self).__name__
+        key = build_cache_key(prefix, request.query_params, self.cache_tags)
+
+        def compute():
+            return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+        data, hit = get_or_compute(key, compute)
+        response = Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
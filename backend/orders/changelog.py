@@ -0,0 +1,67 @@
+"""
+Consumo e manutenção do change-log (ChangeLogEntry).
+
+As entradas são notificações de "o registro X mudou": o consumidor lê o
+estado atual do registro quando precisar dos dados. Isso permite compactar
+o log mantendo apenas a entrada mais recente de cada registro.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import ChangeLogConsumer, ChangeLogEntry
+
+ENTRY_FIELDS = ('id', 'resource', 'object_id', 'action', 'fields', 'created_at')
+
+
+def read_batch(after_id=0, limit=1000, resources=None):
+    """Lê até `limit` entradas com id maior que `after_id`, em ordem"""
+    queryset = ChangeLogEntry.objects.filter(id__gt=after_id)
+    if resources:
+        queryset = queryset.filter(resource__in=resources)
+    return list(queryset.order_by('id').values(*ENTRY_FIELDS)[:limit])
+
+
+def consume(name, handler, batch_size=1000, resources=None):
+    """
+    Entrega ao handler o próximo lote do consumidor `name` e avança sua
+    posição na mesma transação. Se o handler falhar, a posição não muda e o
+    lote é entregue novamente na próxima chamada. Retorna o tamanho do lote.
+    """
+    with transaction.atomic(using=router.db_for_write(ChangeLogConsumer)):
+        consumer, _ = ChangeLogConsumer.objects.select_for_update().get_or_create(name=name)
+        batch = read_batch(consumer.position, batch_size, resources)
+        if batch:
+            handler(batch)
+            consumer.position = batch[-1]['id']
+            consumer.save(update_fields=['position', 'updated_at'])
+        return len(batch)
+
+
+def compact():
+    """Remove entradas substituídas por uma mais recente do mesmo registro"""
+    latest = (ChangeLogEntry.objects.values('resource', 'object_id')
+              .annotate(latest_id=Max('id')).values('latest_id'))
+    deleted, _ = ChangeLogEntry.objects.exclude(id__in=latest).delete()
+    return deleted
+
+
+def expire(retention_days=None):
+    """
+    Remove entradas mais antigas que a retenção e já processadas por todos
+    os consumidores registrados.
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, 'CHANGELOG_RETENTION_DAYS', 7)
+    queryset = ChangeLogEntry.objects.filter(
+        created_at__lt=timezone.now() - timedelta(days=retention_days)
+    )
+    slowest = ChangeLogConsumer.objects.aggregate(position=Min('position'))['position']
+    if slowest is not None:
+        queryset = queryset.filter(id__lte=slowest)
+    deleted, _ = queryset.delete()
+    return deleted
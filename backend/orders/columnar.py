@@ -0,0 +1,274 @@
+"""
+Exportação colunar (Parquet ou Arrow IPC) para as ferramentas de BI.
+
+Cada tabela é lida do banco em blocos (values_list + iterator), convertida
+direto para colunas Arrow com esquema fixo e gravada comprimida. Status e
+armazém são colunas de dicionário: poucos valores distintos repetidos em
+milhões de linhas.
+
+Layout em EXPORT_DIR:
+
+    suppliers/suppliers.parquet                       (foto completa)
+    orders/data_emissao=AAAA-MM-DD/part.parquet       (uma partição por dia)
+    deliveries/manifest_date=AAAA-MM-DD/part.parquet
+
+A data da partição fica só no nome do diretório (convenção hive), e não
+dentro dos arquivos; dataset() abre uma tabela já com essa coluna tipada.
+
+Pedidos e recebimentos incluem os arquivados (coluna "archived"), lidos
+das duas tabelas em ordem de data e intercalados. No modo incremental só
+são gravados os dias a partir da última partição existente; ela é
+regravada, pois pode ter sido exportada com o dia ainda em andamento. Cada
+arquivo é gravado num temporário e renomeado, então um leitor nunca vê uma
+partição pela metade. A exportação completa (full) regrava tudo e remove
+as partições de dias que não existem mais.
+
+No formato Arrow é usado o stream IPC (.arrows): o arquivo IPC não aceita
+um dicionário diferente a cada bloco.
+
+O pyarrow é opcional para o restante do sistema: sem ele, apenas a
+exportação fica indisponível.
+"""
+
+import heapq
+import os
+from datetime import date
+from itertools import groupby, islice
+from pathlib import Path
+
+from django.conf import settings
+
+from .models import ArchivedDeliveryReceipt, ArchivedPurchaseOrder, DeliveryReceipt, PurchaseOrder, Supplier
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = pq = None
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrows'}
+
+
+class ExportError(ValueError):
+    """Parâmetros inválidos da exportação"""
+
+
+class ExportUnavailable(RuntimeError):
+    """pyarrow não instalado"""
+
+
+def is_available():
+    return pa is not None
+
+
+class Table:
+    """
+    Uma tabela exportada: colunas (nome, tipo Arrow), fontes (modelo,
+    arquivado) e, se particionada, o campo de data da partição.
+    """
+
+    def __init__(self, name, columns, sources, partition_by=None, dictionary=()):
+        self.name = name
+        self.columns = columns
+        self.sources = sources
+        self.partition_by = partition_by
+        self.dictionary = list(dictionary)
+
+    @property
+    def fields(self):
+        return [name for name, _type in self.columns]
+
+    def schema(self):
+        """Esquema dos arquivos: todas as colunas menos a da partição"""
+        types = dict(self.columns)
+        fields = [pa.field(name, pa.dictionary(pa.int32(), pa.string()) if name in self.dictionary else types[name])
+                  for name in self.fields if name != self.partition_by]
+        if len(self.sources) > 1:
+            fields.append(pa.field('archived', pa.bool_()))
+        return pa.schema(fields)
+
+
+def _tables():
+    string, date32, int64 = pa.string(), pa.date32(), pa.int64()
+    timestamp, time = pa.timestamp('us', tz='UTC'), pa.time64('us')
+    return {
+        'suppliers': Table('suppliers', [
+            ('id', int64), ('code', string), ('name', string), ('status', string), ('updated_at', timestamp),
+        ], [(Supplier, False)], dictionary=['status']),
+        'orders': Table('orders', [
+            ('id', int64), ('numero_pc', string), ('data_emissao', date32), ('fornecedor_id', int64),
+            ('quantidade_itens', int64), ('followup_date', date32), ('armazenamento', string),
+            ('status', string), ('updated_at', timestamp),
+        ], [(PurchaseOrder, False), (ArchivedPurchaseOrder, True)],
+            partition_by='data_emissao', dictionary=['armazenamento', 'status']),
+        'deliveries': Table('deliveries', [
+            ('id', int64), ('cargo_number', string), ('manifest_date', date32), ('supplier_id', int64),
+            ('invoice_number', string), ('issue_date', date32), ('manifest_time', time), ('entry_time', time),
+            ('exit_time', time), ('status', string), ('purchase_order_id', int64), ('updated_at', timestamp),
+        ], [(DeliveryReceipt, False), (ArchivedDeliveryReceipt, True)],
+            partition_by='manifest_date', dictionary=['status']),
+    }
+
+
+def _flagged(rows, archived):
+    for row in rows:
+        yield row + (archived,)
+
+
+def _read(table, since, chunk_size):
+    """Linhas (..., arquivado) das fontes da tabela, em ordem de partição"""
+    streams = []
+    for model, archived in table.sources:
+        queryset = model._base_manager.all()
+        if table.partition_by:
+            if since:
+                queryset = queryset.filter(**{f'{table.partition_by}__gte': since})
+            queryset = queryset.order_by(table.partition_by, 'id')
+        else:
+            queryset = queryset.order_by('id')
+        rows = queryset.values_list(*table.fields).iterator(chunk_size=chunk_size)
+        streams.append(_flagged(rows, archived))
+    if not table.partition_by:
+        return streams[0]
+    position = table.fields.index(table.partition_by)
+    return heapq.merge(*streams, key=lambda row: row[position])
+
+
+def _batch(table, schema, rows):
+    """Bloco de linhas -> RecordBatch, coluna a coluna"""
+    position = {name: index for index, name in enumerate(table.fields + ['archived'])}
+    arrays = []
+    for field in schema:
+        values = [row[position[field.name]] for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _Writer:
+    """Grava um arquivo em blocos (row groups) via temporário + rename"""
+
+    def __init__(self, path, schema, file_format, compression):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.temporary = self.path.with_name(f'.{self.path.name}.tmp')
+        self.rows = 0
+        if file_format == 'parquet':
+            self.writer = pq.ParquetWriter(self.temporary, schema, compression=compression, use_dictionary=True)
+        else:
+            self.sink = pa.OSFile(str(self.temporary), 'wb')
+            self.writer = pa.ipc.new_stream(self.sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        self.writer.close()
+        if hasattr(self, 'sink'):
+            self.sink.close()
+        os.replace(self.temporary, self.path)
+
+    def abort(self):
+        self.writer.close()
+        if hasattr(self, 'sink'):
+            self.sink.close()
+        self.temporary.unlink(missing_ok=True)
+
+
+def partitions(directory, table, extension):
+    """{dia: arquivo} das partições já exportadas no formato informado"""
+    root = Path(directory) / table.name
+    prefix = f'{table.partition_by}='
+    if not root.is_dir():
+        return {}
+    return {date.fromisoformat(entry.name[len(prefix):]): entry / f'part{extension}'
+            for entry in root.iterdir()
+            if entry.name.startswith(prefix) and (entry / f'part{extension}').exists()}
+
+
+def export_table(name, directory=None, full=False, file_format='parquet', chunk_size=None, progress=None):
+    """
+    Exporta uma tabela. Retorna {"table", "rows", "files", "since"}, com
+    since = primeiro dia regravado no modo incremental (None = tudo).
+    """
+    if pa is None:
+        raise ExportUnavailable('Instale o pacote pyarrow para exportar em formato colunar.')
+    if file_format not in FORMATS:
+        raise ExportError(f"format deve ser um de: {', '.join(FORMATS)}")
+    tables = _tables()
+    if name not in tables:
+        raise ExportError(f"tabela deve ser uma de: {', '.join(tables)}")
+
+    table = tables[name]
+    directory = Path(directory or getattr(settings, 'EXPORT_DIR', settings.BASE_DIR / 'exports'))
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 10000)
+    compression = getattr(settings, 'EXPORT_COMPRESSION', 'zstd')
+    schema = table.schema()
+    extension = FORMATS[file_format]
+
+    existing = partitions(directory, table, extension) if table.partition_by else {}
+    since = None if full or not existing else max(existing)
+    rows = _read(table, since, chunk_size)
+
+    if table.partition_by:
+        position = table.fields.index(table.partition_by)
+        groups = groupby(rows, key=lambda row: row[position])
+    else:
+        groups = [(None, rows)]
+
+    total = files = 0
+    written = set()
+    for day, day_rows in groups:
+        if day is None:
+            path = directory / table.name / f'{table.name}{extension}'
+        else:
+            path = directory / table.name / f'{table.partition_by}={day.isoformat()}' / f'part{extension}'
+        writer = _Writer(path, schema, file_format, compression)
+        try:
+            while True:
+                chunk = list(islice(day_rows, chunk_size))
+                if not chunk:
+                    break
+                writer.write(_batch(table, schema, chunk))
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        written.add(day)
+        total += writer.rows
+        files += 1
+        if progress:
+            progress(table.name, day, total)
+
+    # Dias sem nenhuma linha agora (excluídas desde a última exportação)
+    for day, path in existing.items():
+        if day not in written and (since is None or day >= since):
+            path.unlink()
+            if not any(path.parent.iterdir()):
+                path.parent.rmdir()
+
+    return {'table': table.name, 'rows': total, 'files': files, 'since': since.isoformat() if since else None}
+
+
+def dataset(name, directory=None, file_format='parquet'):
+    """Abre uma tabela exportada como pyarrow.dataset, com a coluna da partição"""
+    import pyarrow.dataset as ds
+
+    table = _tables()[name]
+    directory = Path(directory or getattr(settings, 'EXPORT_DIR', settings.BASE_DIR / 'exports'))
+    partitioning = None
+    if table.partition_by:
+        partitioning = ds.partitioning(pa.schema([(table.partition_by, pa.date32())]), flavor='hive')
+    return ds.dataset(directory / table.name, format='parquet' if file_format == 'parquet' else 'ipc',
+                      partitioning=partitioning)
+
+
+def export_all(names=None, directory=None, full=False, file_format='parquet', chunk_size=None, progress=None):
+    """Exporta as tabelas informadas (padrão: todas), na ordem de _tables()"""
+    if pa is None:
+        raise ExportUnavailable('Instale o pacote pyarrow para exportar em formato colunar.')
+    names = names or list(_tables())
+    return [export_table(name, directory, full, file_format, chunk_size, progress) for name in names]
@@ -0,0 +1,149 @@
+"""
+Compressão de respostas e de arquivos estáticos.
+
+CompressionMiddleware negocia brotli ou gzip pelo Accept-Encoding para
+respostas acima de COMPRESSION_MIN_SIZE, com níveis por tipo de conteúdo em
+COMPRESSION_LEVELS. O brotli é opcional: sem o pacote `brotli` instalado,
+apenas gzip é oferecido.
+
+precompress_file() gera as variantes .gz/.br dos arquivos estáticos no build
+(collectstatic e o comando precompress_static), com o nível máximo, já que
+o custo é pago uma única vez.
+"""
+
+import gzip
+import os
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+# Níveis usados quando o tipo de conteúdo não está em COMPRESSION_LEVELS
+DEFAULT_LEVELS = {
+    'application/json': {'br': 4, 'gzip': 6},
+    'text/*': {'br': 5, 'gzip': 6},
+}
+
+# Extensões de texto que valem a pena pré-comprimir
+PRECOMPRESS_EXTENSIONS = ('.js', '.mjs', '.css', '.html', '.json', '.svg', '.txt', '.xml', '.map', '.ico')
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def accepted_encodings(accept_encoding):
+    """Codificações disponíveis aceitas pelo cliente, em ordem de preferência"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.strip().lower()] = quality
+
+    # q=0 recusa explicitamente a codificação
+    return [
+        encoding for encoding in available_encodings()
+        if accepted.get(encoding, accepted.get('*', 0)) > 0
+    ]
+
+
+def choose_encoding(accept_encoding):
+    """Melhor codificação aceita pelo cliente, ou None"""
+    encodings = accepted_encodings(accept_encoding)
+    return encodings[0] if encodings else None
+
+
+def levels_for(content_type):
+    """Níveis de compressão do tipo de conteúdo, ou None se não deve comprimir"""
+    levels = getattr(settings, 'COMPRESSION_LEVELS', DEFAULT_LEVELS)
+    media_type = content_type.split(';')[0].strip().lower()
+    if media_type in levels:
+        return levels[media_type]
+    wildcard = media_type.split('/')[0] + '/*'
+    return levels.get(wildcard)
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Comprime respostas grandes com brotli ou gzip"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        levels = levels_for(response.get('Content-Type', ''))
+        if not levels:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        encoding = next((candidate for candidate in accepted if candidate in levels), None)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding, levels[encoding])
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # O ETag forte deixa de valer para o corpo comprimido
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+def precompress_file(path, min_size=None):
+    """Grava path.gz e path.br ao lado do arquivo; retorna as variantes criadas"""
+    if min_size is None:
+        min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+    if not path.endswith(PRECOMPRESS_EXTENSIONS) or os.path.getsize(path) < min_size:
+        return []
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    created = []
+    for encoding, suffix, level in (('gzip', '.gz', 9), ('br', '.br', 11)):
+        if encoding not in available_encodings():
+            continue
+        compressed = compress(data, encoding, level)
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            created.append(path + suffix)
+    return created
+
+
+def precompress_directory(root, min_size=None):
+    """Pré-comprime todos os arquivos de texto de um diretório"""
+    created = []
+    for directory, _subdirs, files in os.walk(root):
+        for name in files:
+            created.extend(precompress_file(os.path.join(directory, name), min_size))
+    return created
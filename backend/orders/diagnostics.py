@@ -0,0 +1,229 @@
+"""
+Diagnóstico de desempenho e saúde do banco de dados.
+
+Executa e cronometra consultas representativas da API (estatísticas do
+dashboard, primeira página da listagem e busca), coleta tamanhos de tabelas
+e índices, uso de índices e fragmentação, e compara os percentis com uma
+linha de base gravada em DIAGNOSTICS_BASELINE_FILE. Com vários sites, o
+banco examinado é o do site atual (orders/routing.py).
+"""
+
+import json
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import DeliveryReceipt, PurchaseOrder, Supplier
+
+OPEN_STATUSES = ['PENDENTE', 'PARCIAL']
+
+
+def _stats_query():
+    today = date.today()
+    open_orders = PurchaseOrder.objects.filter(status__in=OPEN_STATUSES)
+    open_orders.filter(followup_date=today).count()
+    open_orders.filter(followup_date__lt=today).count()
+    open_orders.filter(followup_date=today + timedelta(days=1)).count()
+    DeliveryReceipt.objects.filter(manifest_date=today, status='FINALIZADO').count()
+
+
+def _first_page_query():
+    queryset = PurchaseOrder.objects.select_related('fornecedor').order_by('-data_emissao')
+    queryset.count()
+    list(queryset[:11])
+
+
+def _search_query():
+    term = 'PC'
+    queryset = (PurchaseOrder.objects.select_related('fornecedor')
+                .filter(Q(numero_pc__icontains=term)
+                        | Q(fornecedor__name__icontains=term)
+                        | Q(fornecedor__code__icontains=term))
+                .order_by('-data_emissao'))
+    queryset.count()
+    list(queryset[:11])
+
+
+# Consultas representativas, todas efetivamente executadas
+BENCHMARKS = {
+    'stats': _stats_query,
+    'first_page': _first_page_query,
+    'search': _search_query,
+}
+
+
+def percentile(values, pct):
+    """Percentil por interpolação linear"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_benchmarks(repeat=20):
+    """Executa cada consulta `repeat` vezes e retorna os percentis em ms"""
+    if repeat < 1:
+        raise ValueError("repeat deve ser pelo menos 1")
+    results = {}
+    for name, query in BENCHMARKS.items():
+        query()  # aquecimento
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'p50': round(percentile(timings, 50), 3),
+            'p95': round(percentile(timings, 95), 3),
+            'p99': round(percentile(timings, 99), 3),
+            'max': round(max(timings), 3),
+        }
+    return results
+
+
+def _connection():
+    """Conexão do banco dos pedidos (o do site atual)"""
+    return connections[router.db_for_read(PurchaseOrder)]
+
+
+def _app_tables():
+    return [model._meta.db_table for model in (Supplier, PurchaseOrder, DeliveryReceipt)]
+
+
+def _sqlite_storage():
+    tables = _app_tables()
+    with _connection().cursor() as cursor:
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_count')
+        page_count = cursor.fetchone()[0]
+        cursor.execute('PRAGMA freelist_count')
+        freelist = cursor.fetchone()[0]
+
+        indexes = {}
+        for table in tables:
+            cursor.execute(f'PRAGMA index_list("{table}")')
+            indexes[table] = [row[1] for row in cursor.fetchall()]
+
+        sizes = {}
+        try:
+            # dbstat só existe quando o SQLite é compilado com SQLITE_ENABLE_DBSTAT_VTAB
+            cursor.execute('SELECT name, SUM(pgsize), SUM(unused) FROM dbstat GROUP BY name')
+            sizes = {name: (size, unused) for name, size, unused in cursor.fetchall()}
+        except Exception:
+            pass
+
+    report = {'tables': {}, 'fragmentation': round(freelist / page_count, 4) if page_count else 0.0,
+              'database_bytes': page_size * page_count}
+    for table in tables:
+        size, unused = sizes.get(table, (None, None))
+        report['tables'][table] = {
+            'bytes': size,
+            'unused_ratio': round(unused / size, 4) if size else None,
+            # SQLite não mantém contadores de uso de índice
+            'indexes': {name: {'bytes': sizes.get(name, (None, None))[0], 'scans': None}
+                        for name in indexes[table]},
+        }
+    return report
+
+
+def _postgresql_storage():
+    tables = _app_tables()
+    report = {'tables': {}}
+    with _connection().cursor() as cursor:
+        cursor.execute('SELECT pg_database_size(current_database())')
+        report['database_bytes'] = cursor.fetchone()[0]
+        for table in tables:
+            cursor.execute(
+                'SELECT pg_relation_size(%s), n_live_tup, n_dead_tup '
+                'FROM pg_stat_user_tables WHERE relname = %s', [table, table])
+            size, live, dead = cursor.fetchone() or (None, 0, 0)
+            cursor.execute(
+                'SELECT indexrelname, pg_relation_size(indexrelid), idx_scan '
+                'FROM pg_stat_user_indexes WHERE relname = %s', [table])
+            report['tables'][table] = {
+                'bytes': size,
+                'unused_ratio': round(dead / (live + dead), 4) if live + dead else 0.0,
+                'indexes': {name: {'bytes': index_size, 'scans': scans}
+                            for name, index_size, scans in cursor.fetchall()},
+            }
+    return report
+
+
+def storage_report():
+    """Tamanho de tabelas e índices e fragmentação do banco"""
+    vendor = _connection().vendor
+    if vendor == 'postgresql':
+        return _postgresql_storage()
+    if vendor == 'sqlite':
+        return _sqlite_storage()
+    return {'tables': {}}
+
+
+def index_usage():
+    """Indica, pelo plano de execução, se cada consulta representativa usa índice"""
+    queries = {
+        'stats': PurchaseOrder.objects.filter(status__in=OPEN_STATUSES, followup_date=date.today()),
+        'first_page': PurchaseOrder.objects.order_by('-data_emissao')[:11],
+        'search': PurchaseOrder.objects.filter(numero_pc__icontains='PC'),
+    }
+    usage = {}
+    for name, queryset in queries.items():
+        plan = queryset.explain()
+        usage[name] = {
+            'uses_index': 'INDEX' in plan.upper(),
+            'plan': plan,
+        }
+    return usage
+
+
+def baseline_path():
+    return Path(getattr(settings, 'DIAGNOSTICS_BASELINE_FILE', settings.BASE_DIR / 'diagnostics_baseline.json'))
+
+
+def load_baseline():
+    path = baseline_path()
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(benchmarks):
+    with open(baseline_path(), 'w', encoding='utf-8') as f:
+        json.dump(benchmarks, f, indent=2)
+
+
+def compare_with_baseline(benchmarks, baseline, tolerance=None):
+    """Lista as consultas cujo p95 piorou além da tolerância"""
+    if tolerance is None:
+        tolerance = getattr(settings, 'DIAGNOSTICS_TOLERANCE', 0.5)
+    regressions = []
+    for name, current in benchmarks.items():
+        previous = (baseline or {}).get(name)
+        if not previous:
+            continue
+        limit = previous['p95'] * (1 + tolerance)
+        if current['p95'] > limit:
+            regressions.append({'query': name, 'baseline_p95': previous['p95'], 'current_p95': current['p95']})
+    return regressions
+
+
+def run_diagnostics(repeat=20):
+    """Relatório completo de diagnóstico"""
+    benchmarks = run_benchmarks(repeat)
+    baseline = load_baseline()
+    return {
+        'benchmarks': benchmarks,
+        'storage': storage_report(),
+        'index_usage': index_usage(),
+        'baseline': baseline,
+        'regressions': compare_with_baseline(benchmarks, baseline),
+    }
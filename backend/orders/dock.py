@@ -0,0 +1,117 @@
+"""
+Fila de trabalho da doca: reserva de recebimentos pendentes por operador.
+
+Vários terminais pedem "os próximos N recebimentos" ao mesmo tempo. A
+reserva fica na própria linha (claimed_by, claim_token, claim_expires_at)
+e vale por DOCK_CLAIM_LEASE_SECONDS; depois disso o recebimento volta para
+a fila, mesmo que o terminal tenha caído sem liberar.
+
+No PostgreSQL as linhas são escolhidas com SELECT ... FOR UPDATE SKIP
+LOCKED, então terminais concorrentes pulam as linhas que outro está
+reservando em vez de esperar por elas. No SQLite, que não tem bloqueio por
+linha, a escolha e a reserva são um único UPDATE ... WHERE id IN (SELECT
+... LIMIT n), executado sob o bloqueio de escrita do banco. Quando o
+SQLite devolve "locked" sem esperar o timeout (ex.: banco em memória com
+cache compartilhado), a operação inteira é repetida com espera crescente
+por até DOCK_LOCK_TIMEOUT segundos.
+
+As reservas são gravadas pelo manager base: não mudam a versão (sync_seq)
+do recebimento nem geram entradas no change-log.
+"""
+
+import functools
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DeliveryReceipt
+from .signals import bulk_updated
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'DOCK_CLAIM_LEASE_SECONDS', 300))
+
+
+def retry_locked(func):
+    """Repete a operação (a transação inteira) enquanto o SQLite estiver bloqueado"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        using = router.db_for_write(DeliveryReceipt)
+        deadline = time.monotonic() + getattr(settings, 'DOCK_LOCK_TIMEOUT', 20)
+        delay = 0.001
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                # Dentro de uma transação maior não dá para repetir só este trecho
+                if ('locked' not in str(exc) or connections[using].in_atomic_block
+                        or time.monotonic() + delay > deadline):
+                    raise
+            time.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, 0.1)
+    return wrapper
+
+
+def available(now):
+    """Recebimentos pendentes sem reserva válida, na ordem de atendimento"""
+    return (DeliveryReceipt._base_manager
+            .filter(status='PENDENTE')
+            .filter(Q(claim_expires_at__isnull=True) | Q(claim_expires_at__lte=now))
+            .order_by('manifest_date', 'id'))
+
+
+@retry_locked
+def claim(operator, count=1):
+    """Reserva até `count` recebimentos para o operador e os retorna"""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    changes = {'claimed_by': operator, 'claim_token': token, 'claim_expires_at': now + lease_duration()}
+
+    using = router.db_for_write(DeliveryReceipt)
+    with transaction.atomic(using=using):
+        if connections[using].features.has_select_for_update_skip_locked:
+            ids = list(available(now).select_for_update(skip_locked=True, of=('self',))
+                       .values_list('id', flat=True)[:count])
+            DeliveryReceipt._base_manager.filter(id__in=ids).update(**changes)
+        else:
+            # A condição é repetida fora da subconsulta para nunca tomar uma reserva válida
+            available(now).filter(id__in=available(now).values('id')[:count]).update(**changes)
+
+        # Lido na mesma transação: ou a reserva é devolvida, ou não acontece
+        return list(DeliveryReceipt._base_manager.select_related('supplier')
+                    .filter(claim_token=token).order_by('manifest_date', 'id'))
+
+
+@retry_locked
+def release(operator, ids, complete=False):
+    """
+    Libera as reservas do operador. Com complete, os recebimentos também são
+    finalizados (alteração registrada normalmente). Retorna quantos foram liberados.
+    """
+    now = timezone.now()
+    cleared = {'claimed_by': '', 'claim_token': '', 'claim_expires_at': None}
+    with transaction.atomic(using=router.db_for_write(DeliveryReceipt)):
+        mine = list(DeliveryReceipt._base_manager
+                    .filter(id__in=ids, claimed_by=operator, claim_expires_at__gt=now)
+                    .values_list('id', flat=True))
+        if complete and mine:
+            DeliveryReceipt.objects.filter(id__in=mine).update(status='FINALIZADO', **cleared)
+            bulk_updated.send(sender=DeliveryReceipt, ids=mine, fields=['status'])
+        else:
+            DeliveryReceipt._base_manager.filter(id__in=mine).update(**cleared)
+    return len(mine)
+
+
+@retry_locked
+def renew(operator, ids):
+    """Estende o prazo das reservas ainda válidas do operador"""
+    now = timezone.now()
+    return (DeliveryReceipt._base_manager
+            .filter(id__in=ids, claimed_by=operator, claim_expires_at__gt=now)
+            .update(claim_expires_at=now + lease_duration()))
@@ -0,0 +1,83 @@
+"""
+Detecção de notas fiscais recebidas em duplicidade.
+
+Cada nota de um fornecedor só pode ser recebida uma vez: a restrição
+unique_supplier_invoice em DeliveryReceipt garante isso no banco, e o
+índice dela atende a verificação em lote. Um lote de notas é conferido com
+uma única consulta (fornecedor IN ... AND nota IN ...), refinada em memória
+para os pares exatos, antes de qualquer escrita.
+
+Só a tabela ativa é verificada: recebimentos arquivados não entram na
+restrição.
+"""
+
+from django.db import IntegrityError, router, transaction
+
+from .models import DeliveryReceipt
+from .signals import bulk_updated
+
+
+class DuplicateInvoice(Exception):
+    """Notas já recebidas ou repetidas no próprio lote"""
+
+    def __init__(self, duplicates):
+        super().__init__(f'{len(duplicates)} notas duplicadas')
+        self.duplicates = duplicates
+
+
+def existing_invoices(pairs):
+    """
+    Dos pares (fornecedor_id, nota) informados, retorna {par: id do
+    recebimento} dos que já existem. Uma consulta, qualquer que seja o lote.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    rows = (DeliveryReceipt._base_manager
+            .filter(supplier_id__in={supplier for supplier, _ in pairs},
+                    invoice_number__in={invoice for _, invoice in pairs})
+            .values_list('supplier_id', 'invoice_number', 'id'))
+    return {(supplier, invoice): pk for supplier, invoice, pk in rows if (supplier, invoice) in pairs}
+
+
+def check_invoices(pairs):
+    """
+    Confere um lote de pares (fornecedor_id, nota) e retorna a lista de
+    duplicidades: {"index", "supplier", "invoice_number", "reason"}, com
+    reason "exists" (e "existing_id") ou "repeated" (e "first_index").
+    """
+    pairs = list(pairs)
+    existing = existing_invoices(pairs)
+    duplicates = []
+    first_seen = {}
+    for index, (supplier, invoice) in enumerate(pairs):
+        row = {'index': index, 'supplier': supplier, 'invoice_number': invoice}
+        if (supplier, invoice) in first_seen:
+            duplicates.append({**row, 'reason': 'repeated', 'first_index': first_seen[(supplier, invoice)]})
+            continue
+        first_seen[(supplier, invoice)] = index
+        if (supplier, invoice) in existing:
+            duplicates.append({**row, 'reason': 'exists', 'existing_id': existing[(supplier, invoice)]})
+    return duplicates
+
+
+def create_receipts(receipts):
+    """
+    Grava os recebimentos (instâncias não salvas) num único INSERT em lote,
+    ou levanta DuplicateInvoice sem gravar nenhum.
+    """
+    pairs = [(receipt.supplier_id, receipt.invoice_number) for receipt in receipts]
+    try:
+        with transaction.atomic(using=router.db_for_write(DeliveryReceipt)):
+            duplicates = check_invoices(pairs)
+            if duplicates:
+                raise DuplicateInvoice(duplicates)
+            created = DeliveryReceipt.objects.bulk_create(receipts)
+            bulk_updated.send(sender=DeliveryReceipt, ids=[receipt.pk for receipt in created], fields=None)
+    except IntegrityError:
+        # Outra transação gravou a mesma nota entre a verificação e o INSERT
+        duplicates = check_invoices(pairs)
+        if not duplicates:
+            raise
+        raise DuplicateInvoice(duplicates)
+    return created
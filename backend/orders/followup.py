@@ -0,0 +1,82 @@
+"""
+Calendário de follow-up: carga prevista de pedidos em aberto por dia.
+
+Todo o horizonte sai de uma única consulta agrupada por followup_date (e
+opcionalmente por armazém ou fornecedor), apoiada no índice (status,
+followup_date). Os dias sem pedidos são preenchidos com zero em memória.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from .models import PurchaseOrder
+
+OPEN_STATUSES = ['PENDENTE', 'PARCIAL']
+
+# ?group_by= -> coluna do agrupamento
+GROUPINGS = {
+    'armazenamento': 'armazenamento',
+    'fornecedor': 'fornecedor__code',
+}
+
+# ?<filtro>= -> lookup
+FILTERS = {
+    'armazenamento': 'armazenamento',
+    'fornecedor__code': 'fornecedor__code',
+}
+
+
+class CalendarError(ValueError):
+    """Parâmetros inválidos do calendário"""
+
+
+def parse_days(value):
+    """Horizonte em dias, entre 1 e FOLLOWUP_CALENDAR_MAX_DAYS"""
+    max_days = getattr(settings, 'FOLLOWUP_CALENDAR_MAX_DAYS', 366)
+    if value in (None, ''):
+        return getattr(settings, 'FOLLOWUP_CALENDAR_DAYS', 30)
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        raise CalendarError('days deve ser um inteiro.')
+    if not 1 <= days <= max_days:
+        raise CalendarError(f'days deve estar entre 1 e {max_days}.')
+    return days
+
+
+def followup_calendar(start, days, group_by=None, filters=None):
+    """
+    Retorna uma entrada por dia de [start, start + days):
+    {"date", "orders", "items"} e, com group_by, "groups" com o mesmo
+    total por armazém ou fornecedor.
+    """
+    if group_by is not None and group_by not in GROUPINGS:
+        raise CalendarError(f"group_by deve ser um de: {', '.join(GROUPINGS)}")
+
+    end = start + timedelta(days=days)
+    queryset = PurchaseOrder.objects.filter(
+        status__in=OPEN_STATUSES, followup_date__gte=start, followup_date__lt=end)
+    for name, value in (filters or {}).items():
+        queryset = queryset.filter(**{FILTERS[name]: value})
+
+    columns = ['followup_date'] + ([GROUPINGS[group_by]] if group_by else [])
+    rows = (queryset.values(*columns)
+            .annotate(orders=Count('id'), items=Sum('quantidade_itens'))
+            .order_by(*columns))
+
+    calendar = {}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        calendar[day] = {'date': day.isoformat(), 'orders': 0, 'items': 0}
+        if group_by:
+            calendar[day]['groups'] = {}
+
+    for row in rows:
+        entry = calendar[row['followup_date']]
+        entry['orders'] += row['orders']
+        entry['items'] += row['items'] or 0
+        if group_by:
+            entry['groups'][row[GROUPINGS[group_by]]] = {'orders': row['orders'], 'items': row['items'] or 0}
+    return list(calendar.values())
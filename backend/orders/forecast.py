@@ -0,0 +1,202 @@
+"""
+Previsão do volume diário de recebimento por armazém.
+
+O histórico (pedidos por followup_date, recebimentos por manifest_date,
+ativos e arquivados) é agregado no banco por dia, armazém e fornecedor e
+lido em blocos direto para arrays NumPy: uma matriz série x dia, com uma
+série por par (armazém, fornecedor).
+
+O modelo é ajustado de uma vez para todas as séries, sem laço em Python:
+nível = média móvel dos últimos FORECAST_WINDOW_DAYS dias, multiplicado
+pelo índice do dia da semana (média do dia / média geral nas últimas
+FORECAST_SEASON_WEEKS semanas). As previsões das séries são somadas por
+armazém ou fornecedor, e o erro médio absoluto é medido refazendo o ajuste
+sem os últimos dias do histórico.
+
+O NumPy é opcional para o restante do sistema: sem ele, apenas a previsão
+fica indisponível. Ele só é importado quando uma previsão é calculada, para
+não pesar na inicialização de cada processo (orders.views importa este
+módulo).
+"""
+
+from datetime import date, timedelta
+from importlib.util import find_spec
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from .models import ArchivedDeliveryReceipt, ArchivedPurchaseOrder, DeliveryReceipt, PurchaseOrder, Supplier
+
+# medida -> consultas (modelo, data, armazém, fornecedor, agregação, exclusões)
+MEASURES = {
+    'receipts': [
+        (DeliveryReceipt, 'manifest_date', 'purchase_order__armazenamento', 'supplier_id', Count('id'), {}),
+        (ArchivedDeliveryReceipt, 'manifest_date', 'purchase_order__armazenamento', 'supplier_id', Count('id'), {}),
+    ],
+    'orders': [
+        (PurchaseOrder, 'followup_date', 'armazenamento', 'fornecedor_id', Count('id'), {'status': 'CANCELADO'}),
+        (ArchivedPurchaseOrder, 'followup_date', 'armazenamento', 'fornecedor_id', Count('id'), {'status': 'CANCELADO'}),
+    ],
+    'items': [
+        (PurchaseOrder, 'followup_date', 'armazenamento', 'fornecedor_id', Sum('quantidade_itens'), {'status': 'CANCELADO'}),
+        (ArchivedPurchaseOrder, 'followup_date', 'armazenamento', 'fornecedor_id', Sum('quantidade_itens'), {'status': 'CANCELADO'}),
+    ],
+}
+
+GROUPINGS = ('armazenamento', 'fornecedor')
+
+CHUNK_SIZE = 10000
+
+
+class ForecastError(ValueError):
+    """Parâmetros inválidos da previsão"""
+
+
+class ForecastUnavailable(RuntimeError):
+    """NumPy não instalado"""
+
+
+def is_available():
+    return find_spec('numpy') is not None
+
+
+class History:
+    """Matriz série x dia; keys[i] = (armazém, fornecedor_id) da linha i"""
+
+    def __init__(self, values, keys, start):
+        self.values = values
+        self.keys = keys
+        self.start = start
+
+    @property
+    def days(self):
+        return self.values.shape[1]
+
+
+def load_history(measure, start, end):
+    """
+    Agrega o histórico de [start, end) no banco e o lê em blocos de
+    CHUNK_SIZE linhas, convertidos direto para arrays.
+    """
+    if not is_available():
+        raise ForecastUnavailable('Instale o pacote numpy para usar a previsão.')
+    if measure not in MEASURES:
+        raise ForecastError(f"measure deve ser um de: {', '.join(MEASURES)}")
+    import numpy as np
+
+    keys = {}
+    series_parts, day_parts, value_parts = [], [], []
+    origin = start.toordinal()
+    for model, date_field, warehouse, supplier, aggregate, exclude in MEASURES[measure]:
+        rows = (model.objects.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end})
+                .exclude(**exclude)
+                .values_list(date_field, warehouse, supplier)
+                .annotate(total=aggregate)
+                .order_by()
+                .iterator(chunk_size=CHUNK_SIZE))
+        while True:
+            chunk = list(islice(rows, CHUNK_SIZE))
+            if not chunk:
+                break
+            count = len(chunk)
+            day_parts.append(np.fromiter((row[0].toordinal() for row in chunk), np.int64, count) - origin)
+            series_parts.append(np.fromiter(
+                (keys.setdefault((row[1] or '', row[2]), len(keys)) for row in chunk), np.int64, count))
+            value_parts.append(np.fromiter((row[3] or 0 for row in chunk), np.float64, count))
+
+    values = np.zeros((len(keys), (end - start).days))
+    if keys:
+        np.add.at(values, (np.concatenate(series_parts), np.concatenate(day_parts)), np.concatenate(value_parts))
+    return History(values, list(keys), start)
+
+
+def weekdays(first, days):
+    """Dia da semana (segunda = 0) de `days` dias a partir de `first`"""
+    import numpy as np
+
+    return (np.arange(days) + first.toordinal() - 1) % 7
+
+
+def fit(values, start, window, season_weeks):
+    """
+    Ajusta todas as séries de uma vez. Retorna o nível (séries,) e o índice
+    semanal (séries, 7).
+    """
+    import numpy as np
+
+    days = values.shape[1]
+    window = max(1, min(window, days))
+    level = values[:, -window:].mean(axis=1)
+
+    season_days = max(1, min(season_weeks * 7, days))
+    recent = values[:, -season_days:]
+    weekday = weekdays(start + timedelta(days=days - season_days), season_days)
+    onehot = (weekday[:, None] == np.arange(7)).astype(np.float64)
+    by_weekday = recent @ onehot / np.maximum(onehot.sum(axis=0), 1)
+    overall = recent.mean(axis=1, keepdims=True)
+    index = np.divide(by_weekday, overall, out=np.ones_like(by_weekday), where=overall > 0)
+    return level, index
+
+
+def predict(level, index, first, days):
+    """Previsão (séries, days) a partir de `first`"""
+    return level[:, None] * index[:, weekdays(first, days)]
+
+
+def forecast(measure='receipts', days=None, group_by='armazenamento', today=None):
+    """
+    Previsão diária a partir de hoje, somada por armazém ou fornecedor.
+    Retorna {"dates", "series": [{"key", "forecast", "mae"}], ...}.
+    """
+    import numpy as np
+
+    if group_by not in GROUPINGS:
+        raise ForecastError(f"group_by deve ser um de: {', '.join(GROUPINGS)}")
+    days = days or getattr(settings, 'FORECAST_DAYS', 14)
+    window = getattr(settings, 'FORECAST_WINDOW_DAYS', 28)
+    season_weeks = getattr(settings, 'FORECAST_SEASON_WEEKS', 52)
+    today = today or date.today()
+    start = today - timedelta(days=getattr(settings, 'FORECAST_HISTORY_DAYS', 3 * 365))
+
+    history = load_history(measure, start, today)
+    level, index = fit(history.values, start, window, season_weeks)
+    predicted = predict(level, index, today, days)
+
+    # Erro do mesmo modelo ajustado sem os últimos `days` dias
+    holdout = min(days, history.days - 1)
+    if holdout > 0:
+        past_level, past_index = fit(history.values[:, :-holdout], start, window, season_weeks)
+        residuals = (predict(past_level, past_index, today - timedelta(days=holdout), holdout)
+                     - history.values[:, -holdout:])
+
+    # Soma as séries de cada grupo
+    if group_by == 'armazenamento':
+        labels = [warehouse for warehouse, _supplier in history.keys]
+    else:
+        codes = Supplier.objects.in_bulk({supplier for _warehouse, supplier in history.keys})
+        labels = [codes[supplier].code if supplier in codes else str(supplier)
+                  for _warehouse, supplier in history.keys]
+    groups = sorted(set(labels))
+    position = {label: i for i, label in enumerate(groups)}
+    member = np.fromiter((position[label] for label in labels), np.int64, len(labels))
+
+    totals = np.zeros((len(groups), days))
+    np.add.at(totals, member, predicted)
+    if holdout > 0:
+        errors = np.zeros((len(groups), holdout))
+        np.add.at(errors, member, residuals)
+        mae = np.abs(errors).mean(axis=1)
+    else:
+        mae = np.zeros(len(groups))
+
+    return {
+        'measure': measure,
+        'group_by': group_by,
+        'history_start': start.isoformat(),
+        'dates': [(today + timedelta(days=offset)).isoformat() for offset in range(days)],
+        'series': [
+            {'key': label, 'forecast': [round(float(v), 2) for v in totals[i]], 'mae': round(float(mae[i]), 2)}
+            for i, label in enumerate(groups)
+        ],
+    }
@@ -0,0 +1,348 @@
+"""
+Gerador de dados para teste do sistema de pedidos de compra.
+Cria dados realistas para demonstração e testes.
+"""
+
+import random
+from datetime import date, timedelta
+
+from .models import Supplier, PurchaseOrder, DeliveryReceipt
+from .purge import purge_all
+
+
+class TestDataGenerator:
+    """Gerador de dados de teste"""
+    
+    def __init__(self):
+        self.suppliers = []
+        self.purchase_orders = []
+        self.deliveries = []
+        
+        # Dados realistas para fornecedores
+        self.supplier_data = [
+            ("FOR001", "ALPHA MATERIAIS INDUSTRIAIS LTDA"),
+            ("FOR002", "BETA COMERCIAL E INDUSTRIAL S.A."),
+            ("FOR003", "GAMMA DISTRIBUIDORA DE PRODUTOS"),
+            ("FOR004", "DELTA MATERIAIS ELÉTRICOS LTDA"),
+            ("FOR005", "EPSILON COMPONENTES ELETRÔNICOS"),
+            ("FOR006", "ZETA FERRAMENTAS E EQUIPAMENTOS"),
+            ("FOR007", "ETA PRODUTOS QUÍMICOS LTDA"),
+            ("FOR008", "THETA MATERIAIS DE CONSTRUÇÃO"),
+            ("FOR009", "IOTA EQUIPAMENTOS INDUSTRIAIS"),
+            ("FOR010", "KAPPA PRODUTOS QUÍMICOS LTDA"),
+            ("FOR011", "LAMBDA DISTRIBUIDORA GERAL"),
+            ("FOR012", "MU MATERIAIS ESPECIAIS S.A."),
+            ("FOR013", "NU COMPONENTES AUTOMOTIVOS"),
+            ("FOR014", "XI FERRAMENTAS PROFISSIONAIS"),
+            ("FOR015", "OMICRON EQUIPAMENTOS LTDA"),
+        ]
+        
+        # Status possíveis
+        self.status_options = ["PENDENTE", "PARCIAL", "FINALIZADO"]
+        
+        # Armazéns disponíveis
+        self.storage_options = ["01", "02", "03", "04", "05"]
+    
+    def clear_existing_data(self):
+        """Remove todos os dados existentes"""
+        print("🗑️  Removendo dados existentes...")
+        purge_all(progress=print)
+        print("✅ Dados removidos com sucesso!")
+    
+    def create_suppliers(self):
+        """Cria fornecedores"""
+        print("👥 Criando fornecedores...")
+        
+        for code, name in self.supplier_data:
+            supplier = Supplier.objects.create(
+                code=code,
+                name=name,
+                status='ATIVO'
+            )
+            self.suppliers.append(supplier)
+        
+        print(f"✅ {len(self.suppliers)} fornecedores criados!")
+    
+    def create_purchase_orders(self, quantity=50):
+        """Cria pedidos de compra"""
+        print(f"📋 Criando {quantity} pedidos de compra...")
+        
+        today = date.today()
+        
+        for i in range(quantity):
+            # Número do pedido sequencial
+            number = f"PC2024{i+1:03d}"
+            
+            # Data de emissão (últimos 60 dias)
+            issue_date = today - timedelta(days=random.randint(1, 60))
+            
+            # Fornecedor aleatório
+            supplier = random.choice(self.suppliers)
+            
+            # Quantidade de itens (1-50)
+            items_count = random.randint(1, 50)
+            
+            # Data de followup baseada na data de emissão
+            days_ahead = random.randint(-5, 15)  # Pode ser atrasado ou futuro
+            followup_date = today + timedelta(days=days_ahead)
+            
+            # Armazém aleatório
+            warehouse = random.choice(self.storage_options)
+            
+            # Status baseado na data de followup
+            if followup_date < today:
+                # Pedidos atrasados têm maior chance de estar pendentes
+                status = random.choices(
+                    self.status_options,
+                    weights=[70, 20, 10]  # 70% pendente, 20% parcial, 10% finalizado
+                )[0]
+            elif followup_date == today:
+                # Pedidos de hoje
+                status = random.choices(
+                    self.status_options,
+                    weights=[50, 30, 20]  # 50% pendente, 30% parcial, 20% finalizado
+                )[0]
+            else:
+                # Pedidos futuros são principalmente pendentes
+                status = random.choices(
+                    self.status_options,
+                    weights=[85, 10, 5]   # 85% pendente, 10% parcial, 5% finalizado
+                )[0]
+            
+            purchase_order = PurchaseOrder.objects.create(
+                numero_pc=number,
+                data_emissao=issue_date,
+                fornecedor=supplier,
+                quantidade_itens=items_count,
+                followup_date=followup_date,
+                armazenamento=warehouse,
+                status=status
+            )
+            
+            self.purchase_orders.append(purchase_order)
+        
+        print(f"✅ {len(self.purchase_orders)} pedidos de compra criados!")
+    
+    def create_deliveries(self):
+        """Cria recebimentos para alguns pedidos"""
+        print("📦 Criando recebimentos...")
+        
+        # Criar alguns recebimentos básicos
+        today = date.today()
+        
+        for i in range(5):
+            supplier = random.choice(self.suppliers)
+            
+            delivery = DeliveryReceipt.objects.create(
+                cargo_number=f"CG{i+1:03d}",
+                manifest_date=today - timedelta(days=random.randint(0, 7)),
+                supplier=supplier,
+                invoice_number=f"NF{i+1:03d}",
+                issue_date=today - timedelta(days=random.randint(0, 5)),
+                status=random.choice(["PENDENTE", "FINALIZADO"])
+            )
+            
+            self.deliveries.append(delivery)
+        
+        print(f"✅ {len(self.deliveries)} recebimentos criados!")
+    
+    def create_specific_scenarios(self):
+        """Cria cenários específicos para demonstração"""
+        print("🎯 Criando cenários específicos...")
+        
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        yesterday = today - timedelta(days=1)
+        
+        # Cenário 1: Pedidos para hoje
+        for i in range(5):
+            supplier = random.choice(self.suppliers)
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024T{i+1:02d}",
+                data_emissao=today - timedelta(days=random.randint(1, 10)),
+                fornecedor=supplier,
+                quantidade_itens=random.randint(5, 25),
+                followup_date=today,
+                armazenamento=random.choice(self.storage_options),
+                status="PENDENTE"
+            )
+        
+        # Cenário 2: Pedidos atrasados
+        for i in range(8):
+            supplier = random.choice(self.suppliers)
+            days_late = random.randint(1, 10)
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024A{i+1:02d}",
+                data_emissao=today - timedelta(days=days_late + 5),
+                fornecedor=supplier,
+                quantidade_itens=random.randint(5, 30),
+                followup_date=today - timedelta(days=days_late),
+                armazenamento=random.choice(self.storage_options),
+                status="PENDENTE"
+            )
+        
+        # Cenário 3: Pedidos para amanhã
+        for i in range(3):
+            supplier = random.choice(self.suppliers)
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024M{i+1:02d}",
+                data_emissao=today - timedelta(days=random.randint(1, 5)),
+                fornecedor=supplier,
+                quantidade_itens=random.randint(3, 20),
+                followup_date=tomorrow,
+                armazenamento=random.choice(self.storage_options),
+                status="PENDENTE"
+            )
+        
+        # Cenário 4: Recebimentos finalizados hoje
+        for i in range(4):
+            supplier = random.choice(self.suppliers)
+            po = PurchaseOrder.objects.create(
+                numero_pc=f"PC2024F{i+1:02d}",
+                data_emissao=today - timedelta(days=random.randint(5, 15)),
+                fornecedor=supplier,
+                quantidade_itens=random.randint(5, 25),
+                followup_date=yesterday,
+                armazenamento=random.choice(self.storage_options),
+                status="FINALIZADO"
+            )
+            
+            # Criar recebimento
+            DeliveryReceipt.objects.create(
+                cargo_number=f"CGF{i+1:03d}",
+                manifest_date=today,
+                supplier=supplier,
+                invoice_number=f"NFF{i+1:03d}",
+                issue_date=po.data_emissao,
+                purchase_order=po,
+                status="FINALIZADO"
+            )
+        
+        print("✅ Cenários específicos criados!")
+    
+    def create_history(self, years=3, orders_per_day=30, batch_size=2000):
+        """
+        Cria anos de histórico sintético (pedidos e recebimentos) com padrão
+        semanal, pesos por armazém e tendência leve, para a previsão e seus
+        benchmarks. Pedidos passados têm um recebimento finalizado.
+        """
+        if not self.suppliers:
+            self.suppliers = list(Supplier.objects.all())
+        if not self.suppliers:
+            self.create_suppliers()
+        
+        print(f"📈 Criando {years} anos de histórico (~{orders_per_day} pedidos/dia)...")
+        
+        today = date.today()
+        start = today - timedelta(days=365 * years)
+        # Segunda a domingo
+        weekday_weights = [1.3, 1.2, 1.0, 1.0, 0.9, 0.4, 0.1]
+        storage_weights = [40, 25, 15, 12, 8]
+        sequence = PurchaseOrder.objects.count() + 1
+        
+        orders, total_orders, total_receipts = [], 0, 0
+        total_days = (today - start).days + 30
+        for offset in range(total_days):
+            day = start + timedelta(days=offset)
+            trend = 0.8 + 0.4 * offset / total_days
+            expected = orders_per_day * weekday_weights[day.weekday()] * trend
+            for _ in range(max(0, round(random.gauss(expected, expected ** 0.5)))):
+                orders.append(PurchaseOrder(
+                    numero_pc=f"PCH{sequence:07d}",
+                    data_emissao=day - timedelta(days=random.randint(5, 30)),
+                    fornecedor=random.choice(self.suppliers),
+                    quantidade_itens=random.randint(1, 50),
+                    followup_date=day,
+                    armazenamento=random.choices(self.storage_options, weights=storage_weights)[0],
+                    status="FINALIZADO" if day < today else "PENDENTE",
+                ))
+                sequence += 1
+            if len(orders) >= batch_size or offset == total_days - 1:
+                created = PurchaseOrder.objects.bulk_create(orders)
+                receipts = [
+                    DeliveryReceipt(
+                        cargo_number=f"CGH{order.numero_pc[3:]}",
+                        manifest_date=order.followup_date,
+                        supplier=order.fornecedor,
+                        invoice_number=f"NFH{order.numero_pc[3:]}",
+                        issue_date=order.data_emissao,
+                        status="FINALIZADO",
+                        purchase_order=order,
+                    )
+                    for order in created if order.followup_date < today
+                ]
+                DeliveryReceipt.objects.bulk_create(receipts)
+                total_orders += len(created)
+                total_receipts += len(receipts)
+                orders = []
+        
+        print(f"✅ {total_orders} pedidos e {total_receipts} recebimentos históricos criados!")
+    
+    def print_statistics(self):
+        """Exibe estatísticas dos dados criados"""
+        print("\n📊 ESTATÍSTICAS DOS DADOS CRIADOS")
+        print("=" * 50)
+        
+        # Fornecedores
+        total_suppliers = Supplier.objects.count()
+        print(f"👥 Fornecedores: {total_suppliers}")
+        
+        # Pedidos de compra
+        total_orders = PurchaseOrder.objects.count()
+        print(f"📋 Pedidos de Compra: {total_orders}")
+        
+        # Por status
+        for status in self.status_options:
+            count = PurchaseOrder.objects.filter(status=status).count()
+            print(f"   - {status}: {count}")
+        
+        # Por data
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        
+        today_orders = PurchaseOrder.objects.filter(followup_date=today).count()
+        tomorrow_orders = PurchaseOrder.objects.filter(followup_date=tomorrow).count()
+        delayed_orders = PurchaseOrder.objects.filter(followup_date__lt=today).count()
+        
+        print(f"📅 Por Data:")
+        print(f"   - Hoje: {today_orders}")
+        print(f"   - Amanhã: {tomorrow_orders}")
+        print(f"   - Atrasados: {delayed_orders}")
+        
+        # Recebimentos
+        total_deliveries = DeliveryReceipt.objects.count()
+        today_deliveries = DeliveryReceipt.objects.filter(manifest_date=today).count()
+        
+        print(f"📦 Recebimentos: {total_deliveries}")
+        print(f"   - Hoje: {today_deliveries}")
+        
+        # Por armazém
+        print(f"🏪 Por Armazém:")
+        for storage in self.storage_options:
+            count = PurchaseOrder.objects.filter(armazenamento=storage).count()
+            print(f"   - Armazém {storage}: {count}")
+        
+        print("=" * 50)
+    
+    def generate_all(self, clear_data=True, orders_quantity=50, history_years=0):
+        """Gera todos os dados de teste"""
+        print("🚀 INICIANDO GERAÇÃO DE DADOS DE TESTE")
+        print("=" * 50)
+        
+        if clear_data:
+            self.clear_existing_data()
+        
+        self.create_suppliers()
+        self.create_purchase_orders(orders_quantity)
+        self.create_deliveries()
+        self.create_specific_scenarios()
+        if history_years:
+            self.create_history(history_years)
+        self.print_statistics()
+        
+        print("\n🎉 GERAÇÃO DE DADOS CONCLUÍDA COM SUCESSO!")
+        print("=" * 50)
+        print("💡 Dicas:")
+        print("   - Acesse http://localhost:8000/admin para ver os dados")
+        print("   - Use http://localhost:5173 para ver o frontend")
+        print("   - Execute 'python manage.py test' para rodar os testes")
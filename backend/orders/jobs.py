@@ -0,0 +1,312 @@
+"""
+Fila de tarefas em segundo plano, guardada no próprio banco.
+
+As operações pesadas (backup, restauração, arquivamento, diagnóstico e
+VACUUM) são enfileiradas como Job e executadas pelos processos do comando
+`run_jobs`, sem broker externo. Um worker reserva a próxima tarefa com um
+UPDATE condicional (só um worker consegue mudar QUEUED -> RUNNING), informa
+o progresso pelo JobContext e, em caso de erro, a tarefa volta para a fila
+com espera exponencial até esgotar max_attempts.
+
+Enquanto a tarefa roda, uma thread do worker atualiza heartbeat_at a cada
+JOBS_HEARTBEAT_INTERVAL segundos, mesmo que ela não informe progresso. Só
+uma tarefa sem sinal há JOBS_STALE_AFTER segundos (worker morto) volta à
+fila, e falha de vez se já esgotou as tentativas, para que uma tarefa que
+derruba o worker não seja repetida para sempre.
+
+A fila fica no catálogo (banco "default"), mas cada tarefa guarda o site
+em que foi enfileirada (cabeçalho X-Site, variável SITE) e roda com esse
+site ativo, no banco dele.
+
+O cancelamento de uma tarefa na fila é imediato; uma tarefa em execução é
+interrompida na próxima chamada de ctx.progress().
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .routing import current_site, use_site
+
+logger = logging.getLogger(__name__)
+
+# tipo -> função(ctx, **params)
+JOBS = {}
+# tipo -> função(**params) que levanta ValueError para parâmetros inválidos
+VALIDATORS = {}
+
+
+class JobCancelled(Exception):
+    """Levantada em ctx.progress() quando o cancelamento foi solicitado"""
+
+
+def register(kind, validate=None):
+    """
+    Registra a função como executora das tarefas do tipo `kind`. Com
+    `validate`, os parâmetros são conferidos ao enfileirar.
+    """
+    def decorator(func):
+        JOBS[kind] = func
+        if validate:
+            VALIDATORS[kind] = validate
+        return func
+    return decorator
+
+
+class JobContext:
+    """Acesso da tarefa em execução ao seu progresso e cancelamento"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def progress(self, done, total=None, message=''):
+        percent = round(100 * done / total, 1) if total else done
+        Job.objects.filter(pk=self.job.pk).update(
+            progress=min(percent, 100), message=message[:200], heartbeat_at=timezone.now())
+        if Job.objects.filter(pk=self.job.pk, cancel_requested=True).exists():
+            raise JobCancelled()
+
+
+class Heartbeat:
+    """Thread que mantém heartbeat_at atualizado enquanto a tarefa roda"""
+
+    def __init__(self, job_id, interval=None):
+        self.job_id = job_id
+        self.interval = interval or getattr(settings, 'JOBS_HEARTBEAT_INTERVAL', 30)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'job-{job_id}-heartbeat', daemon=True)
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    Job.objects.filter(pk=self.job_id, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+                except Exception:
+                    # Banco ocupado: tenta de novo no próximo intervalo
+                    logger.warning('Falha ao registrar o sinal da tarefa %s', self.job_id, exc_info=True)
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def enqueue(kind, params=None, max_attempts=None, site=None):
+    """Coloca uma tarefa na fila, no site atual por padrão, e retorna o Job criado"""
+    if kind not in JOBS:
+        raise ValueError(f"Tipo de tarefa desconhecido: {kind}")
+    if kind in VALIDATORS:
+        VALIDATORS[kind](**(params or {}))
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'JOBS_MAX_ATTEMPTS', 3)
+    return Job.objects.create(kind=kind, params=params or {}, max_attempts=max_attempts,
+                              site=site or current_site() or '')
+
+
+def cancel(job_id):
+    """Cancela a tarefa; retorna False se ela já tinha terminado"""
+    if Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.CANCELLED, cancel_requested=True, finished_at=timezone.now()):
+        return True
+    return bool(Job.objects.filter(pk=job_id, status=Job.RUNNING).update(cancel_requested=True))
+
+
+def requeue_stale():
+    """
+    Devolve à fila as tarefas cujo worker parou de dar sinal; as que já
+    esgotaram as tentativas são marcadas como falhas. Retorna quantas voltaram.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=getattr(settings, 'JOBS_STALE_AFTER', 300)))
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, error='O worker parou de dar sinal durante a última tentativa.', finished_at=now)
+    return stale.update(status=Job.QUEUED, worker='', run_after=now)
+
+
+def claim_next(worker):
+    """Reserva a próxima tarefa pronta para execução, ou None"""
+    now = timezone.now()
+    candidates = (Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+                  .order_by('run_after', 'id').values_list('pk', flat=True)[:5])
+    for pk in candidates:
+        # Outro worker pode ter reservado a mesma tarefa antes
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, started_at=now, heartbeat_at=now,
+            attempts=F('attempts') + 1)
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Executa a tarefa reservada e grava o resultado, a falha ou a nova tentativa"""
+    handler = JOBS.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"Tipo de tarefa desconhecido: {job.kind}")
+        with Heartbeat(job.pk), use_site(job.site or None):
+            result = handler(JobContext(job), **job.params)
+    except JobCancelled:
+        Job.objects.filter(pk=job.pk).update(status=Job.CANCELLED, finished_at=timezone.now())
+        return Job.CANCELLED
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Tarefa %s falhou (tentativa %s): %s', job.pk, job.attempts, error)
+        if job.attempts < job.max_attempts and handler is not None:
+            delay = getattr(settings, 'JOBS_RETRY_DELAY', 10) * 2 ** (job.attempts - 1)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED, error=error, worker='',
+                run_after=timezone.now() + timedelta(seconds=delay))
+            return Job.QUEUED
+        Job.objects.filter(pk=job.pk).update(status=Job.FAILED, error=error, finished_at=timezone.now())
+        return Job.FAILED
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.SUCCEEDED, result=result, progress=100, finished_at=timezone.now())
+    return Job.SUCCEEDED
+
+
+def work(worker=None, poll_interval=None, max_jobs=None, stop=None, drain=False):
+    """
+    Laço do worker: reserva e executa tarefas até `stop()` retornar True ou
+    `max_jobs` tarefas terem sido executadas. Com drain (ou max_jobs),
+    termina também quando não há tarefa pronta.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'JOBS_POLL_INTERVAL', 1.0)
+    executed = 0
+    while not (stop and stop()):
+        close_old_connections()
+        requeue_stale()
+        job = claim_next(worker)
+        if job is None:
+            if drain or max_jobs is not None:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        executed += 1
+        if max_jobs is not None and executed >= max_jobs:
+            break
+    return executed
+
+
+# Tarefas disponíveis
+
+@register('backup')
+def backup_job(ctx, file=None):
+    from .maintenance import ManagementCommands
+
+    def progress(done, total):
+        ctx.progress(done, total, message=f'Exportando {done}/{total} registros')
+
+    ManagementCommands().backup_data(file, progress)
+    return {'file': file}
+
+
+@register('restore')
+def restore_job(ctx, file):
+    from .maintenance import ManagementCommands
+
+    def progress(done, total):
+        ctx.progress(done, total, message=f'Importando {done}/{total} registros')
+
+    # Cancelada durante a carga, a restauração fica parcial: rode-a de novo
+    ManagementCommands().restore_data(file, progress)
+    return {'file': file}
+
+
+@register('archive_orders')
+def archive_job(ctx, days=None, batch_size=None):
+    from datetime import date
+    from .archive import archive_batch, archive_cutoff, candidates
+
+    cutoff = archive_cutoff() if days is None else date.today() - timedelta(days=days)
+    batch_size = batch_size or getattr(settings, 'ARCHIVE_BATCH_SIZE', 500)
+    total = candidates(cutoff).count()
+    moved = {'orders': 0, 'receipts': 0}
+    while True:
+        # Cada lote é uma transação: cancelar entre lotes não deixa nada pela metade
+        ctx.progress(moved['orders'], total, message=f"{moved['orders']}/{total} pedidos")
+        orders, receipts = archive_batch(cutoff, batch_size)
+        if not orders:
+            break
+        moved['orders'] += orders
+        moved['receipts'] += receipts
+    return moved
+
+
+@register('reconcile')
+def reconcile_job(ctx, date=None):
+    from datetime import date as date_type
+    from .reconciliation import reconcile
+
+    ctx.progress(0, message='Conciliando recebimentos')
+    return reconcile(date_type.fromisoformat(date) if date else None)
+
+
+@register('export_columnar')
+def export_columnar_job(ctx, tables=None, directory=None, full=False, format='parquet'):
+    from .columnar import export_all
+
+    def progress(table, day, rows):
+        ctx.progress(rows, message=f"{table} {day or ''}".strip())
+
+    return {'tables': export_all(tables, directory, full, format, progress=progress)}
+
+
+@register('scorecards')
+def scorecards_job(ctx, chunk_size=None):
+    from .scorecards import rebuild
+
+    def progress(done, total):
+        ctx.progress(done, total, message=f'{done}/{total} fornecedores')
+
+    return {'suppliers': rebuild(chunk_size, progress)}
+
+
+@register('scorecards_update')
+def scorecards_update_job(ctx, suppliers=None):
+    from .scorecards import process_pending, refresh
+
+    refreshed = refresh(suppliers) if suppliers else 0
+    return {'changes': process_pending(), 'refreshed': refreshed}
+
+
+def _validate_diagnostics(repeat=20, **_params):
+    if isinstance(repeat, bool) or not isinstance(repeat, int) or repeat < 1:
+        raise ValueError("repeat deve ser um inteiro maior ou igual a 1")
+
+
+@register('diagnostics', validate=_validate_diagnostics)
+def diagnostics_job(ctx, repeat=20):
+    from .diagnostics import run_benchmarks, load_baseline, compare_with_baseline
+
+    ctx.progress(0, message='Executando consultas')
+    benchmarks = run_benchmarks(repeat)
+    return {'benchmarks': benchmarks, 'regressions': compare_with_baseline(benchmarks, load_baseline())}
+
+
+@register('optimize_database')
+def optimize_job(ctx):
+    from .maintenance import ManagementCommands
+    ctx.progress(0, message='VACUUM/REINDEX')
+    ManagementCommands().optimize_database()
+    return None
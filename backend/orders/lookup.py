@@ -0,0 +1,103 @@
+"""
+Consulta por código de barras lido na doca.
+
+O código é comparado por igualdade com numero_pc (único), cargo_number e
+invoice_number, todos indexados, em vez do ?search= das listagens
+(icontains sem índice). Os acertos recentes ficam num cache LRU do
+processo, por site (orders/routing.py) e código; cada entrada guarda as
+versões das tags do cache de respostas (orders/cache.py) e é descartada
+assim que uma delas muda.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
+
+from .cache import TAG_DELIVERIES, TAG_ORDERS, TAG_SUPPLIERS, get_tag_versions
+from .models import DeliveryReceipt, PurchaseOrder
+from .routing import current_site
+from .serializers import DeliveryReceiptSerializer, PurchaseOrderSerializer
+
+LOOKUP_TAGS = (TAG_ORDERS, TAG_DELIVERIES, TAG_SUPPLIERS)
+
+# Maior código possível: max_length das colunas consultadas
+MAX_CODE_LENGTH = 20
+
+
+class LRUCache:
+    """Dicionário limitado que descarta o item usado há mais tempo"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = LRUCache(getattr(settings, 'LOOKUP_CACHE_SIZE', 256))
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def normalize_code(code):
+    """Remove espaços e o fim de linha que alguns leitores enviam"""
+    return (code or '').strip()
+
+
+def find(code):
+    """Pedidos e recebimentos com o código, já serializados"""
+    orders = PurchaseOrder.objects.select_related('fornecedor').filter(numero_pc=code)
+    deliveries = (DeliveryReceipt.objects.select_related('supplier')
+                  .filter(Q(cargo_number=code) | Q(invoice_number=code))
+                  .order_by('-manifest_date', 'id'))
+    return {
+        'code': code,
+        'orders': PurchaseOrderSerializer(orders, many=True).data,
+        'deliveries': DeliveryReceiptSerializer(deliveries, many=True).data,
+    }
+
+
+def lookup(code):
+    """
+    Retorna (resultado, veio_do_cache). Só resultados com algum registro
+    são guardados no cache.
+    """
+    # is_delayed/delay_days dependem da data atual
+    stamp = (get_tag_versions(LOOKUP_TAGS), date.today())
+    # Cada site tem seu banco: o mesmo código pode ser outro registro
+    key = (current_site(), code)
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1], True
+
+    result = find(code)
+    if result['orders'] or result['deliveries']:
+        _cache.set(key, (stamp, result))
+    return result, False
@@ -0,0 +1,339 @@
+"""
+Operações de manutenção do sistema de pedidos de compra.
+
+Usadas pelos comandos de gerenciamento (python manage.py <comando>) e pelo
+script management_commands.py.
+"""
+
+import os
+from datetime import date, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Supplier, PurchaseOrder, DeliveryReceipt
+
+
+def find_backup_duplicates(data):
+    """Recebimentos do backup cuja nota já apareceu para o mesmo fornecedor"""
+    seen = set()
+    duplicates = []
+    for obj in data:
+        if obj.get('model') != 'orders.deliveryreceipt':
+            continue
+        pair = (obj['fields']['supplier'], obj['fields']['invoice_number'])
+        if pair in seen:
+            duplicates.append({'pk': obj.get('pk'), 'supplier': pair[0], 'invoice_number': pair[1]})
+        seen.add(pair)
+    return duplicates
+
+
+class ManagementCommands:
+    """Comandos de gerenciamento do sistema"""
+    
+    def reset_database(self, chunk_size=None):
+        """Reseta o banco de dados"""
+        from .purge import purge_all
+        
+        print("🗑️  Resetando banco de dados...")
+        
+        # Remoção por conjunto, sem carregar os registros em memória
+        purge_all(chunk_size, progress=print)
+        
+        print("✅ Banco de dados resetado!")
+    
+    def create_superuser(self, username="admin", email="admin@chiaperini.com", password="admin123"):
+        """Cria um superusuário"""
+        from django.contrib.auth.models import User
+        
+        if User.objects.filter(username=username).exists():
+            print(f"⚠️  Usuário '{username}' já existe!")
+            return
+        
+        user = User.objects.create_superuser(
+            username=username,
+            email=email,
+            password=password
+        )
+        
+        print(f"✅ Superusuário '{username}' criado!")
+        print(f"   Email: {email}")
+        print(f"   Senha: {password}")
+        print(f"   Acesse: http://localhost:8000/admin")
+    
+    def backup_data(self, filename=None, progress=None):
+        """Faz backup dos dados"""
+        import json
+        from django.core import serializers
+        
+        if not filename:
+            filename = f"backup_{date.today().strftime('%Y%m%d')}.json"
+        
+        print(f"💾 Fazendo backup para {filename}...")
+        
+        # Fornecedores, pedidos e recebimentos, serializados em lotes
+        chunk_size = getattr(settings, 'BACKUP_CHUNK_SIZE', 1000)
+        querysets = [model.objects.order_by('pk') for model in (Supplier, PurchaseOrder, DeliveryReceipt)]
+        total = sum(queryset.count() for queryset in querysets)
+        data = []
+        for queryset in querysets:
+            rows = queryset.iterator(chunk_size)
+            while chunk := list(islice(rows, chunk_size)):
+                data.extend(serializers.serialize('python', chunk))
+                if progress:
+                    progress(len(data), total)
+        
+        # Salvar arquivo
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, cls=DjangoJSONEncoder)
+        
+        print(f"✅ Backup salvo em {filename}")
+        print(f"   Total de registros: {len(data)}")
+    
+    def restore_data(self, filename, progress=None):
+        """Restaura dados do backup"""
+        import json
+        from django.core import serializers
+        
+        if not os.path.exists(filename):
+            print(f"❌ Arquivo {filename} não encontrado!")
+            return
+        
+        print(f"📥 Restaurando dados de {filename}...")
+        
+        # Carregar dados
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # Notas repetidas no arquivo: recusar antes de apagar o banco atual
+        duplicates = find_backup_duplicates(data)
+        if duplicates:
+            print(f"❌ {len(duplicates)} recebimentos repetem a nota de outro do mesmo fornecedor:")
+            for row in duplicates[:10]:
+                print(f"   registro {row['pk']}: fornecedor {row['supplier']}, nota {row['invoice_number']}")
+            return
+        
+        # Última chance de cancelar antes de apagar o banco atual
+        if progress:
+            progress(0, len(data))
+        
+        # Limpar dados existentes
+        self.reset_database()
+        
+        # Deserializar e salvar, informando o progresso a cada lote
+        chunk_size = getattr(settings, 'BACKUP_CHUNK_SIZE', 1000)
+        for done, obj in enumerate(serializers.deserialize('python', data), 1):
+            obj.save()
+            if progress and (done % chunk_size == 0 or done == len(data)):
+                progress(done, len(data))
+        
+        print(f"✅ Dados restaurados!")
+        print(f"   Total de registros: {len(data)}")
+    
+    def show_statistics(self):
+        """Mostra estatísticas do sistema"""
+        print("\n📊 ESTATÍSTICAS DO SISTEMA")
+        print("=" * 40)
+        
+        # Contadores gerais
+        suppliers_count = Supplier.objects.count()
+        orders_count = PurchaseOrder.objects.count()
+        deliveries_count = DeliveryReceipt.objects.count()
+        
+        print(f"👥 Fornecedores: {suppliers_count}")
+        print(f"📋 Pedidos: {orders_count}")
+        print(f"📦 Recebimentos: {deliveries_count}")
+        
+        if orders_count > 0:
+            # Estatísticas por status
+            print(f"\n📊 Por Status:")
+            for status in ["PENDENTE", "PARCIAL", "FINALIZADO"]:
+                count = PurchaseOrder.objects.filter(status=status).count()
+                percentage = (count / orders_count) * 100
+                print(f"   {status}: {count} ({percentage:.1f}%)")
+            
+            # Estatísticas por data
+            today = date.today()
+            tomorrow = today + timedelta(days=1)
+            
+            today_count = PurchaseOrder.objects.filter(followup_date=today).count()
+            tomorrow_count = PurchaseOrder.objects.filter(followup_date=tomorrow).count()
+            delayed_count = PurchaseOrder.objects.filter(followup_date__lt=today).count()
+            
+            print(f"\n📅 Por Data:")
+            print(f"   Hoje: {today_count}")
+            print(f"   Amanhã: {tomorrow_count}")
+            print(f"   Atrasados: {delayed_count}")
+            
+            # Top fornecedores
+            print(f"\n🏆 Top 5 Fornecedores:")
+            # Lidos dos indicadores gravados (rebuild_scorecards), sem agregar
+            from .models import SupplierScorecard
+            top_suppliers = (SupplierScorecard.objects.select_related('supplier')
+                           .order_by('-orders_total')[:5])
+            
+            for i, card in enumerate(top_suppliers, 1):
+                on_time = f", {card.on_time_rate:.0%} no prazo" if card.on_time_rate is not None else ''
+                print(f"   {i}. {card.supplier.code} - {card.supplier.name} ({card.orders_total} pedidos{on_time})")
+        
+        # Consultas lentas por view e combinação de filtros
+        from .querylog import summarize_slow_queries
+        slow_queries = summarize_slow_queries()
+        if slow_queries:
+            print(f"\n🐢 Consultas Lentas (por view/filtros):")
+            for row in slow_queries:
+                filters = row['filters'] or 'sem filtros'
+                print(f"   {row['view']} [{filters}]: {row['total']}x, "
+                      f"média {row['avg_ms']:.1f} ms, máx {row['max_ms']:.1f} ms")
+        
+        print("=" * 40)
+    
+    def check_health(self):
+        """Verifica a saúde do sistema"""
+        print("🏥 VERIFICAÇÃO DE SAÚDE DO SISTEMA")
+        print("=" * 40)
+        
+        checks = []
+        
+        # Verificar conexão com banco
+        try:
+            Supplier.objects.count()
+            checks.append(("✅", "Conexão com banco de dados"))
+        except Exception as e:
+            checks.append(("❌", f"Conexão com banco de dados: {e}"))
+        
+        # Verificar integridade dos dados
+        try:
+            # Verificar se há pedidos apontando para fornecedores inexistentes
+            orphan_orders = PurchaseOrder.objects.exclude(
+                fornecedor_id__in=Supplier.objects.values('id')
+            ).count()
+            if orphan_orders == 0:
+                checks.append(("✅", "Integridade dos pedidos"))
+            else:
+                checks.append(("⚠️", f"Integridade dos pedidos: {orphan_orders} pedidos órfãos"))
+            
+            # Verificar se há recebimentos sem pedido
+            orphan_deliveries = DeliveryReceipt.objects.filter(purchase_order__isnull=True).count()
+            if orphan_deliveries == 0:
+                checks.append(("✅", "Integridade dos recebimentos"))
+            else:
+                checks.append(("⚠️", f"Integridade dos recebimentos: {orphan_deliveries} recebimentos órfãos"))
+        
+        except Exception as e:
+            checks.append(("❌", f"Verificação de integridade: {e}"))
+        
+        # Verificar performance: consultas reais, comparadas com a linha de base
+        try:
+            from .diagnostics import run_benchmarks, load_baseline, compare_with_baseline
+            
+            benchmarks = run_benchmarks(repeat=10)
+            for name, result in benchmarks.items():
+                if result['p95'] < 1000:
+                    checks.append(("✅", f"Performance '{name}' (p95 {result['p95']:.1f} ms)"))
+                else:
+                    checks.append(("⚠️", f"Performance '{name}' lenta (p95 {result['p95']:.1f} ms)"))
+            
+            for regression in compare_with_baseline(benchmarks, load_baseline()):
+                checks.append(("⚠️", f"Regressão em '{regression['query']}': p95 "
+                                     f"{regression['baseline_p95']:.1f} → {regression['current_p95']:.1f} ms"))
+        
+        except Exception as e:
+            checks.append(("❌", f"Verificação de performance: {e}"))
+        
+        # Exibir resultados
+        for status, message in checks:
+            print(f"{status} {message}")
+        
+        # Status geral
+        failed_checks = [c for c in checks if c[0] == "❌"]
+        warning_checks = [c for c in checks if c[0] == "⚠️"]
+        
+        print("=" * 40)
+        if failed_checks:
+            print("❌ Sistema com problemas críticos!")
+        elif warning_checks:
+            print("⚠️  Sistema funcionando com avisos")
+        else:
+            print("✅ Sistema funcionando perfeitamente!")
+    
+    def run_diagnostics(self, repeat=20, save_baseline=False):
+        """Diagnóstico detalhado de desempenho do banco"""
+        from . import diagnostics
+        
+        print("🔬 DIAGNÓSTICO DO BANCO DE DADOS")
+        print("=" * 40)
+        
+        report = diagnostics.run_diagnostics(repeat)
+        baseline = report['baseline'] or {}
+        
+        print(f"\n⏱️  Consultas ({repeat} execuções):")
+        for name, result in report['benchmarks'].items():
+            line = (f"   {name}: p50 {result['p50']:.2f} ms | p95 {result['p95']:.2f} ms | "
+                    f"p99 {result['p99']:.2f} ms")
+            if name in baseline:
+                line += f" (base p95 {baseline[name]['p95']:.2f} ms)"
+            print(line)
+        
+        storage = report['storage']
+        print(f"\n💽 Armazenamento:")
+        if 'database_bytes' in storage:
+            print(f"   Banco: {storage['database_bytes'] / 1024:.1f} KB")
+        if 'fragmentation' in storage:
+            print(f"   Fragmentação (páginas livres): {storage['fragmentation'] * 100:.1f}%")
+        for table, info in storage['tables'].items():
+            size = f"{info['bytes'] / 1024:.1f} KB" if info['bytes'] is not None else "n/d"
+            print(f"   {table}: {size}")
+            for index, index_info in info['indexes'].items():
+                index_size = (f"{index_info['bytes'] / 1024:.1f} KB"
+                              if index_info['bytes'] is not None else "n/d")
+                scans = f", {index_info['scans']} leituras" if index_info['scans'] is not None else ""
+                print(f"      └ {index}: {index_size}{scans}")
+        
+        print(f"\n🗂️  Uso de índices:")
+        for name, usage in report['index_usage'].items():
+            print(f"   {'✅' if usage['uses_index'] else '⚠️'} {name}: {usage['plan'].splitlines()[0]}")
+        
+        print()
+        if report['regressions']:
+            for regression in report['regressions']:
+                print(f"⚠️  Regressão em '{regression['query']}': p95 "
+                      f"{regression['baseline_p95']:.2f} → {regression['current_p95']:.2f} ms")
+        elif baseline:
+            print("✅ Sem regressões em relação à linha de base")
+        else:
+            print("ℹ️  Nenhuma linha de base gravada (use --save-baseline)")
+        
+        if save_baseline:
+            diagnostics.save_baseline(report['benchmarks'])
+            print(f"💾 Linha de base gravada em {diagnostics.baseline_path()}")
+        
+        print("=" * 40)
+    
+    def optimize_database(self):
+        """Otimiza o banco de dados"""
+        print("⚡ OTIMIZANDO BANCO DE DADOS")
+        print("=" * 40)
+        
+        # Para SQLite, executar VACUUM no banco dos pedidos (o do site atual)
+        from django.db import connections, router
+        from .models import PurchaseOrder
+        connection = connections[router.db_for_write(PurchaseOrder)]
+        
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM;")
+            print("✅ VACUUM executado")
+        except Exception as e:
+            print(f"⚠️  Erro no VACUUM: {e}")
+        
+        # Recriar índices se necessário
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("REINDEX;")
+            print("✅ Índices recriados")
+        except Exception as e:
+            print(f"⚠️  Erro na recriação de índices: {e}")
+        
+        print("✅ Otimização concluída!")
@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Move pedidos finalizados/cancelados antigos e seus recebimentos para o arquivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Idade mínima em dias (padrão: ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Pedidos por transação (padrão: ARCHIVE_BATCH_SIZE)')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Parar após N lotes (pode ser retomado depois)')
+        parser.add_argument('--background', action='store_true',
+                            help='Enfileirar para os workers (run_jobs) em vez de executar agora')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            from orders.jobs import enqueue
+            job = enqueue('archive_orders', {'days': options['days'], 'batch_size': options['batch_size']})
+            print(f"📥 Tarefa #{job.pk} enfileirada")
+            return
+
+        from orders.archive import archive_cutoff, archive_orders
+
+        cutoff = archive_cutoff()
+        if options['days'] is not None:
+            cutoff = date.today() - timedelta(days=options['days'])
+
+        totals = archive_orders(cutoff, options['batch_size'], options['max_batches'])
+        print(f"✅ Arquivados {totals['orders']} pedidos e {totals['receipts']} recebimentos "
+              f"em {totals['batches']} lotes (emitidos antes de {cutoff.isoformat()})")
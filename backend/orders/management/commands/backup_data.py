@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Faz backup dos dados em JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Arquivo de destino (padrão: backup_AAAAMMDD.json)')
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().backup_data(options['file'])
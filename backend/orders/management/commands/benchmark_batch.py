@@ -0,0 +1,61 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+# Requisições feitas pelo dashboard a cada carga
+DASHBOARD_REQUESTS = [
+    {'id': 'stats', 'path': '/api/stats/'},
+    {'id': 'orders', 'path': '/api/orders/?page=1'},
+    {'id': 'suppliers', 'path': '/api/suppliers/'},
+]
+
+
+class Command(BaseCommand):
+    help = 'Compara a latência das requisições do dashboard separadas e em lote (/api/batch/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200, help='Repetições de cada cenário')
+
+    # As repetições passariam do orçamento do throttling (ou da carga) e
+    # mediriam respostas 429 em vez do despacho das requisições
+    @override_settings(THROTTLE_ENABLED=False, LOAD_SHED_ENABLED=False)
+    def handle(self, *args, **options):
+        from django.test import Client
+        from orders.diagnostics import percentile
+
+        if options['repeat'] < 1:
+            raise CommandError('--repeat deve ser pelo menos 1')
+
+        client = Client(HTTP_ORIGIN='http://localhost:5173')
+        body = json.dumps({'requests': DASHBOARD_REQUESTS})
+
+        def check(path, status):
+            if status != 200:
+                raise CommandError(f'{path} respondeu {status}: a medição não vale')
+
+        def separate():
+            for item in DASHBOARD_REQUESTS:
+                check(item['path'], client.get(item['path']).status_code)
+
+        def batched():
+            response = client.post('/api/batch/', body, content_type='application/json')
+            check('/api/batch/', response.status_code)
+            for item_id, item in response.json()['responses'].items():
+                check(item_id, item['status'])
+
+        print(f"⏱️  Dashboard: {len(DASHBOARD_REQUESTS)} requisições, {options['repeat']} repetições")
+        results = {}
+        for name, scenario in (('separadas', separate), ('lote', batched)):
+            scenario()  # aquecimento
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                scenario()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = percentile(timings, 50)
+            print(f"   {name}: p50 {results[name]:.2f} ms | p95 {percentile(timings, 95):.2f} ms")
+
+        saving = (1 - results['lote'] / results['separadas']) * 100
+        print(f"✅ Economia com o lote: {saving:.1f}% (sem contar a latência de rede por requisição)")
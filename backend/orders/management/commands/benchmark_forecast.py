@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Mede a previsão de volume (leitura do histórico, ajuste e cache) sobre os dados atuais'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generate', type=int, default=0, metavar='ANOS',
+                            help='Antes, apagar os dados e gerar ANOS de histórico sintético')
+        parser.add_argument('--orders-per-day', type=int, default=30,
+                            help='Pedidos por dia no histórico gerado (padrão: 30)')
+        parser.add_argument('--repeat', type=int, default=5, help='Repetições de cada etapa')
+
+    def handle(self, *args, **options):
+        from datetime import date, timedelta
+        from django.conf import settings
+        from django.test import Client
+        from orders import forecast
+        from orders.diagnostics import percentile
+
+        if options['repeat'] < 1:
+            raise CommandError('--repeat deve ser pelo menos 1')
+        if not forecast.is_available():
+            print("❌ Instale o pacote numpy para usar a previsão")
+            return
+
+        if options['generate']:
+            from orders.generators import TestDataGenerator
+            generator = TestDataGenerator()
+            generator.clear_existing_data()
+            generator.create_suppliers()
+            generator.create_history(options['generate'], options['orders_per_day'])
+
+        today = date.today()
+        start = today - timedelta(days=getattr(settings, 'FORECAST_HISTORY_DAYS', 3 * 365))
+        window = getattr(settings, 'FORECAST_WINDOW_DAYS', 28)
+        season_weeks = getattr(settings, 'FORECAST_SEASON_WEEKS', 52)
+
+        def timed(func):
+            timings = []
+            for _ in range(options['repeat']):
+                begin = time.perf_counter()
+                result = func()
+                timings.append((time.perf_counter() - begin) * 1000)
+            return result, timings
+
+        history, load = timed(lambda: forecast.load_history('receipts', start, today))
+        _fit, fit = timed(lambda: forecast.fit(history.values, start, window, season_weeks))
+        _result, full = timed(lambda: forecast.forecast('receipts', 14, today=today))
+
+        client = Client()
+        client.get('/api/forecast/')  # preenche o cache
+        _response, cached = timed(lambda: client.get('/api/forecast/'))
+
+        print(f"⏱️  Previsão: {len(history.keys)} séries x {history.days} dias "
+              f"({int(history.values.sum())} recebimentos)")
+        for name, timings in (('leitura do histórico', load), ('ajuste (todas as séries)', fit),
+                              ('previsão completa', full), ('resposta em cache', cached)):
+            print(f"   {name}: p50 {percentile(timings, 50):.2f} ms | máx {max(timings):.2f} ms")
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Verifica a saúde do sistema'
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().check_health()
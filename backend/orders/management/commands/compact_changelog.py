@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Compacta o change-log e remove entradas antigas já consumidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help='Dias de retenção (padrão: CHANGELOG_RETENTION_DAYS)')
+
+    def handle(self, *args, **options):
+        from orders.changelog import compact, expire
+
+        compacted = compact()
+        expired = expire(options['retention_days'])
+        print(f"✅ Change-log: {compacted} entradas compactadas, {expired} expiradas")
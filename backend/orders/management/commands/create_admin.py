@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Cria um superusuário com valores padrão de desenvolvimento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', default='admin', help='Nome do usuário')
+        parser.add_argument('--email', default='admin@chiaperini.com', help='Email do usuário')
+        parser.add_argument('--password', default='admin123', help='Senha do usuário')
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().create_superuser(options['username'], options['email'], options['password'])
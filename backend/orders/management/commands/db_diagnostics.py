@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Diagnóstico detalhado de desempenho do banco de dados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Execuções por consulta')
+        parser.add_argument('--save-baseline', action='store_true', help='Gravar o resultado como linha de base')
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        if options['repeat'] < 1:
+            raise CommandError('--repeat deve ser pelo menos 1')
+        ManagementCommands().run_diagnostics(options['repeat'], options['save_baseline'])
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Exporta fornecedores, pedidos e recebimentos em Parquet/Arrow, particionados por dia, para BI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=None, help='Diretório de destino (padrão: EXPORT_DIR)')
+        parser.add_argument('--table', action='append', choices=['suppliers', 'orders', 'deliveries'],
+                            help='Tabela a exportar (pode repetir; padrão: todas)')
+        parser.add_argument('--format', default='parquet', choices=['parquet', 'arrow'],
+                            help='Formato dos arquivos (padrão: parquet)')
+        parser.add_argument('--full', action='store_true',
+                            help='Regravar todas as partições, e não só os dias novos')
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Linhas lidas do banco por bloco (padrão: EXPORT_CHUNK_SIZE)')
+        parser.add_argument('--background', action='store_true',
+                            help='Enfileirar para os workers (run_jobs) em vez de executar agora')
+
+    def handle(self, *args, **options):
+        from orders import columnar
+
+        if not columnar.is_available():
+            raise CommandError('Instale o pacote pyarrow para exportar em formato colunar.')
+
+        if options['background']:
+            from orders.jobs import enqueue
+            job = enqueue('export_columnar', {
+                'tables': options['table'], 'directory': options['dir'],
+                'full': options['full'], 'format': options['format'],
+            })
+            print(f"📥 Tarefa #{job.pk} enfileirada")
+            return
+
+        import time
+        for name in options['table'] or ['suppliers', 'orders', 'deliveries']:
+            started = time.perf_counter()
+            summary = columnar.export_table(name, options['dir'], options['full'], options['format'],
+                                            options['chunk_size'])
+            since = f" a partir de {summary['since']}" if summary['since'] else ''
+            print(f"✅ {name}: {summary['rows']} linhas em {summary['files']} arquivos{since} "
+                  f"({time.perf_counter() - started:.1f}s)")
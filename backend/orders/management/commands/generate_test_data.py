@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Gera dados realistas para demonstração e testes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-data', action='store_true',
+                            help='Manter dados existentes (não limpar)')
+        parser.add_argument('--orders', type=int, default=50,
+                            help='Quantidade de pedidos a criar (padrão: 50)')
+        parser.add_argument('--minimal', action='store_true',
+                            help='Criar apenas dados mínimos para demonstração')
+        parser.add_argument('--history-years', type=int, default=0,
+                            help='Anos de histórico sintético para a previsão (padrão: nenhum)')
+
+    def handle(self, *args, **options):
+        from orders.generators import TestDataGenerator
+
+        TestDataGenerator().generate_all(
+            clear_data=not options['keep_data'],
+            orders_quantity=20 if options['minimal'] else options['orders'],
+            history_years=options['history_years'],
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Executa VACUUM e REINDEX no banco de dados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--background', action='store_true',
+                            help='Enfileirar para os workers (run_jobs) em vez de executar agora')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            from orders.jobs import enqueue
+            job = enqueue('optimize_database')
+            print(f"📥 Tarefa #{job.pk} enfileirada")
+            return
+
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().optimize_database()
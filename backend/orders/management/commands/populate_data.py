@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Limpa o banco e cria um pequeno conjunto de dados de exemplo'
+
+    def handle(self, *args, **options):
+        from orders.sample_data import populate
+        populate()
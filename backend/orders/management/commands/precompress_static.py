@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Gera variantes .gz/.br dos arquivos de texto (ex.: build do frontend)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directories', nargs='*',
+                            help='Diretórios a processar (padrão: STATIC_ROOT)')
+
+    def handle(self, *args, **options):
+        from orders.compression import available_encodings, precompress_directory
+
+        directories = options['directories'] or [str(settings.STATIC_ROOT)]
+        for directory in directories:
+            created = precompress_directory(directory)
+            print(f"✅ {directory}: {len(created)} variantes ({', '.join(available_encodings())})")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os indicadores de desempenho de todos os fornecedores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Fornecedores por transação (padrão: SCORECARDS_REBUILD_CHUNK)')
+        parser.add_argument('--background', action='store_true',
+                            help='Enfileirar para os workers (run_jobs) em vez de executar agora')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            from orders.jobs import enqueue
+            job = enqueue('scorecards', {'chunk_size': options['chunk_size']})
+            print(f"📥 Tarefa #{job.pk} enfileirada")
+            return
+
+        from orders.scorecards import rebuild
+
+        def progress(done, total):
+            print(f"   {done}/{total} fornecedores")
+
+        done = rebuild(options['chunk_size'], progress)
+        print(f"✅ Indicadores recalculados para {done} fornecedores")
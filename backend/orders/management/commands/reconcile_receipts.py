@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Vincula recebimentos sem pedido aos pedidos em aberto e atualiza os status'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', default=None,
+                            help='Somente recebimentos com manifesto nesta data (AAAA-MM-DD)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Apenas calcular, sem gravar')
+        parser.add_argument('--background', action='store_true',
+                            help='Enfileirar para os workers (run_jobs) em vez de executar agora')
+
+    def handle(self, *args, **options):
+        manifest_date = None
+        if options['date']:
+            try:
+                manifest_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Data inválida: {options['date']}")
+
+        if options['background']:
+            from orders.jobs import enqueue
+            job = enqueue('reconcile', {'date': options['date']})
+            print(f"📥 Tarefa #{job.pk} enfileirada")
+            return
+
+        from orders.reconciliation import reconcile
+
+        summary = reconcile(manifest_date, dry_run=options['dry_run'])
+        prefix = '🔍 Simulação:' if options['dry_run'] else '✅'
+        print(f"{prefix} {summary['matched']} de {summary['receipts']} recebimentos vinculados, "
+              f"{summary['unmatched']} sem pedido")
+        for status, count in sorted(summary['status_changes'].items()):
+            print(f"   {status}: {count} pedidos")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Remove todos os fornecedores, pedidos e recebimentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Remover em lotes de N registros em vez de truncar as tabelas')
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().reset_database(options['chunk_size'])
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Restaura os dados a partir de um backup JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', required=True, help='Arquivo de backup')
+
+    def handle(self, *args, **options):
+        from orders.maintenance import ManagementCommands
+        ManagementCommands().restore_data(options['file'])
@@ -0,0 +1,59 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+
+
+def run_worker(name, poll_interval):
+    """Processo worker: termina a tarefa atual ao receber SIGTERM"""
+    import django
+    django.setup()
+    from orders.jobs import work
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *args: stopping.append(True))
+    work(name, poll_interval, stop=lambda: bool(stopping))
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano da fila (Job) com um pool de processos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=None,
+                            help='Número de processos worker (padrão: JOBS_WORKER_PROCESSES)')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='Segundos entre consultas à fila vazia (padrão: JOBS_POLL_INTERVAL)')
+        parser.add_argument('--once', action='store_true',
+                            help='Executar as tarefas prontas e sair')
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from django.db import connections
+        from orders.jobs import work
+
+        if options['once']:
+            executed = work(drain=True)
+            print(f"✅ {executed} tarefas executadas")
+            return
+
+        processes = options['processes'] or getattr(settings, 'JOBS_WORKER_PROCESSES', 2)
+        # Conexões abertas não podem ser herdadas pelos processos filhos
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(f'worker-{i}', options['poll_interval']))
+            for i in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        print(f"⚙️  {processes} workers aguardando tarefas (Ctrl+C para encerrar)")
+
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
+        print("✅ Workers encerrados")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Copia o cadastro de fornecedores do catálogo (banco default) para os bancos de todos os sites'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Fornecedores por lote (padrão: 500)')
+
+    def handle(self, *args, **options):
+        from django.db import DEFAULT_DB_ALIAS
+        from orders.models import Supplier
+        from orders.routing import replicate_suppliers, sites
+
+        if not sites():
+            print("ℹ️  Nenhum site configurado (SITE_DATABASES): há um único banco")
+            return
+
+        ids = list(Supplier._base_manager.using(DEFAULT_DB_ALIAS).order_by('id').values_list('id', flat=True))
+        chunk_size = options['chunk_size']
+        for start in range(0, len(ids), chunk_size):
+            replicate_suppliers(ids[start:start + chunk_size])
+        print(f"✅ {len(ids)} fornecedores copiados para {len(sites())} sites: {', '.join(sites())}")
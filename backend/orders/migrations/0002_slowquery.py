@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Registrada em')),
+                ('duration_ms', models.FloatField(verbose_name='Duração (ms)')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                ('params', models.TextField(blank=True, verbose_name='Parâmetros')),
+                ('view', models.CharField(blank=True, max_length=100, verbose_name='View')),
+                ('filters', models.CharField(blank=True, max_length=200, verbose_name='Combinação de filtros')),
+                ('plan', models.TextField(blank=True, verbose_name='Plano de execução')),
+            ],
+            options={
+                'verbose_name': 'Consulta Lenta',
+                'verbose_name_plural': 'Consultas Lentas',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+def number_existing_rows(apps, schema_editor):
+    """Atribui números de sequência aos registros já existentes"""
+    # Cada banco (orders/routing.py) é numerado à parte
+    db = schema_editor.connection.alias
+    seq = 0
+    for model_name in ('Supplier', 'PurchaseOrder', 'DeliveryReceipt'):
+        model = apps.get_model('orders', model_name)
+        for pk in model.objects.using(db).order_by('pk').values_list('pk', flat=True).iterator():
+            seq += 1
+            model.objects.using(db).filter(pk=pk).update(sync_seq=seq)
+    apps.get_model('orders', 'SyncSequence').objects.using(db).create(pk=1, value=seq)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_slowquery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Sequência de Sincronização',
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20, verbose_name='Recurso')),
+                ('object_id', models.BigIntegerField(verbose_name='ID do registro')),
+                ('sync_seq', models.BigIntegerField(db_index=True, verbose_name='Sequência')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Excluído em')),
+            ],
+            options={
+                'verbose_name': 'Registro Excluído',
+                'verbose_name_plural': 'Registros Excluídos',
+                'ordering': ['sync_seq'],
+            },
+        ),
+        migrations.AddField(
+            model_name='deliveryreceipt',
+            name='sync_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Sequência'),
+        ),
+        migrations.AddField(
+            model_name='deliveryreceipt',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Atualizado em'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='sync_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Sequência'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Atualizado em'),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='sync_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Sequência'),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Atualizado em'),
+        ),
+        migrations.RunPython(number_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogConsumer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Nome')),
+                ('position', models.BigIntegerField(default=0, verbose_name='Posição')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Consumidor do Change-log',
+                'verbose_name_plural': 'Consumidores do Change-log',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20, verbose_name='Recurso')),
+                ('object_id', models.BigIntegerField(verbose_name='ID do registro')),
+                ('action', models.CharField(choices=[('CREATE', 'Criação'), ('UPDATE', 'Alteração'), ('DELETE', 'Exclusão')], max_length=10, verbose_name='Ação')),
+                ('fields', models.JSONField(blank=True, null=True, verbose_name='Campos alterados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Registrado em')),
+            ],
+            options={
+                'verbose_name': 'Registro de Alteração',
+                'verbose_name_plural': 'Registros de Alteração',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['resource', 'object_id'], name='orders_chan_resourc_2eb8c6_idx')],
+            },
+        ),
+    ]
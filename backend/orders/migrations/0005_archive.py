@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:11
+
+import django.db.models.deletion
+import orders.models
+from django.db import migrations, models
+
+
+ORDER_COLUMNS = 'id, numero_pc, data_emissao, fornecedor_id, quantidade_itens, followup_date, armazenamento, status'
+RECEIPT_COLUMNS = ('id, cargo_number, manifest_date, supplier_id, invoice_number, issue_date, '
+                   'manifest_time, entry_time, exit_time, status')
+
+# As views precisam acompanhar as colunas das tabelas ativas e arquivadas
+CREATE_VIEWS = [
+    f"""CREATE VIEW orders_purchaseorder_history AS
+        SELECT {ORDER_COLUMNS}, FALSE AS archived FROM orders_purchaseorder
+        UNION ALL
+        SELECT {ORDER_COLUMNS}, TRUE AS archived FROM orders_archivedpurchaseorder""",
+    f"""CREATE VIEW orders_deliveryreceipt_history AS
+        SELECT {RECEIPT_COLUMNS}, FALSE AS archived FROM orders_deliveryreceipt
+        UNION ALL
+        SELECT {RECEIPT_COLUMNS}, TRUE AS archived FROM orders_archiveddeliveryreceipt""",
+]
+DROP_VIEWS = [
+    'DROP VIEW IF EXISTS orders_purchaseorder_history',
+    'DROP VIEW IF EXISTS orders_deliveryreceipt_history',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryReceiptHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cargo_number', models.CharField(max_length=20)),
+                ('manifest_date', models.DateField()),
+                ('invoice_number', models.CharField(max_length=20)),
+                ('issue_date', models.DateField()),
+                ('manifest_time', models.TimeField(null=True)),
+                ('entry_time', models.TimeField(null=True)),
+                ('exit_time', models.TimeField(null=True)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('FINALIZADO', 'Finalizado')], max_length=20)),
+                ('archived', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'orders_deliveryreceipt_history',
+                'ordering': ['-manifest_date'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrderHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero_pc', models.CharField(max_length=20)),
+                ('data_emissao', models.DateField()),
+                ('quantidade_itens', models.IntegerField()),
+                ('followup_date', models.DateField()),
+                ('armazenamento', models.CharField(max_length=5)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PARCIAL', 'Parcial'), ('FINALIZADO', 'Finalizado'), ('CANCELADO', 'Cancelado')], max_length=20)),
+                ('archived', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'orders_purchaseorder_history',
+                'ordering': ['-data_emissao'],
+                'managed': False,
+            },
+            bases=(orders.models.OrderDelayMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedPurchaseOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('numero_pc', models.CharField(max_length=20, unique=True, verbose_name='Número PC')),
+                ('data_emissao', models.DateField(db_index=True, verbose_name='Data de Emissão')),
+                ('quantidade_itens', models.IntegerField(verbose_name='Quantidade de Itens')),
+                ('followup_date', models.DateField(verbose_name='Data de Follow-up')),
+                ('armazenamento', models.CharField(max_length=5, verbose_name='Armazenamento')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PARCIAL', 'Parcial'), ('FINALIZADO', 'Finalizado'), ('CANCELADO', 'Cancelado')], max_length=20, verbose_name='Status')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')),
+                ('fornecedor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='orders.supplier', verbose_name='Fornecedor')),
+            ],
+            options={
+                'verbose_name': 'Pedido Arquivado',
+                'verbose_name_plural': 'Pedidos Arquivados',
+                'ordering': ['-data_emissao'],
+            },
+            bases=(orders.models.OrderDelayMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedDeliveryReceipt',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cargo_number', models.CharField(max_length=20, verbose_name='Número da Carga')),
+                ('manifest_date', models.DateField(db_index=True, verbose_name='Data do Manifesto')),
+                ('invoice_number', models.CharField(max_length=20, verbose_name='Número da Nota')),
+                ('issue_date', models.DateField(verbose_name='Data de Emissão')),
+                ('manifest_time', models.TimeField(blank=True, null=True, verbose_name='Hora do Manifesto')),
+                ('entry_time', models.TimeField(blank=True, null=True, verbose_name='Hora de Entrada')),
+                ('exit_time', models.TimeField(blank=True, null=True, verbose_name='Hora de Saída')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('FINALIZADO', 'Finalizado')], max_length=20, verbose_name='Status')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_receipts', to='orders.supplier', verbose_name='Fornecedor')),
+                ('purchase_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='orders.archivedpurchaseorder', verbose_name='Pedido de Compra')),
+            ],
+            options={
+                'verbose_name': 'Recebimento Arquivado',
+                'verbose_name_plural': 'Recebimentos Arquivados',
+                'ordering': ['-manifest_date'],
+            },
+        ),
+        migrations.RunSQL(CREATE_VIEWS, DROP_VIEWS),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Tipo')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parâmetros')),
+                ('status', models.CharField(choices=[('QUEUED', 'Na fila'), ('RUNNING', 'Executando'), ('SUCCEEDED', 'Concluída'), ('FAILED', 'Falhou'), ('CANCELLED', 'Cancelada')], default='QUEUED', max_length=10, verbose_name='Status')),
+                ('progress', models.FloatField(default=0, verbose_name='Progresso (%)')),
+                ('message', models.CharField(blank=True, max_length=200, verbose_name='Mensagem')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Resultado')),
+                ('error', models.TextField(blank=True, verbose_name='Erro')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Tentativas')),
+                ('max_attempts', models.IntegerField(default=3, verbose_name='Máximo de tentativas')),
+                ('cancel_requested', models.BooleanField(default=False, verbose_name='Cancelamento solicitado')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Executar após')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Último sinal do worker')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criada em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizada em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='orders_job_status_3454bf_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+ORDER_COLUMNS = 'id, numero_pc, data_emissao, fornecedor_id, quantidade_itens, followup_date, armazenamento, status'
+RECEIPT_COLUMNS = ('id, cargo_number, manifest_date, supplier_id, invoice_number, issue_date, '
+                   'manifest_time, entry_time, exit_time, status')
+
+# sync_seq é a versão usada na verificação de concorrência; registros
+# arquivados não são mais alterados e não têm versão
+CREATE_VIEWS = [
+    f"""CREATE VIEW orders_purchaseorder_history AS
+        SELECT {ORDER_COLUMNS}, sync_seq, FALSE AS archived FROM orders_purchaseorder
+        UNION ALL
+        SELECT {ORDER_COLUMNS}, NULL, TRUE AS archived FROM orders_archivedpurchaseorder""",
+    f"""CREATE VIEW orders_deliveryreceipt_history AS
+        SELECT {RECEIPT_COLUMNS}, sync_seq, FALSE AS archived FROM orders_deliveryreceipt
+        UNION ALL
+        SELECT {RECEIPT_COLUMNS}, NULL, TRUE AS archived FROM orders_archiveddeliveryreceipt""",
+]
+PREVIOUS_VIEWS = [
+    f"""CREATE VIEW orders_purchaseorder_history AS
+        SELECT {ORDER_COLUMNS}, FALSE AS archived FROM orders_purchaseorder
+        UNION ALL
+        SELECT {ORDER_COLUMNS}, TRUE AS archived FROM orders_archivedpurchaseorder""",
+    f"""CREATE VIEW orders_deliveryreceipt_history AS
+        SELECT {RECEIPT_COLUMNS}, FALSE AS archived FROM orders_deliveryreceipt
+        UNION ALL
+        SELECT {RECEIPT_COLUMNS}, TRUE AS archived FROM orders_archiveddeliveryreceipt""",
+]
+DROP_VIEWS = [
+    'DROP VIEW IF EXISTS orders_purchaseorder_history',
+    'DROP VIEW IF EXISTS orders_deliveryreceipt_history',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_job'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_VIEWS + CREATE_VIEWS, DROP_VIEWS + PREVIOUS_VIEWS),
+        migrations.AddField(
+            model_name='purchaseorderhistory',
+            name='sync_seq',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='deliveryreceipthistory',
+            name='sync_seq',
+            field=models.BigIntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:19
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# O SQLite recria a tabela ao adicionar colunas, o que falha enquanto houver
+# views apontando para ela: as views são removidas e recriadas em volta
+history_views = import_module('orders.migrations.0007_history_version')
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_history_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(history_views.DROP_VIEWS, history_views.CREATE_VIEWS),
+        migrations.AddField(
+            model_name='deliveryreceipt',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Reserva expira em'),
+        ),
+        migrations.AddField(
+            model_name='deliveryreceipt',
+            name='claim_token',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Token da reserva'),
+        ),
+        migrations.AddField(
+            model_name='deliveryreceipt',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=150, verbose_name='Reservado por'),
+        ),
+        migrations.AddIndex(
+            model_name='deliveryreceipt',
+            index=models.Index(fields=['status', 'claim_expires_at'], name='orders_deli_status_c20baf_idx'),
+        ),
+        migrations.RunSQL(history_views.CREATE_VIEWS, history_views.DROP_VIEWS),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_dock_claims'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deliveryreceipt',
+            index=models.Index(fields=['cargo_number'], name='orders_deli_cargo_n_a3657a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deliveryreceipt',
+            index=models.Index(fields=['invoice_number'], name='orders_deli_invoice_f5a76b_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:37
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# O SQLite recria a tabela ao adicionar a restrição: as views são removidas
+# e recriadas em volta (ver 0008_dock_claims)
+history_views = import_module('orders.migrations.0007_history_version')
+
+
+def check_duplicates(apps, schema_editor):
+    """Interrompe com a lista de notas repetidas, que precisam ser corrigidas antes"""
+    DeliveryReceipt = apps.get_model('orders', 'DeliveryReceipt')
+    duplicates = list(
+        DeliveryReceipt.objects.using(schema_editor.connection.alias).values('supplier__code', 'invoice_number')
+        .annotate(total=models.Count('id')).filter(total__gt=1)
+        .order_by('supplier__code', 'invoice_number')[:20]
+    )
+    if duplicates:
+        listed = ', '.join(f"{row['supplier__code']}/{row['invoice_number']} ({row['total']}x)" for row in duplicates)
+        raise RuntimeError(f"Recebimentos com a mesma nota do mesmo fornecedor: {listed}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(history_views.DROP_VIEWS, history_views.CREATE_VIEWS),
+        migrations.AddConstraint(
+            model_name='deliveryreceipt',
+            constraint=models.UniqueConstraint(fields=('supplier', 'invoice_number'), name='unique_supplier_invoice'),
+        ),
+        migrations.RunSQL(history_views.CREATE_VIEWS, history_views.DROP_VIEWS),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_followup_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierScorecard',
+            fields=[
+                ('supplier', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='scorecard', serialize=False, to='orders.supplier', verbose_name='Fornecedor')),
+                ('orders_total', models.IntegerField(default=0, verbose_name='Pedidos')),
+                ('orders_delivered', models.IntegerField(default=0, verbose_name='Pedidos entregues')),
+                ('orders_on_time', models.IntegerField(default=0, verbose_name='Entregues no prazo')),
+                ('orders_partial', models.IntegerField(default=0, verbose_name='Entregas parciais')),
+                ('receipts_timed', models.IntegerField(default=0, verbose_name='Recebimentos com entrada e saída')),
+                ('on_time_rate', models.FloatField(db_index=True, null=True, verbose_name='Taxa no prazo')),
+                ('avg_delay_days', models.FloatField(db_index=True, null=True, verbose_name='Atraso médio (dias)')),
+                ('p95_delay_days', models.FloatField(null=True, verbose_name='Atraso p95 (dias)')),
+                ('partial_ratio', models.FloatField(null=True, verbose_name='Proporção de entregas parciais')),
+                ('avg_dwell_minutes', models.FloatField(null=True, verbose_name='Permanência média na doca (min)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Indicadores do Fornecedor',
+                'verbose_name_plural': 'Indicadores dos Fornecedores',
+                'ordering': ['supplier'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0012_supplier_scorecard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='site',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Site'),
+        ),
+    ]
@@ -1,7 +1,243 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
 from datetime import date, timedelta
 
-class Supplier(models.Model):
+
+class SyncSequence(models.Model):
+    """Contador global usado como cursor da sincronização incremental"""
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Sequência de Sincronização"
+
+
+def next_sync_seq(count=1, using=None):
+    """
+    Reserva `count` números de sequência e retorna o maior deles. Com
+    vários bancos (orders/routing.py), cada um tem a sua sequência: using é
+    o banco do registro alterado.
+    """
+    sequences = SyncSequence.objects.using(using or router.db_for_write(SyncSequence))
+    with transaction.atomic(using=sequences.db):
+        # O UPDATE bloqueia a linha até o fim da transação
+        if not sequences.filter(pk=1).update(value=F('value') + count):
+            sequences.create(pk=1, value=count)
+        return sequences.values_list('value', flat=True).get(pk=1)
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Registro append-only das alterações, gravado na mesma transação da
+    escrita. O id é o offset usado pelos consumidores (orders/changelog.py).
+    """
+    CREATE = 'CREATE'
+    UPDATE = 'UPDATE'
+    DELETE = 'DELETE'
+    ACTION_CHOICES = [
+        (CREATE, 'Criação'),
+        (UPDATE, 'Alteração'),
+        (DELETE, 'Exclusão'),
+    ]
+    
+    resource = models.CharField(max_length=20, verbose_name="Recurso")
+    object_id = models.BigIntegerField(verbose_name="ID do registro")
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, verbose_name="Ação")
+    fields = models.JSONField(null=True, blank=True, verbose_name="Campos alterados")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Registrado em")
+    
+    class Meta:
+        verbose_name = "Registro de Alteração"
+        verbose_name_plural = "Registros de Alteração"
+        ordering = ['id']
+        indexes = [models.Index(fields=['resource', 'object_id'])]
+
+
+class ChangeLogConsumer(models.Model):
+    """Posição (último id processado) de cada consumidor do change-log"""
+    name = models.CharField(max_length=50, unique=True, verbose_name="Nome")
+    position = models.BigIntegerField(default=0, verbose_name="Posição")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+    
+    class Meta:
+        verbose_name = "Consumidor do Change-log"
+        verbose_name_plural = "Consumidores do Change-log"
+    
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+
+
+def log_changes(model, object_ids, action, fields=None, using=None):
+    """Grava uma entrada do change-log por registro, no banco do registro (using)"""
+    ChangeLogEntry.objects.using(using or router.db_for_write(ChangeLogEntry)).bulk_create([
+        ChangeLogEntry(resource=model.sync_resource, object_id=pk, action=action, fields=fields)
+        for pk in object_ids
+    ])
+
+
+class SyncTrackedQuerySet(models.QuerySet):
+    """Operações em lote que mantêm sync_seq e o change-log"""
+    
+    def update(self, **kwargs):
+        # Lê os ids no mesmo banco em que vai gravar
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            ids = list(self.values_list('pk', flat=True))
+            if not ids:
+                return 0
+            fields = sorted(kwargs)
+            kwargs.setdefault('updated_at', timezone.now())
+            if 'sync_seq' in kwargs:
+                rows = super().update(**kwargs)
+            else:
+                # Uma sequência por registro, como no bulk_update: o feed
+                # /changes/ corta as páginas por sync_seq e perderia os
+                # registros de mesma sequência além do limite
+                first = next_sync_seq(len(ids), using=self.db) - len(ids) + 1
+                base = self.model._base_manager.using(self.db)
+                batch_size = 500
+                # Dois parâmetros por linha no CASE e o id no IN
+                max_params = connections[self.db].features.max_query_params
+                if max_params:
+                    batch_size = min(batch_size, (max_params - len(kwargs)) // 3)
+                rows = 0
+                for start in range(0, len(ids), batch_size):
+                    chunk = ids[start:start + batch_size]
+                    sync_seq = Case(
+                        *[When(pk=pk, then=Value(first + offset)) for offset, pk in enumerate(chunk, start)],
+                        output_field=models.BigIntegerField(),
+                    )
+                    rows += base.filter(pk__in=chunk).update(sync_seq=sync_seq, **kwargs)
+            log_changes(self.model, ids, ChangeLogEntry.UPDATE, fields, using=self.db)
+            return rows
+    
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        if not objs:
+            return 0
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            last = next_sync_seq(len(objs), using=self.db)
+            now = timezone.now()
+            for offset, obj in enumerate(objs):
+                obj.sync_seq = last - len(objs) + 1 + offset
+                obj.updated_at = now
+            tracked_fields = list(dict.fromkeys([*fields, 'sync_seq', 'updated_at']))
+            # O bulk_update do Django chama update() por lote; o manager base
+            # evita registrar as mesmas alterações duas vezes
+            base = self.model._base_manager.using(self.db)
+            rows = base.bulk_update(objs, tracked_fields, batch_size=batch_size)
+            log_changes(self.model, [obj.pk for obj in objs], ChangeLogEntry.UPDATE, sorted(fields), using=self.db)
+            return rows
+    
+    def assign(self, field_name, values, batch_size=500):
+        """
+        Grava um valor diferente por registro ({pk: valor}) com UPDATE ... SET
+        coluna = CASE pk WHEN ... END em SQL direto. Equivale ao bulk_update
+        de um campo, sem o custo de montar uma expressão do ORM por linha.
+        """
+        if not values:
+            return 0
+        self._for_write = True
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        meta = self.model._meta
+        field = meta.get_field(field_name)
+        pk, table = quote(meta.pk.column), quote(meta.db_table)
+        cast = field.cast_db_type(connection)
+        # Cinco parâmetros por linha (id e valor, id e sequência, id no IN) e um para updated_at
+        max_params = connection.features.max_query_params
+        if max_params:
+            batch_size = min(batch_size, (max_params - 1) // 5)
+        
+        ids = list(values)
+        with transaction.atomic(using=self.db):
+            first = next_sync_seq(len(ids), using=self.db) - len(ids) + 1
+            now = meta.get_field('updated_at').get_db_prep_value(timezone.now(), connection)
+            rows = 0
+            with connection.cursor() as cursor:
+                for start in range(0, len(ids), batch_size):
+                    chunk = ids[start:start + batch_size]
+                    value_case = ' '.join([f'WHEN %s THEN CAST(%s AS {cast})'] * len(chunk))
+                    seq_case = ' '.join(['WHEN %s THEN %s'] * len(chunk))
+                    params = []
+                    for obj_pk in chunk:
+                        params += [obj_pk, field.get_db_prep_save(values[obj_pk], connection)]
+                    for offset, obj_pk in enumerate(chunk, start):
+                        params += [obj_pk, first + offset]
+                    params.append(now)
+                    params += chunk
+                    cursor.execute(
+                        f'UPDATE {table} SET {quote(field.column)} = CASE {pk} {value_case} END, '
+                        f'{quote("sync_seq")} = CASE {pk} {seq_case} END, {quote("updated_at")} = %s '
+                        f'WHERE {pk} IN ({", ".join(["%s"] * len(chunk))})',
+                        params,
+                    )
+                    rows += cursor.rowcount
+            log_changes(self.model, ids, ChangeLogEntry.UPDATE, [field_name], using=self.db)
+            return rows
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        if not objs:
+            return objs
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            last = next_sync_seq(len(objs), using=self.db)
+            for offset, obj in enumerate(objs):
+                obj.sync_seq = last - len(objs) + 1 + offset
+            created = super().bulk_create(objs, *args, **kwargs)
+            log_changes(self.model, [obj.pk for obj in created if obj.pk is not None], ChangeLogEntry.CREATE,
+                        using=self.db)
+            return created
+
+
+class SyncTrackedModel(models.Model):
+    """Registra data, número de sequência e change-log de cada alteração"""
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+    sync_seq = models.BigIntegerField(default=0, db_index=True, editable=False, verbose_name="Sequência")
+    
+    # Nome do recurso na API, no feed /changes/ e no change-log
+    sync_resource = None
+    
+    objects = SyncTrackedQuerySet.as_manager()
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self.sync_seq = next_sync_seq(using=using)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'sync_seq', 'updated_at'}
+            super().save(*args, **kwargs)
+            log_changes(
+                type(self), [self.pk],
+                ChangeLogEntry.CREATE if adding else ChangeLogEntry.UPDATE,
+                sorted(update_fields) if update_fields is not None else None,
+                using=using,
+            )
+
+
+class SyncTombstone(models.Model):
+    """Marca de exclusão, para que os clientes removam o registro localmente"""
+    resource = models.CharField(max_length=20, verbose_name="Recurso")
+    object_id = models.BigIntegerField(verbose_name="ID do registro")
+    sync_seq = models.BigIntegerField(db_index=True, verbose_name="Sequência")
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name="Excluído em")
+    
+    class Meta:
+        verbose_name = "Registro Excluído"
+        verbose_name_plural = "Registros Excluídos"
+        ordering = ['sync_seq']
+
+
+class Supplier(SyncTrackedModel):
+    sync_resource = 'suppliers'
+    
     code = models.CharField(max_length=10, unique=True, verbose_name="Código")
     name = models.CharField(max_length=100, verbose_name="Razão Social")
     status = models.CharField(max_length=10, choices=[('ATIVO', 'Ativo'), ('INATIVO', 'Inativo')], default='ATIVO', verbose_name="Status")
@@ -14,7 +250,27 @@ class Supplier(models.Model):
     def __str__(self):
         return f"{self.code} - {self.name}"
 
-class PurchaseOrder(models.Model):
+class OrderDelayMixin:
+    """Atraso do pedido, comum aos pedidos ativos e arquivados"""
+    
+    @property
+    def is_delayed(self):
+        """Verifica se o pedido está atrasado"""
+        return self.followup_date < date.today() and self.status != 'FINALIZADO'
+    
+    @property
+    def delay_days(self):
+        """Retorna quantidade de dias de atraso"""
+        if self.is_delayed:
+            return (date.today() - self.followup_date).days
+        return 0
+    
+    @property
+    def atraso(self):
+        """Compatibilidade com frontend"""
+        return self.delay_days
+
+class PurchaseOrder(OrderDelayMixin, SyncTrackedModel):
     STATUS_CHOICES = [
         ('PENDENTE', 'Pendente'),
         ('PARCIAL', 'Parcial'),
@@ -22,6 +278,8 @@ class PurchaseOrder(models.Model):
         ('CANCELADO', 'Cancelado'),
     ]
     
+    sync_resource = 'orders'
+    
     numero_pc = models.CharField(max_length=20, unique=True, verbose_name="Número PC")
     data_emissao = models.DateField(verbose_name="Data de Emissão")
     fornecedor = models.ForeignKey(Supplier, on_delete=models.CASCADE, verbose_name="Fornecedor")
@@ -34,33 +292,20 @@ class PurchaseOrder(models.Model):
         verbose_name = "Pedido de Compra"
         verbose_name_plural = "Pedidos de Compra"
         ordering = ['-data_emissao']
+        # Pedidos em aberto por data de follow-up (calendário e dashboard)
+        indexes = [models.Index(fields=['status', 'followup_date'])]
     
     def __str__(self):
         return f"{self.numero_pc} - {self.fornecedor.name}"
-    
-    @property
-    def is_delayed(self):
-        """Verifica se o pedido está atrasado"""
-        return self.followup_date < date.today() and self.status != 'FINALIZADO'
-    
-    @property
-    def delay_days(self):
-        """Retorna quantidade de dias de atraso"""
-        if self.is_delayed:
-            return (date.today() - self.followup_date).days
-        return 0
-    
-    @property
-    def atraso(self):
-        """Compatibilidade com frontend"""
-        return self.delay_days
 
-class DeliveryReceipt(models.Model):
+class DeliveryReceipt(SyncTrackedModel):
     STATUS_CHOICES = [
         ('PENDENTE', 'Pendente'),
         ('FINALIZADO', 'Finalizado'),
     ]
     
+    sync_resource = 'deliveries'
+    
     cargo_number = models.CharField(max_length=20, verbose_name="Número da Carga")
     manifest_date = models.DateField(verbose_name="Data do Manifesto")
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, verbose_name="Fornecedor")
@@ -72,10 +317,200 @@ class DeliveryReceipt(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDENTE', verbose_name="Status")
     purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, null=True, blank=True, verbose_name="Pedido de Compra")
     
+    # Reserva da doca (orders/dock.py); não altera sync_seq nem o change-log
+    claimed_by = models.CharField(max_length=150, blank=True, verbose_name="Reservado por")
+    claim_token = models.CharField(max_length=32, blank=True, verbose_name="Token da reserva")
+    claim_expires_at = models.DateTimeField(null=True, blank=True, verbose_name="Reserva expira em")
+    
     class Meta:
         verbose_name = "Recebimento"
         verbose_name_plural = "Recebimentos"
         ordering = ['-manifest_date']
+        indexes = [
+            models.Index(fields=['status', 'claim_expires_at']),
+            # Leitura de código de barras na doca (orders/lookup.py)
+            models.Index(fields=['cargo_number']),
+            models.Index(fields=['invoice_number']),
+        ]
+        # A mesma nota do fornecedor só pode ser recebida uma vez (orders/duplicates.py)
+        constraints = [
+            models.UniqueConstraint(fields=['supplier', 'invoice_number'], name='unique_supplier_invoice'),
+        ]
+    
+    def __str__(self):
+        return f"Carga {self.cargo_number} - {self.supplier.name}"
+
+class ArchivedPurchaseOrder(OrderDelayMixin, models.Model):
+    """
+    Pedido finalizado ou cancelado movido para fora da tabela ativa
+    (orders/archive.py). Mantém o id original.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    numero_pc = models.CharField(max_length=20, unique=True, verbose_name="Número PC")
+    data_emissao = models.DateField(db_index=True, verbose_name="Data de Emissão")
+    fornecedor = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='archived_orders', verbose_name="Fornecedor")
+    quantidade_itens = models.IntegerField(verbose_name="Quantidade de Itens")
+    followup_date = models.DateField(verbose_name="Data de Follow-up")
+    armazenamento = models.CharField(max_length=5, verbose_name="Armazenamento")
+    status = models.CharField(max_length=20, choices=PurchaseOrder.STATUS_CHOICES, verbose_name="Status")
+    updated_at = models.DateTimeField(verbose_name="Atualizado em")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arquivado em")
+    
+    class Meta:
+        verbose_name = "Pedido Arquivado"
+        verbose_name_plural = "Pedidos Arquivados"
+        ordering = ['-data_emissao']
+    
+    def __str__(self):
+        return f"{self.numero_pc} (arquivado)"
+
+class ArchivedDeliveryReceipt(models.Model):
+    """Recebimento de um pedido arquivado. Mantém o id original."""
+    id = models.BigIntegerField(primary_key=True)
+    cargo_number = models.CharField(max_length=20, verbose_name="Número da Carga")
+    manifest_date = models.DateField(db_index=True, verbose_name="Data do Manifesto")
+    supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='archived_receipts', verbose_name="Fornecedor")
+    invoice_number = models.CharField(max_length=20, verbose_name="Número da Nota")
+    issue_date = models.DateField(verbose_name="Data de Emissão")
+    manifest_time = models.TimeField(null=True, blank=True, verbose_name="Hora do Manifesto")
+    entry_time = models.TimeField(null=True, blank=True, verbose_name="Hora de Entrada")
+    exit_time = models.TimeField(null=True, blank=True, verbose_name="Hora de Saída")
+    status = models.CharField(max_length=20, choices=DeliveryReceipt.STATUS_CHOICES, verbose_name="Status")
+    purchase_order = models.ForeignKey(ArchivedPurchaseOrder, on_delete=models.CASCADE, null=True, blank=True, related_name='receipts', verbose_name="Pedido de Compra")
+    updated_at = models.DateTimeField(verbose_name="Atualizado em")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arquivado em")
+    
+    class Meta:
+        verbose_name = "Recebimento Arquivado"
+        verbose_name_plural = "Recebimentos Arquivados"
+        ordering = ['-manifest_date']
+    
+    def __str__(self):
+        return f"Carga {self.cargo_number} (arquivado)"
+
+class PurchaseOrderHistory(OrderDelayMixin, models.Model):
+    """
+    Pedidos ativos e arquivados juntos: view do banco (UNION ALL) usada
+    pelas listagens com ?include_archived=1. Somente leitura.
+    """
+    numero_pc = models.CharField(max_length=20)
+    data_emissao = models.DateField()
+    fornecedor = models.ForeignKey(Supplier, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    quantidade_itens = models.IntegerField()
+    followup_date = models.DateField()
+    armazenamento = models.CharField(max_length=5)
+    status = models.CharField(max_length=20, choices=PurchaseOrder.STATUS_CHOICES)
+    sync_seq = models.BigIntegerField(null=True)
+    archived = models.BooleanField()
+    
+    class Meta:
+        managed = False
+        db_table = 'orders_purchaseorder_history'
+        ordering = ['-data_emissao']
+
+class DeliveryReceiptHistory(models.Model):
+    """Recebimentos ativos e arquivados juntos (view do banco). Somente leitura."""
+    cargo_number = models.CharField(max_length=20)
+    manifest_date = models.DateField()
+    supplier = models.ForeignKey(Supplier, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    invoice_number = models.CharField(max_length=20)
+    issue_date = models.DateField()
+    manifest_time = models.TimeField(null=True)
+    entry_time = models.TimeField(null=True)
+    exit_time = models.TimeField(null=True)
+    status = models.CharField(max_length=20, choices=DeliveryReceipt.STATUS_CHOICES)
+    sync_seq = models.BigIntegerField(null=True)
+    archived = models.BooleanField()
+    
+    class Meta:
+        managed = False
+        db_table = 'orders_deliveryreceipt_history'
+        ordering = ['-manifest_date']
+
+class SupplierScorecard(models.Model):
+    """
+    Indicadores de desempenho do fornecedor, pedidos ativos e arquivados
+    (orders/scorecards.py). Mantidos a cada alteração, nunca calculados na leitura.
+    """
+    supplier = models.OneToOneField(Supplier, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='scorecard', verbose_name="Fornecedor")
+    orders_total = models.IntegerField(default=0, verbose_name="Pedidos")
+    orders_delivered = models.IntegerField(default=0, verbose_name="Pedidos entregues")
+    orders_on_time = models.IntegerField(default=0, verbose_name="Entregues no prazo")
+    orders_partial = models.IntegerField(default=0, verbose_name="Entregas parciais")
+    receipts_timed = models.IntegerField(default=0, verbose_name="Recebimentos com entrada e saída")
+    on_time_rate = models.FloatField(null=True, db_index=True, verbose_name="Taxa no prazo")
+    avg_delay_days = models.FloatField(null=True, db_index=True, verbose_name="Atraso médio (dias)")
+    p95_delay_days = models.FloatField(null=True, verbose_name="Atraso p95 (dias)")
+    partial_ratio = models.FloatField(null=True, verbose_name="Proporção de entregas parciais")
+    avg_dwell_minutes = models.FloatField(null=True, verbose_name="Permanência média na doca (min)")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+    
+    class Meta:
+        verbose_name = "Indicadores do Fornecedor"
+        verbose_name_plural = "Indicadores dos Fornecedores"
+        ordering = ['supplier']
+    
+    def __str__(self):
+        return f"{self.supplier_id}: {self.on_time_rate}"
+
+class SlowQuery(models.Model):
+    """Consulta acima do limite configurado, com o plano de execução"""
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Registrada em")
+    duration_ms = models.FloatField(verbose_name="Duração (ms)")
+    sql = models.TextField(verbose_name="SQL")
+    params = models.TextField(blank=True, verbose_name="Parâmetros")
+    view = models.CharField(max_length=100, blank=True, verbose_name="View")
+    filters = models.CharField(max_length=200, blank=True, verbose_name="Combinação de filtros")
+    plan = models.TextField(blank=True, verbose_name="Plano de execução")
+    
+    class Meta:
+        verbose_name = "Consulta Lenta"
+        verbose_name_plural = "Consultas Lentas"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.view or '-'} ({self.duration_ms:.1f} ms)"
+
+class Job(models.Model):
+    """Tarefa pesada executada em segundo plano pelos workers (orders/jobs.py)"""
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+    CANCELLED = 'CANCELLED'
+    STATUS_CHOICES = [
+        (QUEUED, 'Na fila'),
+        (RUNNING, 'Executando'),
+        (SUCCEEDED, 'Concluída'),
+        (FAILED, 'Falhou'),
+        (CANCELLED, 'Cancelada'),
+    ]
+    
+    kind = models.CharField(max_length=50, verbose_name="Tipo")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Parâmetros")
+    # Site em que a tarefa foi enfileirada e em cujo banco ela roda (orders/routing.py)
+    site = models.CharField(max_length=50, blank=True, verbose_name="Site")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, verbose_name="Status")
+    progress = models.FloatField(default=0, verbose_name="Progresso (%)")
+    message = models.CharField(max_length=200, blank=True, verbose_name="Mensagem")
+    result = models.JSONField(null=True, blank=True, verbose_name="Resultado")
+    error = models.TextField(blank=True, verbose_name="Erro")
+    attempts = models.IntegerField(default=0, verbose_name="Tentativas")
+    max_attempts = models.IntegerField(default=3, verbose_name="Máximo de tentativas")
+    cancel_requested = models.BooleanField(default=False, verbose_name="Cancelamento solicitado")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Executar após")
+    worker = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name="Último sinal do worker")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criada em")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Iniciada em")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finalizada em")
+    
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        ordering = ['-id']
+        indexes = [models.Index(fields=['status', 'run_after'])]
     
     def __str__(self):
-        return f"Carga {self.cargo_number} - {self.supplier.name}"
\ No newline at end of file
+        return f"#{self.pk} {self.kind} ({self.status})"
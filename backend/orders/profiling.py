@@ -0,0 +1,195 @@
+"""
+Profiling sob demanda das requisições da API.
+
+Desligado por padrão. Com PROFILING_ENABLED, uma requisição é perfilada
+quando traz o cabeçalho X-Profile ou quando cai na taxa de amostragem
+PROFILING_SAMPLE_RATE. Um perfil por vez: o cProfile não aceita dois ativos
+no mesmo processo (Python 3.12+), e uma requisição que chega durante outro
+perfil segue sem ser perfilada. Os últimos perfis ficam num buffer circular em
+memória, exposto em /api/profiles/ apenas para administradores.
+"""
+
+import cProfile
+import itertools
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+
+# Funções que delimitam as fases de uma listagem DRF
+PHASES = {
+    'view': 'dispatch',
+    'filters': 'filter_queryset',
+    'pagination': 'paginate_queryset',
+    'serializer': 'to_representation',
+    'renderer': 'render',
+}
+
+logger = logging.getLogger(__name__)
+
+_ids = itertools.count(1)
+
+# Perfil em andamento no processo
+_active = threading.Lock()
+
+
+class ProfileStore:
+    """Buffer circular e thread-safe com os últimos perfis"""
+
+    def __init__(self, size):
+        self._profiles = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def all(self):
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile['id'] == profile_id:
+                    return profile
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+store = ProfileStore(getattr(settings, 'PROFILING_RING_SIZE', 50))
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f'{name} ({os.path.basename(filename)}:{line})'
+
+
+def _phase_timings(raw_stats):
+    """Tempo acumulado (ms) de cada fase, pela função que a delimita"""
+    timings = {}
+    for phase, function_name in PHASES.items():
+        total = 0.0
+        for (filename, _line, name), (_cc, _nc, _tt, ct, callers) in raw_stats.items():
+            if name != function_name or 'rest_framework' not in filename:
+                continue
+            # Chamadas recursivas da mesma função já estão no tempo do chamador
+            if any(caller[2] == function_name for caller in callers):
+                continue
+            total += ct
+        timings[phase] = round(total * 1000, 3)
+    return timings
+
+
+def _call_tree(raw_stats, max_depth, min_ratio):
+    """Árvore de chamadas por tempo acumulado, no estilo do pyinstrument"""
+    callees = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw_stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [func for func, entry in raw_stats.items() if not entry[4]]
+    total = sum(raw_stats[func][3] for func in roots) or 1e-9
+
+    def build(func, cumulative, depth, path):
+        node = {
+            'function': _label(func),
+            'cumulative_ms': round(cumulative * 1000, 3),
+            'children': [],
+        }
+        if depth >= max_depth:
+            return node
+        children = sorted(callees.get(func, ()), key=lambda item: item[1], reverse=True)
+        for child, child_time in children:
+            if child in path or child_time / total < min_ratio:
+                continue
+            node['children'].append(build(child, child_time, depth + 1, path | {child}))
+        return node
+
+    return [build(func, raw_stats[func][3], 0, {func}) for func in roots]
+
+
+def _top_functions(stats, limit):
+    rows = []
+    for func, (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append({
+            'function': _label(func),
+            'calls': nc,
+            'total_ms': round(tt * 1000, 3),
+            'cumulative_ms': round(ct * 1000, 3),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+def build_profile(profiler, request, response, duration):
+    """Converte o resultado do cProfile num registro serializável"""
+    stats = pstats.Stats(profiler)
+    return {
+        'id': next(_ids),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status_code': response.status_code,
+        'duration_ms': round(duration * 1000, 3),
+        'created_at': timezone.now().isoformat(),
+        'phases': _phase_timings(stats.stats),
+        'top_functions': _top_functions(stats, getattr(settings, 'PROFILING_TOP_FUNCTIONS', 30)),
+        'call_tree': _call_tree(
+            stats.stats,
+            max_depth=getattr(settings, 'PROFILING_TREE_DEPTH', 25),
+            min_ratio=getattr(settings, 'PROFILING_TREE_MIN_RATIO', 0.01),
+        ),
+    }
+
+
+class ProfilingMiddleware:
+    """Perfila requisições marcadas pelo cabeçalho ou pela amostragem"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def should_profile(self, request):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            return False
+        if not request.path.startswith(tuple(getattr(settings, 'PROFILING_PATH_PREFIXES', ['/api/']))):
+            return False
+        if request.path.startswith('/api/profiles/'):
+            return False
+        if request.headers.get('X-Profile'):
+            return True
+        return random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        if not _active.acquire(blocking=False):
+            logger.warning('Requisição %s não perfilada: outro perfil em andamento', request.path)
+            return self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+        finally:
+            _active.release()
+
+        profile = build_profile(profiler, request, response, duration)
+        store.add(profile)
+        response['X-Profile-Id'] = str(profile['id'])
+        return response
@@ -0,0 +1,89 @@
+"""
+Remoção em massa sem o coletor de cascata do ORM.
+
+objects.all().delete() carrega em memória todos os registros relacionados
+para disparar sinais e cascatas. Aqui as tabelas são esvaziadas em ordem de
+dependência com comandos de conjunto: truncamento com reinício das
+sequências (o mesmo SQL do `manage.py flush`) ou DELETEs em lotes por id,
+que mantêm o uso de memória constante.
+
+Cada tabela é esvaziada no banco em que o roteador a grava e, se for
+outro, no banco de onde ela é lida: com vários sites, os pedidos do site
+atual e os fornecedores do catálogo e da réplica do site.
+
+Nenhum sinal é disparado: não há tombstones nem entradas no change-log, e
+os clientes da sincronização incremental precisam recarregar os dados.
+"""
+
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+
+from .cache import TAG_DELIVERIES, TAG_ORDERS, TAG_SUPPLIERS, invalidate_tags
+from .models import (
+    ArchivedDeliveryReceipt, ArchivedPurchaseOrder, DeliveryReceipt, PurchaseOrder, Supplier, SupplierScorecard,
+)
+
+# Dependentes antes das tabelas referenciadas
+PURGE_ORDER = [
+    SupplierScorecard, ArchivedDeliveryReceipt, DeliveryReceipt, ArchivedPurchaseOrder, PurchaseOrder, Supplier,
+]
+
+
+def _report(progress, model, deleted, total):
+    if progress:
+        progress(f"   {model._meta.verbose_name_plural}: {deleted}/{total}")
+
+
+def databases(model):
+    """Bancos de onde o modelo é lido e em que é gravado, sem repetição"""
+    return list(dict.fromkeys([router.db_for_read(model), router.db_for_write(model)]))
+
+
+def truncate(models, reset_sequences=True, progress=None):
+    """Esvazia as tabelas de uma vez e reinicia as sequências de id"""
+    counts = {model._meta.db_table: model._base_manager.count() for model in models}
+    by_alias = {}
+    for model in models:
+        for alias in databases(model):
+            by_alias.setdefault(alias, []).append(model._meta.db_table)
+    for alias, tables in by_alias.items():
+        operations = connections[alias].ops
+        operations.execute_sql_flush(operations.sql_flush(no_style(), tables, reset_sequences=reset_sequences))
+    for model in models:
+        total = counts[model._meta.db_table]
+        _report(progress, model, total, total)
+    return counts
+
+
+def delete_in_chunks(queryset, chunk_size=5000, progress=None):
+    """DELETE por lotes de ids; retorna o total removido"""
+    model = queryset.model
+    total = queryset.count()
+    deleted = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            chunk = model._base_manager.using(queryset.db).filter(pk__in=ids)
+            deleted += chunk._raw_delete(chunk.db)
+        _report(progress, model, deleted, total)
+    return deleted
+
+
+def purge_all(chunk_size=None, progress=None):
+    """
+    Remove fornecedores, pedidos e recebimentos (ativos e arquivados).
+    Sem chunk_size as tabelas são truncadas; com chunk_size, removidas em lotes.
+    Retorna {tabela: registros removidos}.
+    """
+    if chunk_size is None:
+        counts = truncate(PURGE_ORDER, progress=progress)
+    else:
+        counts = {}
+        for model in PURGE_ORDER:
+            for alias in databases(model):
+                deleted = delete_in_chunks(model._base_manager.using(alias), chunk_size, progress)
+                counts.setdefault(model._meta.db_table, deleted)
+    transaction.on_commit(lambda: invalidate_tags(TAG_ORDERS, TAG_SUPPLIERS, TAG_DELIVERIES))
+    return counts
@@ -0,0 +1,125 @@
+"""
+Registro de consultas lentas.
+
+SlowQueryLogMiddleware cronometra cada consulta da requisição, em todos os
+bancos (catálogo e sites), através de execute_wrapper. As que passam de
+SLOW_QUERY_THRESHOLD_MS são gravadas em SlowQuery ao final da requisição,
+junto com a view, a combinação de filtros usada e o EXPLAIN da consulta,
+obtido no mesmo banco em que ela rodou. A tabela é podada
+para manter no máximo SLOW_QUERY_LOG_MAX_ENTRIES registros.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Avg, Count, Max
+
+from .routing import execute_wrapper
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros que não mudam o plano da consulta
+IGNORED_PARAMS = {'page', 'page_size'}
+
+
+class QueryRecorder:
+    """Wrapper de execução que guarda as consultas acima do limite"""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms and not many:
+                self.slow_queries.append((sql, params, duration_ms, context['connection'].alias))
+
+
+def filter_combination(request):
+    """Nomes dos parâmetros de filtro/busca/ordenação usados na requisição"""
+    keys = sorted(key for key, value in request.GET.items() if value and key not in IGNORED_PARAMS)
+    return '+'.join(keys)
+
+
+def explain(sql, params, using):
+    """Plano de execução da consulta (apenas SELECT), no banco `using`"""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    connection = connections[using]
+    prefix = connection.ops.explain_query_prefix()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            rows = cursor.fetchall()
+    except Exception as exc:
+        logger.warning('EXPLAIN falhou: %s', exc)
+        return ''
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(' | '.join(str(col) for col in row) for row in rows)
+
+
+def save_slow_queries(recorder, view, filters):
+    """Grava as consultas lentas e poda os registros mais antigos"""
+    from .models import SlowQuery
+
+    entries = [
+        SlowQuery(
+            duration_ms=round(duration_ms, 3),
+            sql=sql,
+            params=repr(params),
+            view=view,
+            filters=filters,
+            plan=explain(sql, params, using),
+        )
+        for sql, params, duration_ms, using in recorder.slow_queries
+    ]
+    SlowQuery.objects.bulk_create(entries)
+
+    max_entries = getattr(settings, 'SLOW_QUERY_LOG_MAX_ENTRIES', 1000)
+    newest = SlowQuery.objects.order_by('-id').values_list('id', flat=True)[max_entries:max_entries + 1]
+    if newest:
+        SlowQuery.objects.filter(id__lte=newest[0]).delete()
+
+
+def summarize_slow_queries(limit=10):
+    """Agrupa as consultas lentas por view e combinação de filtros"""
+    from .models import SlowQuery
+
+    return list(
+        SlowQuery.objects.values('view', 'filters')
+        .annotate(total=Count('id'), avg_ms=Avg('duration_ms'), max_ms=Max('duration_ms'))
+        .order_by('-total', '-max_ms')[:limit]
+    )
+
+
+class SlowQueryLogMiddleware:
+    """Registra as consultas lentas de cada requisição"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'SLOW_QUERY_LOG_ENABLED', False):
+            return self.get_response(request)
+
+        recorder = QueryRecorder(getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200))
+        with execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        if recorder.slow_queries:
+            match = request.resolver_match
+            view = (match.view_name or match.func.__name__) if match else request.path
+            try:
+                save_slow_queries(recorder, view, filter_combination(request))
+            except Exception as exc:
+                # O registro nunca deve derrubar a requisição
+                logger.warning('Falha ao gravar consultas lentas: %s', exc)
+        return response
@@ -0,0 +1,179 @@
+"""
+Conciliação automática entre pedidos de compra e recebimentos.
+
+Os pedidos em aberto e os recebimentos sem pedido são carregados uma única
+vez (apenas as colunas usadas) e indexados em memória por fornecedor; cada
+recebimento é então casado sem novas consultas ao banco:
+
+1. Janela de datas: pedidos do fornecedor emitidos até a data da nota e no
+   máximo RECONCILIATION_WINDOW_DAYS dias antes dela.
+2. Entre os candidatos, prefere o pedido ainda sem recebimentos, depois o
+   follow-up mais próximo da data do manifesto e por fim o mais antigo.
+
+Cada nota de um fornecedor é recebida uma única vez (orders/duplicates.py),
+então não há outro recebimento da mesma nota para seguir.
+
+O status dos pedidos é derivado dos recebimentos vinculados: PARCIAL
+enquanto houver recebimento pendente, FINALIZADO quando todos estiverem
+finalizados. Vínculos e status são gravados em lote com
+SyncTrackedQuerySet.assign (versão e change-log mantidos) e o cache é
+invalidado uma vez por modelo.
+"""
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Count, Q
+
+from .models import DeliveryReceipt, PurchaseOrder
+from .signals import bulk_updated
+
+OPEN_STATUSES = ['PENDENTE', 'PARCIAL']
+
+
+class OrderIndex:
+    """
+    Pedidos em aberto de um fornecedor. Os ainda sem recebimento ficam
+    ordenados pela data de follow-up, para achar o mais próximo do
+    manifesto por busca binária; os já vinculados só são usados quando não
+    há pedido livre na janela.
+    """
+
+    def __init__(self):
+        self.free = []
+        self.linked = []
+
+    def add(self, order, has_receipts):
+        (self.linked if has_receipts else self.free).append(order)
+
+    def freeze(self):
+        self.free.sort(key=lambda order: (order[2], order[0]))
+        self.keys = [order[2] for order in self.free]
+
+    def take(self, issue_date, manifest_date, window):
+        """Escolhe (e marca como vinculado) o pedido para o recebimento, ou None"""
+        earliest = issue_date - window
+
+        def eligible(order):
+            return earliest <= order[1] <= issue_date
+
+        # Expande a partir do follow-up mais próximo do manifesto
+        best = best_key = None
+        low = bisect_left(self.keys, manifest_date) - 1
+        high = low + 1
+        while low >= 0 or high < len(self.free):
+            below = (manifest_date - self.keys[low]).days if low >= 0 else None
+            above = (self.keys[high] - manifest_date).days if high < len(self.free) else None
+            distance = min(d for d in (below, above) if d is not None)
+            if best is not None and distance > best_key[0]:
+                break
+            if below == distance:
+                position, low = low, low - 1
+            else:
+                position, high = high, high + 1
+            order = self.free[position]
+            key = (distance, order[1], order[0])
+            if eligible(order) and (best is None or key < best_key):
+                best, best_key = position, key
+
+        if best is not None:
+            order = self.free.pop(best)
+            self.keys.pop(best)
+            self.linked.append(order)
+            return order[0]
+
+        candidates = [order for order in self.linked if eligible(order)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda order: (abs((order[2] - manifest_date).days), order[1], order[0]))[0]
+
+
+def derive_status(total, finalized):
+    """Status do pedido a partir dos recebimentos vinculados"""
+    if not total:
+        return None
+    return 'FINALIZADO' if finalized == total else 'PARCIAL'
+
+
+def _load(manifest_date):
+    orders = (PurchaseOrder.objects.filter(status__in=OPEN_STATUSES)
+              .values_list('id', 'data_emissao', 'followup_date', 'fornecedor_id', 'status'))
+    receipts = DeliveryReceipt.objects.filter(purchase_order__isnull=True)
+    if manifest_date is not None:
+        receipts = receipts.filter(manifest_date=manifest_date)
+    receipts = receipts.order_by('manifest_date', 'id').values_list(
+        'id', 'supplier_id', 'issue_date', 'manifest_date', 'status')
+
+    # Recebimentos já vinculados aos pedidos em aberto
+    linked = (DeliveryReceipt.objects.filter(purchase_order__status__in=OPEN_STATUSES)
+              .values('purchase_order_id')
+              .annotate(total=Count('id'), finalized=Count('id', filter=Q(status='FINALIZADO'))))
+    return list(orders), list(receipts), list(linked)
+
+
+def match(orders, receipts, linked, window):
+    """
+    Casa os recebimentos com os pedidos. Retorna ({recebimento: pedido},
+    {pedido: [total, finalizados]}) já incluindo os vínculos existentes.
+    """
+    counts = defaultdict(lambda: [0, 0])
+    for row in linked:
+        counts[row['purchase_order_id']] = [row['total'], row['finalized']]
+
+    by_supplier = defaultdict(OrderIndex)
+    order_status = {}
+    for order in orders:
+        by_supplier[order[3]].add(order, order[0] in counts)
+        order_status[order[0]] = order[4]
+    for index in by_supplier.values():
+        index.freeze()
+
+    links = {}
+    for receipt_id, supplier_id, issue_date, manifest_date, status in receipts:
+        index = by_supplier.get(supplier_id)
+        order_id = index.take(issue_date, manifest_date, window) if index else None
+        if order_id is None:
+            continue
+        links[receipt_id] = order_id
+        counts[order_id][0] += 1
+        counts[order_id][1] += status == 'FINALIZADO'
+    return links, counts, order_status
+
+
+def reconcile(manifest_date=None, dry_run=False, batch_size=None):
+    """
+    Concilia os recebimentos sem pedido (todos, ou só os do dia informado).
+    Retorna um resumo com os totais de vínculos e mudanças de status.
+    """
+    window = timedelta(days=getattr(settings, 'RECONCILIATION_WINDOW_DAYS', 90))
+    batch_size = batch_size or getattr(settings, 'RECONCILIATION_BATCH_SIZE', 500)
+
+    with transaction.atomic(using=router.db_for_write(DeliveryReceipt)):
+        orders, receipts, linked = _load(manifest_date)
+        links, counts, order_status = match(orders, receipts, linked, window)
+
+        transitions = {}
+        for order_id, (total, finalized) in counts.items():
+            status = derive_status(total, finalized)
+            if status and order_id in order_status and status != order_status[order_id]:
+                transitions[order_id] = status
+
+        summary = {
+            'receipts': len(receipts),
+            'matched': len(links),
+            'unmatched': len(receipts) - len(links),
+            'status_changes': dict(Counter(transitions.values())),
+        }
+        if dry_run:
+            return summary
+
+        if links:
+            DeliveryReceipt.objects.assign('purchase_order', links, batch_size)
+            bulk_updated.send(sender=DeliveryReceipt, ids=list(links), fields=['purchase_order'])
+        if transitions:
+            PurchaseOrder.objects.assign('status', transitions, batch_size)
+            bulk_updated.send(sender=PurchaseOrder, ids=list(transitions), fields=['status'])
+        return summary
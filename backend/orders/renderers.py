@@ -0,0 +1,18 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    Formato compacto para listagens (?format=compact): os nomes dos campos
+    vão uma única vez em "columns" e cada registro vira uma lista em "rows".
+    """
+    format = 'compact'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            results = data['results']
+            columns = list(results[0].keys()) if results else []
+            data = {key: value for key, value in data.items() if key != 'results'}
+            data['columns'] = columns
+            data['rows'] = [[row[column] for column in columns] for row in results]
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,195 @@
+"""
+Várias plantas: um banco de dados por site.
+
+Cada site de SITES tem seu banco (alias em DATABASES), seus armazéns e,
+opcionalmente, os hosts pelos quais é acessado. SiteMiddleware escolhe o
+site da requisição pelo cabeçalho X-Site ou pelo host; fora de uma
+requisição (comandos, tarefas), o site vem da variável de ambiente SITE ou
+de use_site(). Sem SITES, tudo continua no banco "default".
+
+SiteRouter manda pedidos, recebimentos, arquivo, histórico, change-log e
+sequência de sincronização para o banco do site atual: o change-log fica
+sempre no mesmo banco (e na mesma transação) do registro alterado.
+
+O cadastro de fornecedores é compartilhado: as gravações vão para o banco
+"default" (o catálogo) e são replicadas para todos os sites após o commit,
+com os mesmos ids. As leituras usam a réplica do site, então as junções de
+pedidos e recebimentos com fornecedores continuam locais. Usuários, sessões
+e a fila de tarefas ficam só no catálogo.
+
+Cada site tem sua própria conexão (uma por alias e thread, como qualquer
+banco do Django), com as opções de DATABASES[alias]. Consultas globais
+(for_each_site) passam por todos os sites, um de cada vez. Quem mede as
+consultas (execute_wrapper) observa todas as conexões, não só a "default".
+"""
+
+import os
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import JsonResponse
+
+_current_site = ContextVar('site', default=None)
+
+# Modelos do app orders que ficam só no catálogo
+CATALOG_MODELS = {'job', 'slowquery'}
+
+
+class UnknownSite(ValueError):
+    """Site que não está em SITES"""
+
+
+def sites():
+    return getattr(settings, 'SITES', {})
+
+
+def current_site():
+    """Site da requisição ou de use_site(); senão o da variável de ambiente SITE"""
+    return _current_site.get() or os.environ.get('SITE') or None
+
+
+def site_db(site=None):
+    """Alias do banco do site (padrão: o atual); "default" sem site"""
+    site = site or current_site()
+    if not site or not sites():
+        return DEFAULT_DB_ALIAS
+    if site not in sites():
+        raise UnknownSite(f'Site desconhecido: {site}')
+    return sites()[site]['database']
+
+
+def site_for_warehouse(warehouse):
+    for site, config in sites().items():
+        if warehouse in config.get('warehouses', ()):
+            return site
+    return None
+
+
+@contextmanager
+def use_site(site):
+    """Executa o bloco com `site` como site atual"""
+    if site and site not in sites():
+        raise UnknownSite(f'Site desconhecido: {site}')
+    token = _current_site.set(site)
+    try:
+        yield
+    finally:
+        _current_site.reset(token)
+
+
+def for_each_site(function):
+    """Executa function() em cada site; retorna {site: resultado}"""
+    if not sites():
+        return {DEFAULT_DB_ALIAS: function()}
+    results = {}
+    for site in sites():
+        with use_site(site):
+            results[site] = function()
+    return results
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    """connection.execute_wrapper em todos os bancos: catálogo e sites"""
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(wrapper))
+        yield
+
+
+def resolve_site(request):
+    """Site pedido no cabeçalho X-Site ou mapeado pelo host; None se nenhum"""
+    site = request.headers.get('X-Site')
+    if site:
+        return site
+    host = request.get_host().split(':')[0]
+    for code, config in sites().items():
+        if host in config.get('hosts', ()):
+            return code
+    return None
+
+
+class SiteMiddleware:
+    """Define o site atual durante a requisição"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not sites():
+            return self.get_response(request)
+        site = resolve_site(request)
+        if site and site not in sites():
+            return JsonResponse({'detail': f'Site desconhecido: {site}', 'sites': sorted(sites())}, status=400)
+        request.site = site
+        token = _current_site.set(site)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_site.reset(token)
+
+
+def _is_site_model(model):
+    return model._meta.app_label == 'orders' and model._meta.model_name not in CATALOG_MODELS
+
+
+def _is_catalog_copy(model):
+    return model._meta.app_label == 'orders' and model._meta.model_name == 'supplier'
+
+
+class SiteRouter:
+    """Roteia os modelos de orders para o banco do site atual"""
+
+    def db_for_read(self, model, **hints):
+        if not sites() or not _is_site_model(model):
+            return None
+        return site_db()
+
+    def db_for_write(self, model, **hints):
+        if not sites() or not _is_site_model(model):
+            return None
+        if _is_catalog_copy(model):
+            return DEFAULT_DB_ALIAS
+        # Fora de um site, um pedido salvo com save() vai para o site do seu
+        # armazém (objects.create() não passa a instância ao roteador)
+        instance = hints.get('instance')
+        if not current_site() and getattr(instance, 'armazenamento', None):
+            site = site_for_warehouse(instance.armazenamento)
+            if site:
+                return site_db(site)
+        return site_db()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Fornecedores existem em todos os bancos (réplicas do catálogo)
+        if sites() and (_is_catalog_copy(type(obj1)) or _is_catalog_copy(type(obj2))):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Todos os bancos recebem o mesmo esquema
+        return None
+
+
+def replicate_suppliers(ids):
+    """Copia os fornecedores informados do catálogo para todos os sites"""
+    from .models import Supplier
+
+    if not sites():
+        return 0
+    suppliers = list(Supplier._base_manager.using(DEFAULT_DB_ALIAS).filter(pk__in=ids))
+    fields = [field.name for field in Supplier._meta.concrete_fields if not field.primary_key]
+    for config in sites().values():
+        # Pelo manager rastreado: a réplica entra no change-log do site
+        Supplier.objects.using(config['database']).bulk_create(
+            suppliers, update_conflicts=True, unique_fields=['id'], update_fields=fields)
+    return len(suppliers)
+
+
+def delete_suppliers(ids):
+    """Remove os fornecedores (e, em cascata, seus pedidos) de todos os sites"""
+    from .models import Supplier
+
+    for config in sites().values():
+        Supplier._base_manager.using(config['database']).filter(pk__in=ids).delete()
@@ -0,0 +1,227 @@
+"""
+Indicadores de desempenho dos fornecedores (SupplierScorecard).
+
+Por fornecedor, considerando pedidos ativos e arquivados (exceto
+cancelados):
+
+- taxa no prazo: pedidos cuja primeira entrega (manifest_date) não passou
+  do follow-up, sobre os pedidos entregues;
+- atraso médio e p95, em dias, da primeira entrega em relação ao follow-up;
+- proporção de entregas parciais: pedidos entregues em mais de um
+  recebimento;
+- permanência média na doca: saída - entrada dos recebimentos com os dois
+  horários.
+
+Os indicadores ficam gravados e a API só os lê. A atualização é
+incremental e fora da requisição: cada transação que grava pedidos,
+recebimentos ou fornecedores (inclusive por update/bulk_update, via
+bulk_updated) agenda um callback que, após o commit, enfileira uma vez a
+tarefa "scorecards_update" (orders/jobs.py), se ainda não houver uma na
+fila do site. A tarefa aplica o change-log pelo consumidor "scorecards",
+recalculando apenas os fornecedores dos registros alterados. Exclusões não
+deixam o fornecedor no change-log: os fornecedores excluídos na transação
+seguem como parâmetro da tarefa. O comando rebuild_scorecards recalcula
+todos, em lotes de fornecedores.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Max, Min
+
+from .changelog import consume
+from .diagnostics import percentile
+from .models import (
+    ArchivedDeliveryReceipt, ArchivedPurchaseOrder, ChangeLogConsumer, ChangeLogEntry, DeliveryReceipt,
+    PurchaseOrder, Supplier, SupplierScorecard,
+)
+
+logger = logging.getLogger(__name__)
+
+CONSUMER = 'scorecards'
+JOB_KIND = 'scorecards_update'
+RESOURCES = ['orders', 'deliveries', 'suppliers']
+
+METRIC_FIELDS = [
+    'orders_total', 'orders_delivered', 'orders_on_time', 'orders_partial', 'receipts_timed',
+    'on_time_rate', 'avg_delay_days', 'p95_delay_days', 'partial_ratio', 'avg_dwell_minutes',
+]
+
+# Tabelas ativa e de arquivo: (pedidos, recebimentos)
+SOURCES = [(PurchaseOrder, DeliveryReceipt), (ArchivedPurchaseOrder, ArchivedDeliveryReceipt)]
+
+
+def _ratio(part, total):
+    return part / total if total else None
+
+
+def compute(supplier_ids):
+    """Indicadores de cada fornecedor informado: {fornecedor_id: {campo: valor}}"""
+    totals = defaultdict(int)
+    delays = defaultdict(list)
+    partial = defaultdict(int)
+    dwell = defaultdict(list)
+
+    for order_model, receipt_model in SOURCES:
+        rows = (order_model.objects.filter(fornecedor_id__in=supplier_ids).exclude(status='CANCELADO')
+                .values_list('fornecedor_id').annotate(total=Count('id')).order_by())
+        for supplier_id, total in rows:
+            totals[supplier_id] += total
+
+        # Uma linha por pedido entregue: primeira entrega e número de recebimentos
+        rows = (receipt_model.objects
+                .filter(purchase_order__fornecedor_id__in=supplier_ids)
+                .exclude(purchase_order__status='CANCELADO')
+                .values_list('purchase_order_id', 'purchase_order__fornecedor_id', 'purchase_order__followup_date')
+                .annotate(first=Min('manifest_date'), receipts=Count('id'))
+                .order_by()
+                .iterator())
+        for _order_id, supplier_id, followup, first, receipts in rows:
+            delays[supplier_id].append(max(0, (first - followup).days))
+            partial[supplier_id] += receipts > 1
+
+        rows = (receipt_model.objects
+                .filter(supplier_id__in=supplier_ids, entry_time__isnull=False, exit_time__isnull=False)
+                .values_list('supplier_id', 'entry_time', 'exit_time')
+                .order_by()
+                .iterator())
+        for supplier_id, entry, exit_ in rows:
+            minutes = (datetime.combine(datetime.min, exit_) - datetime.combine(datetime.min, entry)).total_seconds() / 60
+            if minutes >= 0:
+                dwell[supplier_id].append(minutes)
+
+    cards = {}
+    for supplier_id in supplier_ids:
+        supplier_delays = delays[supplier_id]
+        delivered = len(supplier_delays)
+        on_time = sum(1 for delay in supplier_delays if delay == 0)
+        cards[supplier_id] = {
+            'orders_total': totals[supplier_id],
+            'orders_delivered': delivered,
+            'orders_on_time': on_time,
+            'orders_partial': partial[supplier_id],
+            'receipts_timed': len(dwell[supplier_id]),
+            'on_time_rate': _ratio(on_time, delivered),
+            'avg_delay_days': _ratio(sum(supplier_delays), delivered),
+            'p95_delay_days': percentile(supplier_delays, 95) if delivered else None,
+            'partial_ratio': _ratio(partial[supplier_id], delivered),
+            'avg_dwell_minutes': _ratio(sum(dwell[supplier_id]), len(dwell[supplier_id])),
+        }
+    return cards
+
+
+def refresh(supplier_ids):
+    """Recalcula e grava os indicadores dos fornecedores (um INSERT ... ON CONFLICT)"""
+    supplier_ids = list(Supplier.objects.filter(id__in=set(supplier_ids)).values_list('id', flat=True))
+    if not supplier_ids:
+        return 0
+    cards = compute(supplier_ids)
+    SupplierScorecard.objects.bulk_create(
+        [SupplierScorecard(supplier_id=supplier_id, **fields) for supplier_id, fields in cards.items()],
+        update_conflicts=True, unique_fields=['supplier'], update_fields=METRIC_FIELDS + ['updated_at'],
+    )
+    return len(cards)
+
+
+def apply_changes(batch):
+    """Handler do change-log: recalcula os fornecedores dos registros alterados"""
+    changed = defaultdict(set)
+    for entry in batch:
+        # Exclusões: o registro não existe mais (ver schedule_update)
+        if entry['action'] != ChangeLogEntry.DELETE:
+            changed[entry['resource']].add(entry['object_id'])
+
+    suppliers = set(changed['suppliers'])
+    if changed['orders']:
+        suppliers.update(PurchaseOrder.objects.filter(id__in=changed['orders'])
+                         .values_list('fornecedor_id', flat=True))
+    if changed['deliveries']:
+        for supplier_id, order_supplier_id in (DeliveryReceipt.objects.filter(id__in=changed['deliveries'])
+                                               .values_list('supplier_id', 'purchase_order__fornecedor_id')):
+            suppliers.update(pk for pk in (supplier_id, order_supplier_id) if pk is not None)
+    refresh(suppliers)
+
+
+def process_pending(max_batches=None, batch_size=None):
+    """Aplica as alterações ainda não processadas do change-log; retorna quantas"""
+    batch_size = batch_size or getattr(settings, 'SCORECARDS_BATCH_SIZE', 500)
+    processed = batches = 0
+    while max_batches is None or batches < max_batches:
+        size = consume(CONSUMER, apply_changes, batch_size, RESOURCES)
+        if not size:
+            break
+        processed += size
+        batches += 1
+    return processed
+
+
+# Fornecedores de exclusões por banco, à espera do commit. Por thread,
+# como as conexões do Django
+_pending = threading.local()
+
+
+def _batches():
+    if not hasattr(_pending, 'batches'):
+        _pending.batches = {}
+    return _pending.batches
+
+
+def schedule_update(using, supplier_ids=()):
+    """
+    Agenda a atualização dos indicadores para depois do commit. Cada gravação
+    registra seu callback, mas só o primeiro a rodar enfileira a tarefa, com
+    os fornecedores acumulados; os demais não fazem nada. Se a transação for
+    desfeita, o acumulado segue com o próximo commit.
+    """
+    _batches().setdefault(using, set()).update(supplier_ids)
+    transaction.on_commit(partial(flush_update, using), using=using)
+
+
+def flush_update(using):
+    """Callback on_commit: enfileira a tarefa uma vez por lote acumulado"""
+    supplier_ids = _batches().pop(using, None)
+    if supplier_ids is None:
+        return
+    try:
+        enqueue_update(supplier_ids)
+    except Exception:
+        # O change-log continua pendente e entra na próxima tarefa
+        logger.exception('Falha ao agendar a atualização dos indicadores dos fornecedores')
+
+
+def enqueue_update(supplier_ids=()):
+    """Enfileira a tarefa de atualização, salvo se já houver uma na fila do site"""
+    from .jobs import enqueue
+    from .models import Job
+    from .routing import current_site
+
+    if supplier_ids:
+        return enqueue(JOB_KIND, {'suppliers': sorted(supplier_ids)})
+    if not Job.objects.filter(kind=JOB_KIND, status=Job.QUEUED, site=current_site() or '').exists():
+        return enqueue(JOB_KIND)
+    return None
+
+
+def rebuild(chunk_size=None, progress=None):
+    """
+    Recalcula todos os fornecedores, um lote de fornecedores por transação.
+    O consumidor é posicionado no fim do change-log antes de começar: o que
+    mudar durante a reconstrução ainda será reprocessado.
+    """
+    chunk_size = chunk_size or getattr(settings, 'SCORECARDS_REBUILD_CHUNK', 100)
+    latest = ChangeLogEntry.objects.aggregate(latest=Max('id'))['latest'] or 0
+    ChangeLogConsumer.objects.update_or_create(name=CONSUMER, defaults={'position': latest})
+
+    supplier_ids = list(Supplier.objects.order_by('id').values_list('id', flat=True))
+    done = 0
+    for start in range(0, len(supplier_ids), chunk_size):
+        with transaction.atomic(using=router.db_for_write(SupplierScorecard)):
+            done += refresh(supplier_ids[start:start + chunk_size])
+        if progress:
+            progress(done, len(supplier_ids))
+    return done
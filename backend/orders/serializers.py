@@ -1,32 +1,117 @@
 from rest_framework import serializers
-from .models import PurchaseOrder, Supplier, DeliveryReceipt
+from .models import PurchaseOrder, Supplier, DeliveryReceipt, Job, SupplierScorecard
+
+
+class SparseFieldsetMixin:
+    """
+    Restringe os campos serializados aos escolhidos com ?fields= / ?exclude=.
+    A view passa a seleção em context['selected_fields'].
+    """
+    
+    @classmethod
+    def select_fields(cls, query_params):
+        """Campos escolhidos na requisição, ou None quando não há seleção"""
+        available = list(cls.Meta.fields)
+        fields = [f for f in query_params.get('fields', '').split(',') if f]
+        exclude = [f for f in query_params.get('exclude', '').split(',') if f]
+        if not fields and not exclude:
+            return None
+        
+        unknown = sorted(set(fields + exclude) - set(available))
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Campos desconhecidos: {', '.join(unknown)}"})
+        
+        selected = [f for f in available if f in fields] if fields else available
+        return [f for f in selected if f not in exclude]
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get('selected_fields')
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
 
 class SupplierSerializer(serializers.ModelSerializer):
     class Meta:
         model = Supplier
         fields = ['id', 'code', 'name', 'status']
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     fornecedor = SupplierSerializer(read_only=True)
     is_delayed = serializers.ReadOnlyField()
     delay_days = serializers.ReadOnlyField()
     atraso = serializers.ReadOnlyField()
+    # Enviada de volta nas alterações em lote para detectar edições concorrentes
+    version = serializers.IntegerField(source='sync_seq', read_only=True)
     
     class Meta:
         model = PurchaseOrder
         fields = [
             'id', 'numero_pc', 'data_emissao', 'fornecedor', 
             'quantidade_itens', 'followup_date', 'armazenamento', 
-            'status', 'is_delayed', 'delay_days', 'atraso'
+            'status', 'is_delayed', 'delay_days', 'atraso', 'version'
         ]
+        # Colunas do banco necessárias para cada campo (usado com only())
+        field_sources = {
+            'id': ['id'],
+            'numero_pc': ['numero_pc'],
+            'data_emissao': ['data_emissao'],
+            'fornecedor': ['fornecedor__id', 'fornecedor__code', 'fornecedor__name', 'fornecedor__status'],
+            'quantidade_itens': ['quantidade_itens'],
+            'followup_date': ['followup_date'],
+            'armazenamento': ['armazenamento'],
+            'status': ['status'],
+            'is_delayed': ['followup_date', 'status'],
+            'delay_days': ['followup_date', 'status'],
+            'atraso': ['followup_date', 'status'],
+            'version': ['sync_seq'],
+        }
 
 class DeliveryReceiptSerializer(serializers.ModelSerializer):
     supplier = SupplierSerializer(read_only=True)
+    version = serializers.IntegerField(source='sync_seq', read_only=True)
     
     class Meta:
         model = DeliveryReceipt
         fields = [
             'id', 'cargo_number', 'manifest_date', 'supplier',
             'invoice_number', 'issue_date', 'manifest_time',
-            'entry_time', 'exit_time', 'status'
-        ]
\ No newline at end of file
+            'entry_time', 'exit_time', 'status', 'version'
+        ]
+
+class DeliveryReceiptImportSerializer(serializers.ModelSerializer):
+    """Entrada do POST /api/deliveries/; fornecedores e notas são conferidos em lote pela view"""
+    supplier = serializers.IntegerField(source='supplier_id')
+    
+    class Meta:
+        model = DeliveryReceipt
+        fields = [
+            'cargo_number', 'manifest_date', 'supplier', 'invoice_number',
+            'issue_date', 'manifest_time', 'entry_time', 'exit_time', 'status'
+        ]
+        # Sem o validador de unicidade por linha (uma consulta por recebimento)
+        validators = []
+
+class DockReceiptSerializer(DeliveryReceiptSerializer):
+    class Meta(DeliveryReceiptSerializer.Meta):
+        fields = DeliveryReceiptSerializer.Meta.fields + ['claimed_by', 'claim_expires_at']
+
+class SupplierScorecardSerializer(serializers.ModelSerializer):
+    supplier = SupplierSerializer(read_only=True)
+    
+    class Meta:
+        model = SupplierScorecard
+        fields = [
+            'supplier', 'orders_total', 'orders_delivered', 'on_time_rate', 'avg_delay_days',
+            'p95_delay_days', 'partial_ratio', 'avg_dwell_minutes', 'updated_at'
+        ]
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'params', 'site', 'status', 'progress', 'message', 'result',
+            'error', 'attempts', 'max_attempts', 'cancel_requested',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
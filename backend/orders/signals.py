@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import routing, scorecards
+from .cache import TAG_DELIVERIES, TAG_ORDERS, TAG_SUPPLIERS, invalidate_tags
+from .models import (
+    ChangeLogEntry, DeliveryReceipt, PurchaseOrder, Supplier, SyncTombstone, log_changes, next_sync_seq,
+)
+
+# Enviado uma vez por modelo ao fim de uma alteração em lote (orders/bulk.py),
+# com os argumentos ids e fields, no lugar de um post_save por registro
+bulk_updated = Signal()
+
+# Tags afetadas por alterações em cada modelo. Fornecedores aparecem
+# aninhados nas listagens de pedidos e recebimentos.
+MODEL_TAGS = {
+    Supplier: (TAG_SUPPLIERS, TAG_ORDERS, TAG_DELIVERIES),
+    PurchaseOrder: (TAG_ORDERS,),
+    DeliveryReceipt: (TAG_DELIVERIES,),
+}
+
+
+@receiver([post_save, post_delete], sender=Supplier)
+@receiver([post_save, post_delete], sender=PurchaseOrder)
+@receiver([post_save, post_delete], sender=DeliveryReceipt)
+def invalidate_response_cache(sender, **kwargs):
+    """Invalida o cache das listagens quando um registro muda"""
+    # Só após o commit, para que nenhuma leitura recoloque dados antigos
+    tags = MODEL_TAGS[sender]
+    transaction.on_commit(lambda: invalidate_tags(*tags), using=kwargs.get('using'))
+
+
+@receiver(bulk_updated)
+def invalidate_after_bulk_update(sender, **kwargs):
+    """Uma única invalidação para todo o lote"""
+    tags = MODEL_TAGS[sender]
+    transaction.on_commit(lambda: invalidate_tags(*tags), using=router.db_for_write(sender))
+
+
+@receiver([post_save, bulk_updated], sender=Supplier)
+@receiver([post_save, bulk_updated], sender=PurchaseOrder)
+@receiver([post_save, bulk_updated], sender=DeliveryReceipt)
+def update_scorecards(sender, **kwargs):
+    """Agenda a atualização dos indicadores dos fornecedores (uma por transação)"""
+    if getattr(settings, 'SCORECARDS_AUTO_UPDATE', True):
+        scorecards.schedule_update(kwargs.get('using') or router.db_for_write(sender))
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=DeliveryReceipt)
+def update_scorecards_after_delete(sender, instance, using, **kwargs):
+    """A exclusão não deixa o fornecedor no change-log: ele segue para a tarefa"""
+    if getattr(settings, 'SCORECARDS_AUTO_UPDATE', True):
+        supplier_id = instance.fornecedor_id if sender is PurchaseOrder else instance.supplier_id
+        scorecards.schedule_update(using, [supplier_id])
+
+
+@receiver(post_delete, sender=Supplier)
+@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=DeliveryReceipt)
+def record_deletion(sender, instance, using, **kwargs):
+    """Registra a exclusão para a sincronização incremental e no change-log"""
+    SyncTombstone.objects.using(using).create(
+        resource=sender.sync_resource,
+        object_id=instance.pk,
+        sync_seq=next_sync_seq(using=using),
+    )
+    log_changes(sender, [instance.pk], ChangeLogEntry.DELETE, using=using)
+
+
+@receiver([post_save, bulk_updated], sender=Supplier)
+def replicate_suppliers(sender, using=None, **kwargs):
+    """Com vários sites, copia o fornecedor alterado no catálogo para todos eles"""
+    if not routing.sites() or (using or DEFAULT_DB_ALIAS) != DEFAULT_DB_ALIAS:
+        return
+    ids = [kwargs['instance'].pk] if 'instance' in kwargs else list(kwargs['ids'])
+    transaction.on_commit(lambda: routing.replicate_suppliers(ids), using=DEFAULT_DB_ALIAS)
+
+
+@receiver(post_delete, sender=Supplier)
+def delete_supplier_replicas(sender, instance, using, **kwargs):
+    # As réplicas (e seus pedidos) são removidas em cada site; a exclusão
+    # numa réplica não se propaga de volta
+    if routing.sites() and using == DEFAULT_DB_ALIAS:
+        supplier_id = instance.pk
+        transaction.on_commit(lambda: routing.delete_suppliers([supplier_id]), using=DEFAULT_DB_ALIAS)
@@ -0,0 +1,74 @@
+"""
+Servidor de arquivos estáticos com variantes pré-comprimidas.
+
+Usado quando SERVE_STATIC está ligado (ex.: gunicorn sem nginx na frente).
+Escolhe o .br/.gz gerado no build conforme o Accept-Encoding e marca como
+imutáveis os arquivos com hash de conteúdo no nome: os que o collectstatic
+registrou no manifesto (staticfiles.json). Um nome que apenas parece ter
+hash (logo-original.png) segue com STATIC_MAX_AGE.
+"""
+
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import accepted_encodings
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Nomes com hash do manifesto carregado: (manifesto, nomes)
+_hashed_names = (None, frozenset())
+
+
+def hashed_names():
+    """Nomes com hash do manifesto do collectstatic (vazio sem manifesto)"""
+    global _hashed_names
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if _hashed_names[0] is not hashed_files:
+        _hashed_names = (hashed_files, frozenset((hashed_files or {}).values()))
+    return _hashed_names[1]
+
+
+def cache_control_for(path):
+    if path in hashed_names():
+        return 'public, max-age=31536000, immutable'
+    return f"public, max-age={getattr(settings, 'STATIC_MAX_AGE', 3600)}"
+
+
+def serve_precompressed(request, path):
+    """Serve um arquivo de STATIC_ROOT, preferindo a variante comprimida"""
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    stat = os.stat(full_path)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    serve_path, encoding = full_path, None
+    # Prefere brotli, depois gzip, entre as variantes que existem em disco
+    for candidate in accepted_encodings(request.headers.get('Accept-Encoding', '')):
+        variant = full_path + SUFFIXES[candidate]
+        if os.path.isfile(variant):
+            serve_path, encoding = variant, candidate
+            break
+
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control_for(path)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
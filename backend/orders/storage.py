@@ -0,0 +1,19 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .compression import precompress_file
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Nomes com hash de conteúdo (cache imutável) e variantes .gz/.br geradas
+    durante o collectstatic.
+    """
+    # Sem collectstatic (desenvolvimento e testes), usa o nome original
+    manifest_strict = False
+    
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in list(self.hashed_files.values()):
+            precompress_file(self.path(name))
@@ -0,0 +1,60 @@
+"""
+Sincronização incremental ("mudanças desde o cursor").
+
+Toda gravação em Supplier, PurchaseOrder e DeliveryReceipt recebe um número
+de sequência global (SyncTrackedModel.sync_seq) e toda exclusão deixa um
+SyncTombstone. O cliente guarda o último cursor recebido e pede apenas o que
+mudou depois dele, em vez de baixar páginas inteiras.
+"""
+
+from .models import DeliveryReceipt, PurchaseOrder, Supplier, SyncSequence, SyncTombstone
+from .serializers import DeliveryReceiptSerializer, PurchaseOrderSerializer, SupplierSerializer
+
+# recurso -> (modelo, serializer, select_related)
+RESOURCES = {
+    'suppliers': (Supplier, SupplierSerializer, None),
+    'orders': (PurchaseOrder, PurchaseOrderSerializer, 'fornecedor'),
+    'deliveries': (DeliveryReceipt, DeliveryReceiptSerializer, 'supplier'),
+}
+
+def current_cursor():
+    """Cursor atual, para clientes que acabaram de carregar os dados completos"""
+    return SyncSequence.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+
+
+def changes_since(cursor, limit):
+    """
+    Retorna até `limit` alterações com sequência maior que `cursor`,
+    em ordem de sequência, e o novo cursor.
+    """
+    entries = []
+    for name, (model, _serializer, related) in RESOURCES.items():
+        queryset = model.objects.filter(sync_seq__gt=cursor).order_by('sync_seq')
+        if related:
+            queryset = queryset.select_related(related)
+        entries.extend((obj.sync_seq, name, obj) for obj in queryset[:limit + 1])
+
+    tombstones = SyncTombstone.objects.filter(sync_seq__gt=cursor).order_by('sync_seq')[:limit + 1]
+    entries.extend((tombstone.sync_seq, tombstone.resource, tombstone.object_id) for tombstone in tombstones)
+
+    entries.sort(key=lambda entry: entry[0])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed = {name: [] for name in RESOURCES}
+    deleted = {name: [] for name in RESOURCES}
+    for _seq, name, item in entries:
+        if isinstance(item, int):
+            deleted[name].append(item)
+        else:
+            changed[name].append(item)
+
+    return {
+        'cursor': entries[-1][0] if entries else cursor,
+        'has_more': has_more,
+        'changed': {
+            name: RESOURCES[name][1](objects, many=True).data
+            for name, objects in changed.items()
+        },
+        'deleted': deleted,
+    }
@@ -0,0 +1,280 @@
+"""
+Infraestrutura dos testes: massa de dados semeada uma vez por processo,
+restaurada a cada teste, e execução paralela com tempo monitorado.
+
+SeededTestCase: seed_data() popula o banco de teste uma única vez por
+processo e o resultado é copiado para um banco SQLite em memória (API de
+backup do SQLite, a mesma que o Django usa para clonar os bancos de teste
+em paralelo). Cada teste começa com o banco restaurado dessa cópia, página
+a página, em milissegundos, e termina com o banco de volta ao estado
+anterior à classe, sem o flush do TransactionTestCase. Classes que herdam
+o mesmo seed_data compartilham a mesma cópia.
+
+FastTestRunner (TEST_RUNNER): distribui as classes de teste entre
+TEST_PARALLEL processos (ou --parallel N) e grava o tempo total de cada
+execução completa em TEST_TIMINGS_FILE, comparando-o com a meta
+TEST_TARGET_SECONDS e com as execuções anteriores. Sem o pacote tblib, os
+tracebacks dos processos filhos chegam já formatados. O runner também
+declara os bancos das plantas dos testes de roteamento (TEST_SITE_DATABASES),
+que não existem nas configurações de produção.
+"""
+
+import json
+import random
+import sqlite3
+import time
+import traceback
+from datetime import date, datetime, time as clock, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import TransactionTestCase
+from django.test.runner import (
+    DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner, get_max_test_processes,
+)
+from django.utils import timezone
+
+try:
+    import tblib
+except ImportError:  # pragma: no cover - dependência opcional
+    tblib = None
+
+WAREHOUSES = ['01', '02', '03', '04', '05']
+
+# Bancos das plantas nos testes de roteamento (orders.tests.SiteRoutingTest)
+TEST_SITE_DATABASES = ('site_a', 'site_b')
+
+# Cópias em memória por processo: {(classe dona do seed_data, alias): conexão}
+_snapshots = {}
+# Estado de cada banco antes da primeira classe semeada: {alias: conexão}
+_pristine = {}
+
+
+def seed_dataset(suppliers=40, orders=5000, days=730, seed=0):
+    """
+    Massa de dados determinística para testes com volume: fornecedores,
+    pedidos espalhados pelos últimos `days` dias em cinco armazéns e os
+    recebimentos dos pedidos já vencidos (os parciais com um só). Os
+    indicadores dos fornecedores são reconstruídos no fim, como após uma
+    carga real.
+    """
+    # Importados aqui: os processos iniciados com spawn carregam este módulo
+    # antes do django.setup()
+    from . import scorecards
+    from .models import DeliveryReceipt, PurchaseOrder, Supplier
+
+    rng = random.Random(seed)
+    today = date.today()
+    created = Supplier.objects.bulk_create([
+        Supplier(code=f"F{i:04d}", name=f"FORNECEDOR {i:04d} LTDA", status='ATIVO' if i % 10 else 'INATIVO')
+        for i in range(suppliers)
+    ])
+    supplier_ids = [supplier.pk for supplier in created]
+
+    purchase_orders = []
+    for i in range(orders):
+        issued = today - timedelta(days=rng.randint(0, days))
+        followup = issued + timedelta(days=rng.randint(3, 30))
+        if followup >= today:
+            status = 'PENDENTE'
+        else:
+            status = rng.choices(['FINALIZADO', 'PARCIAL', 'PENDENTE', 'CANCELADO'], [70, 10, 15, 5])[0]
+        purchase_orders.append(PurchaseOrder(
+            numero_pc=f"PC{i:07d}", data_emissao=issued, fornecedor_id=rng.choice(supplier_ids),
+            quantidade_itens=rng.randint(1, 50), followup_date=followup,
+            armazenamento=rng.choice(WAREHOUSES), status=status))
+    purchase_orders = PurchaseOrder.objects.bulk_create(purchase_orders)
+
+    receipts = []
+    for order in purchase_orders:
+        if order.status not in ('FINALIZADO', 'PARCIAL'):
+            continue
+        manifest = min(today, order.followup_date + timedelta(days=rng.randint(-3, 10)))
+        entry = clock(rng.randint(6, 16), rng.choice([0, 15, 30, 45]))
+        exit_ = (datetime.combine(manifest, entry) + timedelta(minutes=rng.randint(20, 180))).time()
+        receipts.append(DeliveryReceipt(
+            cargo_number=f"CG{len(receipts):07d}", manifest_date=manifest, supplier_id=order.fornecedor_id,
+            invoice_number=f"NF{len(receipts):07d}", issue_date=manifest - timedelta(days=rng.randint(0, 5)),
+            manifest_time=entry, entry_time=entry, exit_time=exit_,
+            status='FINALIZADO' if order.status == 'FINALIZADO' else 'PENDENTE', purchase_order=order))
+    DeliveryReceipt.objects.bulk_create(receipts)
+
+    scorecards.rebuild()
+    return {'suppliers': len(supplier_ids), 'orders': len(purchase_orders), 'receipts': len(receipts)}
+
+
+def _copy(alias):
+    """Cópia em memória do banco de teste `alias`"""
+    connection = connections[alias]
+    connection.ensure_connection()
+    snapshot = sqlite3.connect(':memory:', check_same_thread=False)
+    connection.connection.backup(snapshot)
+    return snapshot
+
+
+def _restore(alias, snapshot):
+    """Sobrescreve o banco de teste `alias` com a cópia"""
+    connection = connections[alias]
+    connection.ensure_connection()
+    snapshot.backup(connection.connection)
+
+
+class SeededTestCase(TransactionTestCase):
+    """
+    Testes sobre uma massa de dados grande, criada uma vez por processo e
+    restaurada antes de cada teste (somente SQLite). As subclasses redefinem
+    seed_data() para outra massa.
+    """
+
+    @classmethod
+    def seed_data(cls):
+        return seed_dataset()
+
+    @classmethod
+    def _seed_owner(cls):
+        return next(klass for klass in cls.__mro__ if 'seed_data' in vars(klass))
+
+    @classmethod
+    def _seeded_snapshots(cls):
+        aliases = cls._databases_names(include_mirrors=False)
+        owner = cls._seed_owner()
+        if any((owner, alias) not in _snapshots for alias in aliases):
+            for alias in aliases:
+                if alias not in _pristine:
+                    _pristine[alias] = _copy(alias)
+                else:
+                    _restore(alias, _pristine[alias])
+            with transaction.atomic():
+                cls.seed_data()
+            for alias in aliases:
+                _snapshots[owner, alias] = _copy(alias)
+        return {alias: _snapshots[owner, alias] for alias in aliases}
+
+    @classmethod
+    def _fixture_setup(cls):
+        for alias, snapshot in cls._seeded_snapshots().items():
+            _restore(alias, snapshot)
+
+    def _fixture_teardown(self):
+        for alias in self._databases_names(include_mirrors=False):
+            _restore(alias, _pristine[alias])
+
+
+def add_test_databases(aliases=TEST_SITE_DATABASES):
+    """
+    Declara os bancos dos sites só para os testes, com a configuração do
+    "default". Como no "default", o banco de teste do SQLite fica em memória.
+    """
+    for alias in aliases:
+        settings.DATABASES.setdefault(alias, {
+            **settings.DATABASES[DEFAULT_DB_ALIAS], 'NAME': settings.BASE_DIR / f'{alias}.sqlite3', 'TEST': {},
+        })
+    # O ConnectionHandler guarda a configuração lida no primeiro acesso
+    connections.__dict__.pop('settings', None)
+
+
+class RemoteTraceback(Exception):
+    """Traceback de um processo filho, já formatado"""
+
+
+class _RemoteTestResult(RemoteTestResult):
+    """Sem o tblib, envia o traceback como texto em vez de falhar ao serializá-lo"""
+
+    def _portable(self, test, err):
+        if tblib is None and err is not None and err[2] is not None:
+            return RemoteTraceback, RemoteTraceback(''.join(traceback.format_exception(*err))), None
+        return err
+
+    def addError(self, test, err):
+        super().addError(test, self._portable(test, err))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, self._portable(test, err))
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, self._portable(test, err))
+
+
+class _RemoteTestRunner(RemoteTestRunner):
+    resultclass = _RemoteTestResult
+
+
+class _ParallelTestSuite(ParallelTestSuite):
+    runner_class = _RemoteTestRunner
+
+    def process_setup(*args):
+        # Chamado sem self (como o _process_setup_stub do Django) nos
+        # processos iniciados com spawn, que leem as configurações de novo
+        add_test_databases()
+
+
+def timings_path():
+    return Path(getattr(settings, 'TEST_TIMINGS_FILE', settings.BASE_DIR / 'test_timings.jsonl'))
+
+
+def load_timings(path=None):
+    """Execuções completas registradas, da mais antiga para a mais recente"""
+    path = Path(path or timings_path())
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_timing(seconds, tests, failed, processes, path=None):
+    entry = {
+        'date': timezone.now().isoformat(timespec='seconds'),
+        'seconds': round(seconds, 2),
+        'tests': tests,
+        'failed': failed,
+        'processes': processes,
+    }
+    with open(path or timings_path(), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+    return entry
+
+
+class FastTestRunner(DiscoverRunner):
+    """DiscoverRunner em TEST_PARALLEL processos, com o tempo total monitorado"""
+
+    parallel_test_suite = _ParallelTestSuite
+
+    def __init__(self, parallel=0, pdb=False, **kwargs):
+        # --parallel na linha de comando tem precedência sobre TEST_PARALLEL
+        if not parallel and not pdb:
+            parallel = getattr(settings, 'TEST_PARALLEL', 0)
+            if parallel == 'auto':
+                parallel = get_max_test_processes()
+        super().__init__(parallel=int(parallel), pdb=pdb, **kwargs)
+        self.result = None
+        add_test_databases()
+
+    def run_suite(self, suite, **kwargs):
+        self.result = super().run_suite(suite, **kwargs)
+        return self.result
+
+    def run_tests(self, test_labels, **kwargs):
+        start = time.perf_counter()
+        failed = super().run_tests(test_labels, **kwargs)
+        seconds = time.perf_counter() - start
+        # Só execuções completas entram no histórico: são comparáveis entre si
+        if not test_labels and self.result is not None:
+            self.report_timing(seconds, failed)
+        return failed
+
+    def report_timing(self, seconds, failed):
+        history = load_timings()
+        processes = max(self.parallel, 1)
+        record_timing(seconds, self.result.testsRun, failed, processes)
+        target = getattr(settings, 'TEST_TARGET_SECONDS', None)
+
+        message = f"⏱️  {self.result.testsRun} testes em {seconds:.1f} s com {processes} processo(s)"
+        if target:
+            message += f" (meta: {target} s)"
+        self.log(message)
+        if history:
+            recent = ', '.join(f"{entry['seconds']:.1f}" for entry in history[-5:])
+            self.log(f"   Execuções anteriores: {recent} s")
+        if target and seconds > target:
+            self.log(f"⚠️  Acima da meta de {target} s")
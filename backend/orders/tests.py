@@ -1,6 +1,10 @@
-from django.test import TestCase
+from unittest import skipUnless
+from django.test import TestCase, TransactionTestCase, override_settings
 from datetime import date, timedelta
 from .models import Supplier, PurchaseOrder, DeliveryReceipt
+from .forecast import is_available as forecast_available
+from .columnar import is_available as columnar_available
+from .testing import SeededTestCase
 
 
 class SupplierModelTest(TestCase):
@@ -144,3 +148,2160 @@ class BasicIntegrationTest(TestCase):
         self.assertEqual(purchase_order.supplier, supplier)
         self.assertEqual(delivery.supplier, supplier)
 
+
+
+class ResponseCacheTest(TestCase):
+    """Testes do cache de respostas das listagens"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        PurchaseOrder.objects.create(
+            numero_pc="PC2024001",
+            data_emissao=date.today(),
+            fornecedor=self.supplier,
+            quantidade_itens=10,
+            followup_date=date.today(),
+            armazenamento="01",
+        )
+    
+    def test_cache_hit_with_normalized_params(self):
+        """Parâmetros em outra ordem reutilizam a mesma entrada"""
+        first = self.client.get('/api/orders/?status=PENDENTE&armazenamento=01')
+        second = self.client.get('/api/orders/?armazenamento=01&status=PENDENTE&search=')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+    
+    def test_save_invalidates_tag(self):
+        """Salvar um pedido invalida a listagem de pedidos"""
+        self.assertEqual(self.client.get('/api/orders/').json()['count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrder.objects.create(
+                numero_pc="PC2024002",
+                data_emissao=date.today(),
+                fornecedor=self.supplier,
+                quantidade_itens=5,
+                followup_date=date.today(),
+                armazenamento="02",
+            )
+        response = self.client.get('/api/orders/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
+    
+    def test_concurrent_misses_compute_once(self):
+        """Requisições simultâneas após invalidação calculam uma única vez"""
+        import threading
+        from .cache import get_or_compute
+        
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            threading.Event().wait(0.1)
+            return {'ok': True}
+        
+        threads = [
+            threading.Thread(target=get_or_compute, args=('resp:test:stampede', compute))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+
+
+class ProfilingTest(TestCase):
+    """Testes do profiling de requisições"""
+    
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .profiling import store
+        store.clear()
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "admin123")
+    
+    def test_header_triggers_profile(self):
+        """Cabeçalho X-Profile captura o perfil da requisição"""
+        with self.settings(PROFILING_ENABLED=True, RESPONSE_CACHE_ENABLED=False):
+            response = self.client.get('/api/orders/', HTTP_X_PROFILE='1')
+        self.assertIn('X-Profile-Id', response)
+        
+        self.client.force_login(self.admin)
+        profile = self.client.get(f"/api/profiles/{response['X-Profile-Id']}/").json()
+        self.assertEqual(profile['path'], '/api/orders/')
+        self.assertIn('filters', profile['phases'])
+        self.assertTrue(profile['call_tree'])
+    
+    def test_disabled_by_default(self):
+        """Sem PROFILING_ENABLED nenhuma requisição é perfilada"""
+        response = self.client.get('/api/orders/', HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+    
+    def test_one_profile_at_a_time(self):
+        """Com outro perfil em andamento, a requisição segue sem ser perfilada"""
+        from . import profiling
+        
+        self.assertTrue(profiling._active.acquire(blocking=False))
+        self.addCleanup(profiling._active.release)
+        with self.settings(PROFILING_ENABLED=True, RESPONSE_CACHE_ENABLED=False):
+            with self.assertLogs('orders.profiling', 'WARNING'):
+                response = self.client.get('/api/orders/', HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+    
+    def test_endpoint_requires_admin(self):
+        """Perfis só são acessíveis para administradores"""
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 403)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 200)
+
+
+class SlowQueryLogTest(TestCase):
+    """Testes do registro de consultas lentas"""
+    
+    def setUp(self):
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        PurchaseOrder.objects.create(
+            numero_pc="PC2024001",
+            data_emissao=date.today(),
+            fornecedor=supplier,
+            quantidade_itens=10,
+            followup_date=date.today(),
+            armazenamento="01",
+        )
+    
+    def test_records_query_with_plan_and_filters(self):
+        """Consultas acima do limite são gravadas com view, filtros e EXPLAIN"""
+        from .models import SlowQuery
+        from .querylog import summarize_slow_queries
+        
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0, RESPONSE_CACHE_ENABLED=False):
+            self.client.get('/api/orders/?status=PENDENTE&search=PC&page=1')
+        
+        entry = SlowQuery.objects.filter(view='order-list').first()
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.filters, 'search+status')
+        self.assertTrue(entry.plan)
+        self.assertEqual(summarize_slow_queries()[0]['view'], 'order-list')
+    
+    def test_store_is_bounded(self):
+        """A tabela mantém no máximo SLOW_QUERY_LOG_MAX_ENTRIES registros"""
+        from .models import SlowQuery
+        
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG_MAX_ENTRIES=3,
+                           RESPONSE_CACHE_ENABLED=False):
+            for _ in range(3):
+                self.client.get('/api/orders/')
+        self.assertEqual(SlowQuery.objects.count(), 3)
+
+
+class DiagnosticsTest(TestCase):
+    """Testes do diagnóstico de desempenho"""
+    
+    def test_benchmarks_execute_queries(self):
+        """As consultas representativas são realmente executadas"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .diagnostics import run_benchmarks
+        
+        with CaptureQueriesContext(connection) as ctx:
+            results = run_benchmarks(repeat=2)
+        self.assertEqual(set(results), {'stats', 'first_page', 'search'})
+        # 3 execuções (aquecimento + 2) de 4 + 2 + 2 consultas
+        self.assertEqual(len(ctx.captured_queries), 3 * 8)
+    
+    def test_percentile_and_regressions(self):
+        """Percentis interpolados e detecção de regressão contra a linha de base"""
+        from .diagnostics import percentile, compare_with_baseline
+        
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertAlmostEqual(percentile([10, 20], 95), 19.5)
+        
+        baseline = {'stats': {'p95': 10.0}, 'search': {'p95': 10.0}}
+        current = {'stats': {'p95': 12.0}, 'search': {'p95': 30.0}}
+        regressions = compare_with_baseline(current, baseline, tolerance=0.5)
+        self.assertEqual([r['query'] for r in regressions], ['search'])
+
+
+class StartupImportTimeTest(TestCase):
+    """Orçamento de tempo de importação medido com -X importtime"""
+    
+    CLI_BUDGET_MS = 150
+    SETUP_BUDGET_MS = 1500
+    
+    def import_times(self, *args):
+        """Executa o Python com -X importtime e retorna {módulo: cumulativo em ms}"""
+        import os
+        import subprocess
+        import sys
+        from django.conf import settings
+        
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='backend.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', *args],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            # Apenas módulos de primeiro nível, para não somar o mesmo tempo duas vezes
+            if name.startswith(' ') and not name.startswith('  '):
+                times[name.strip()] = int(cumulative_us) / 1000
+        return times
+    
+    def test_cli_help_does_not_load_django(self):
+        """--help responde sem importar Django nem os modelos"""
+        times = self.import_times('management_commands.py', '--help')
+        self.assertNotIn('django', times)
+        self.assertLess(sum(times.values()), self.CLI_BUDGET_MS)
+    
+    def test_django_setup_budget(self):
+        """django.setup() não carrega dependências pesadas e fica no orçamento"""
+        times = self.import_times('-c', 'import django; django.setup(); import orders.views')
+        self.assertNotIn('faker', times)
+        self.assertLess(sum(times.values()), self.SETUP_BUDGET_MS)
+    
+    def test_optional_dependencies_load_on_demand(self):
+        """numpy e pyarrow só são importados pela previsão e pela exportação colunar"""
+        import os
+        import subprocess
+        import sys
+        from django.conf import settings
+        
+        code = ('import sys, django; django.setup(); import orders.views, orders.urls; '
+                'print(sorted({"numpy", "pyarrow"} & set(sys.modules)))')
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='backend.settings')
+        result = subprocess.run([sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+class ChangesFeedTest(TestCase):
+    """Testes da sincronização incremental"""
+    
+    def setUp(self):
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.order = PurchaseOrder.objects.create(
+            numero_pc="PC2024001",
+            data_emissao=date.today(),
+            fornecedor=self.supplier,
+            quantidade_itens=10,
+            followup_date=date.today(),
+            armazenamento="01",
+        )
+    
+    def test_initial_sync_and_steady_state(self):
+        """Sem alterações, o feed não devolve nenhuma linha"""
+        initial = self.client.get('/api/changes/').json()
+        self.assertEqual(len(initial['changed']['suppliers']), 1)
+        self.assertEqual(len(initial['changed']['orders']), 1)
+        
+        steady = self.client.get(f"/api/changes/?since={initial['cursor']}").json()
+        self.assertEqual(steady['cursor'], initial['cursor'])
+        self.assertFalse(any(steady['changed'].values()))
+    
+    def test_updates_and_deletions_since_cursor(self):
+        """Só o registro alterado e a exclusão aparecem após o cursor"""
+        cursor = self.client.get('/api/changes/').json()['cursor']
+        
+        self.order.status = 'PARCIAL'
+        self.order.save(update_fields=['status'])
+        delivery = DeliveryReceipt.objects.create(
+            cargo_number="CG001",
+            manifest_date=date.today(),
+            supplier=self.supplier,
+            invoice_number="NF001",
+            issue_date=date.today(),
+        )
+        delivery_id = delivery.pk
+        delivery.delete()
+        
+        feed = self.client.get(f'/api/changes/?since={cursor}').json()
+        self.assertEqual([o['status'] for o in feed['changed']['orders']], ['PARCIAL'])
+        self.assertEqual(feed['changed']['suppliers'], [])
+        self.assertEqual(feed['deleted']['deliveries'], [delivery_id])
+    
+    def test_limit_pages_through_changes(self):
+        """has_more indica que há mais alterações além do limite"""
+        feed = self.client.get('/api/changes/?limit=1').json()
+        self.assertTrue(feed['has_more'])
+        rest = self.client.get(f"/api/changes/?since={feed['cursor']}&limit=10").json()
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(len(rest['changed']['orders']), 1)
+    
+    def test_bulk_update_pages_without_losing_rows(self):
+        """update() em lote dá uma sequência por registro: nenhuma página perde linhas"""
+        for i in range(4):
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC20240{i + 10}", data_emissao=date.today(), fornecedor=self.supplier,
+                quantidade_itens=1, followup_date=date.today(), armazenamento="01")
+        cursor = self.client.get('/api/changes/?since=latest').json()['cursor']
+        PurchaseOrder.objects.update(status='PARCIAL')
+        
+        seen = []
+        while True:
+            feed = self.client.get(f'/api/changes/?since={cursor}&limit=2').json()
+            seen += [o['id'] for o in feed['changed']['orders']]
+            cursor = feed['cursor']
+            if not feed['has_more']:
+                break
+        self.assertEqual(sorted(seen), sorted(PurchaseOrder.objects.values_list('id', flat=True)))
+        self.assertEqual(len(set(PurchaseOrder.objects.values_list('sync_seq', flat=True))), 5)
+    
+    def test_latest_cursor(self):
+        """?since=latest devolve o cursor atual sem dados"""
+        latest = self.client.get('/api/changes/?since=latest').json()
+        full = self.client.get('/api/changes/').json()
+        self.assertEqual(latest, {'cursor': full['cursor']})
+
+
+class ChangeLogTest(TestCase):
+    """Testes do change-log transacional"""
+    
+    def setUp(self):
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.orders = PurchaseOrder.objects.bulk_create([
+            PurchaseOrder(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=date.today(),
+                fornecedor=self.supplier,
+                quantidade_itens=10,
+                followup_date=date.today(),
+                armazenamento="01",
+            )
+            for i in range(3)
+        ])
+    
+    def actions(self, resource='orders'):
+        from .models import ChangeLogEntry
+        return list(ChangeLogEntry.objects.filter(resource=resource).values_list('action', flat=True))
+    
+    def test_writes_are_logged(self):
+        """save, bulk_create, bulk_update, update e delete geram entradas"""
+        order = self.orders[0]
+        order.status = 'PARCIAL'
+        order.save(update_fields=['status'])
+        
+        for order in self.orders:
+            order.status = 'FINALIZADO'
+        PurchaseOrder.objects.bulk_update(self.orders, ['status'])
+        PurchaseOrder.objects.filter(pk=self.orders[1].pk).update(status='CANCELADO')
+        self.orders[2].delete()
+        
+        self.assertEqual(self.actions(), ['CREATE'] * 3 + ['UPDATE'] * 5 + ['DELETE'])
+        self.assertEqual(PurchaseOrder.objects.get(pk=self.orders[1].pk).sync_seq,
+                         max(PurchaseOrder.objects.values_list('sync_seq', flat=True)))
+    
+    def test_rollback_discards_entries(self):
+        """A entrada é gravada na mesma transação da alteração"""
+        from django.db import transaction
+        
+        try:
+            with transaction.atomic():
+                PurchaseOrder.objects.update(status='CANCELADO')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(self.actions(), ['CREATE'] * 3)
+    
+    def test_consumer_advances_offset(self):
+        """O consumidor recebe cada entrada uma única vez, em lotes"""
+        from .changelog import consume
+        
+        received = []
+        self.assertEqual(consume('stats', received.extend, batch_size=2), 2)
+        self.assertEqual(consume('stats', received.extend, batch_size=2), 2)
+        self.assertEqual(consume('stats', received.extend, batch_size=2), 0)
+        ids = [entry['id'] for entry in received]
+        self.assertEqual(ids, sorted(set(ids)))
+    
+    def test_compact_and_expire(self):
+        """Compactação mantém a última entrada por registro; expiração respeita consumidores"""
+        from .changelog import compact, consume, expire
+        from .models import ChangeLogEntry
+        
+        PurchaseOrder.objects.update(status='PARCIAL')
+        self.assertEqual(compact(), 3)
+        self.assertEqual(self.actions(), ['UPDATE'] * 3)
+        
+        consume('stats', lambda batch: None, batch_size=2)
+        self.assertEqual(expire(retention_days=-1), 2)
+        self.assertEqual(ChangeLogEntry.objects.count(), 2)
+
+
+class BatchEndpointTest(TestCase):
+    """Testes do endpoint de lote"""
+    
+    def setUp(self):
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.order = PurchaseOrder.objects.create(
+            numero_pc="PC2024001",
+            data_emissao=date.today(),
+            fornecedor=supplier,
+            quantidade_itens=10,
+            followup_date=date.today(),
+            armazenamento="01",
+        )
+    
+    def post_batch(self, requests):
+        return self.client.post('/api/batch/', {'requests': requests}, content_type='application/json')
+    
+    def test_combined_response_matches_individual_requests(self):
+        """Cada sub-resposta é igual à da requisição individual"""
+        response = self.post_batch([
+            {'id': 'stats', 'path': '/api/stats/'},
+            {'id': 'orders', 'path': '/api/orders/?status=PENDENTE&page=1'},
+            {'id': 'suppliers', 'path': '/api/suppliers/'},
+            {'id': 'detail', 'path': f'/api/orders/{self.order.pk}/'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['responses']
+        self.assertEqual(results['stats']['body'], self.client.get('/api/stats/').json())
+        self.assertEqual(results['orders']['body'],
+                         self.client.get('/api/orders/?status=PENDENTE&page=1').json())
+        self.assertEqual(results['suppliers']['status'], 200)
+        self.assertEqual(results['detail']['body']['numero_pc'], 'PC2024001')
+    
+    def test_invalid_sub_requests(self):
+        """Rotas inexistentes, o próprio lote e lotes grandes são rejeitados"""
+        results = self.post_batch([
+            {'id': 'missing', 'path': '/api/nao-existe/'},
+            {'id': 'nested', 'path': '/api/batch/'},
+            {'id': 'order', 'path': '/api/orders/999999/'},
+        ]).json()['responses']
+        self.assertEqual(results['missing']['status'], 404)
+        self.assertEqual(results['nested']['status'], 400)
+        self.assertEqual(results['order']['status'], 404)
+        
+        with self.settings(BATCH_MAX_REQUESTS=1):
+            response = self.post_batch([{'path': '/api/stats/'}, {'path': '/api/health/'}])
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldsetTest(TestCase):
+    """Testes de ?fields=, ?exclude= e do formato compacto"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        for i in range(3):
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=date.today(),
+                fornecedor=supplier,
+                quantidade_itens=10,
+                followup_date=date.today() - timedelta(days=2),
+                armazenamento="01",
+            )
+    
+    def test_fields_prunes_output_and_select(self):
+        """Só os campos pedidos são serializados e carregados do banco"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/orders/?fields=numero_pc,atraso')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['results'][0]), {'numero_pc', 'atraso'})
+        self.assertEqual(response.json()['results'][0]['atraso'], 2)
+        
+        select = ctx.captured_queries[-1]['sql']
+        self.assertNotIn('orders_supplier', select)
+        self.assertNotIn('quantidade_itens', select)
+    
+    def test_exclude_and_unknown_fields(self):
+        """?exclude= remove campos; campos desconhecidos geram 400"""
+        row = self.client.get('/api/orders/?exclude=fornecedor,delay_days').json()['results'][0]
+        self.assertNotIn('fornecedor', row)
+        self.assertIn('atraso', row)
+        self.assertEqual(self.client.get('/api/orders/?fields=inexistente').status_code, 400)
+    
+    def test_compact_format(self):
+        """?format=compact envia uma linha de cabeçalho e os registros como listas"""
+        full = self.client.get('/api/orders/').json()
+        compact = self.client.get('/api/orders/?format=compact').json()
+        self.assertEqual(compact['count'], full['count'])
+        self.assertEqual(compact['columns'], list(full['results'][0]))
+        self.assertEqual(
+            [dict(zip(compact['columns'], row)) for row in compact['rows']],
+            full['results'],
+        )
+
+
+class CompressionTest(TestCase):
+    """Testes da compressão de respostas e dos estáticos pré-comprimidos"""
+    
+    def setUp(self):
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        for i in range(30):
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=date.today(),
+                fornecedor=supplier,
+                quantidade_itens=10,
+                followup_date=date.today(),
+                armazenamento="01",
+            )
+    
+    def test_gzip_above_threshold(self):
+        """Respostas grandes são comprimidas quando o cliente aceita gzip"""
+        import gzip
+        
+        response = self.client.get('/api/orders/?page_size=30', HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(gzip.decompress(response.content)) > len(response.content), True)
+        
+        plain = self.client.get('/api/orders/?page_size=30')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+    
+    def test_small_responses_are_not_compressed(self):
+        """Respostas abaixo de COMPRESSION_MIN_SIZE seguem sem compressão"""
+        response = self.client.get('/api/health/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+    
+    def test_precompressed_static_files(self):
+        """Variante .gz é servida com cache imutável para nomes com hash do manifesto"""
+        import json
+        import os
+        import tempfile
+        from django.test import RequestFactory
+        from .compression import precompress_directory
+        from .static import serve_precompressed
+        
+        with tempfile.TemporaryDirectory() as root:
+            for name in ('app.1a2b3c4d5e6f.css', 'logo-original.css'):
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write('body { color: black; }\n' * 200)
+            with open(os.path.join(root, 'staticfiles.json'), 'w') as f:
+                json.dump({'version': '1.1', 'paths': {'app.css': 'app.1a2b3c4d5e6f.css'}}, f)
+            created = precompress_directory(root)
+            self.assertIn(os.path.join(root, 'app.1a2b3c4d5e6f.css.gz'), created)
+            
+            factory = RequestFactory()
+            with self.settings(STATIC_ROOT=root):
+                request = factory.get('/static/app.1a2b3c4d5e6f.css', HTTP_ACCEPT_ENCODING='gzip')
+                response = serve_precompressed(request, 'app.1a2b3c4d5e6f.css')
+                response.close()
+                plain = serve_precompressed(factory.get('/static/x'), 'app.1a2b3c4d5e6f.css')
+                plain.close()
+                # Parece ter hash do Vite, mas não está no manifesto
+                lookalike = serve_precompressed(factory.get('/static/x'), 'logo-original.css')
+                lookalike.close()
+        
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', lookalike['Cache-Control'])
+
+
+class ArchiveTest(TestCase):
+    """Testes do arquivamento de pedidos encerrados"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        old = date.today() - timedelta(days=200)
+        self.orders = []
+        for i, (status, issued) in enumerate([
+            ('FINALIZADO', old), ('CANCELADO', old), ('FINALIZADO', old),
+            ('PENDENTE', old), ('FINALIZADO', date.today()),
+        ]):
+            self.orders.append(PurchaseOrder.objects.create(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=issued,
+                fornecedor=self.supplier,
+                quantidade_itens=10,
+                followup_date=issued,
+                armazenamento="01",
+                status=status,
+            ))
+        self.receipt = DeliveryReceipt.objects.create(
+            cargo_number="CG001",
+            manifest_date=old,
+            supplier=self.supplier,
+            invoice_number="NF001",
+            issue_date=old,
+            status='FINALIZADO',
+            purchase_order=self.orders[0],
+        )
+    
+    def test_moves_closed_orders_in_batches(self):
+        """Pedidos encerrados antigos e seus recebimentos saem da tabela ativa"""
+        from .archive import archive_orders
+        from .models import ArchivedDeliveryReceipt, ArchivedPurchaseOrder
+        
+        totals = archive_orders(batch_size=2)
+        self.assertEqual(totals, {'orders': 3, 'receipts': 1, 'batches': 2})
+        self.assertEqual(
+            sorted(PurchaseOrder.objects.values_list('numero_pc', flat=True)),
+            ['PC2024003', 'PC2024004'],
+        )
+        self.assertEqual(ArchivedPurchaseOrder.objects.count(), 3)
+        archived_receipt = ArchivedDeliveryReceipt.objects.get()
+        self.assertEqual(archived_receipt.pk, self.receipt.pk)
+        self.assertEqual(archived_receipt.purchase_order_id, self.orders[0].pk)
+        self.assertFalse(DeliveryReceipt.objects.exists())
+        
+        # Reexecutar é seguro: não há mais nada a mover
+        self.assertEqual(archive_orders()['orders'], 0)
+    
+    def test_interrupted_run_resumes(self):
+        """max_batches interrompe o processo, que continua na próxima execução"""
+        from .archive import archive_orders
+        from .models import ArchivedPurchaseOrder
+        
+        self.assertEqual(archive_orders(batch_size=1, max_batches=1)['orders'], 1)
+        self.assertEqual(ArchivedPurchaseOrder.objects.count(), 1)
+        self.assertEqual(archive_orders(batch_size=1)['orders'], 2)
+        self.assertEqual(ArchivedPurchaseOrder.objects.count(), 3)
+    
+    def test_conflicting_copy_keeps_live_rows(self):
+        """Uma cópia em conflito no arquivo desfaz o lote sem remover nada da tabela ativa"""
+        from django.db import IntegrityError
+        from django.utils import timezone
+        from .archive import archive_orders
+        from .models import ArchivedPurchaseOrder
+        
+        ArchivedPurchaseOrder.objects.create(
+            id=999, numero_pc=self.orders[0].numero_pc, data_emissao=date.today(), fornecedor=self.supplier,
+            quantidade_itens=1, followup_date=date.today(), armazenamento="01", status='FINALIZADO',
+            updated_at=timezone.now())
+        
+        with self.assertRaises(IntegrityError):
+            archive_orders(batch_size=10)
+        self.assertEqual(PurchaseOrder.objects.count(), 5)
+        self.assertTrue(DeliveryReceipt.objects.filter(pk=self.receipt.pk).exists())
+        self.assertEqual(list(ArchivedPurchaseOrder.objects.values_list('id', flat=True)), [999])
+    
+    def test_include_archived_listing(self):
+        """?include_archived=1 devolve pedidos ativos e arquivados"""
+        from .archive import archive_orders
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_orders()
+        
+        hot = self.client.get('/api/orders/').json()
+        self.assertEqual(hot['count'], 2)
+        
+        everything = self.client.get('/api/orders/?include_archived=1&status=FINALIZADO').json()
+        self.assertEqual(everything['count'], 3)
+        self.assertEqual(everything['results'][0]['numero_pc'], 'PC2024004')
+        self.assertEqual(everything['results'][1]['fornecedor']['code'], 'FOR001')
+        
+        archived = self.client.get(f'/api/orders/{self.orders[0].pk}/?include_archived=1')
+        self.assertEqual(archived.status_code, 200)
+        self.assertEqual(self.client.get(f'/api/orders/{self.orders[0].pk}/').status_code, 404)
+        
+        deliveries = self.client.get('/api/deliveries/?include_archived=1').json()
+        self.assertEqual(deliveries['count'], 1)
+    
+    def test_archival_is_reported_as_deletion(self):
+        """Clientes da sincronização incremental removem os pedidos arquivados"""
+        from .archive import archive_orders
+        
+        cursor = self.client.get('/api/changes/?since=latest').json()['cursor']
+        archive_orders()
+        feed = self.client.get(f'/api/changes/?since={cursor}').json()
+        self.assertEqual(sorted(feed['deleted']['orders']), [o.pk for o in self.orders[:3]])
+        self.assertEqual(feed['deleted']['deliveries'], [self.receipt.pk])
+
+
+class PurgeTest(TestCase):
+    """Testes da remoção em massa"""
+    
+    def create_orders(self, count):
+        supplier = Supplier.objects.create(code=f"F{count}", name="Fornecedor Teste LTDA")
+        PurchaseOrder.objects.bulk_create([
+            PurchaseOrder(
+                numero_pc=f"PC{count}-{i:05d}",
+                data_emissao=date.today(),
+                fornecedor=supplier,
+                quantidade_itens=10,
+                followup_date=date.today(),
+                armazenamento="01",
+            )
+            for i in range(count)
+        ])
+    
+    def peak_memory_of_purge(self, count):
+        import tracemalloc
+        from .purge import purge_all
+        
+        self.create_orders(count)
+        tracemalloc.start()
+        try:
+            counts = purge_all(chunk_size=100)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(counts['orders_purchaseorder'], count)
+        return peak
+    
+    def test_chunked_purge_uses_constant_memory(self):
+        """O pico de memória não cresce com o número de registros"""
+        small = self.peak_memory_of_purge(300)
+        large = self.peak_memory_of_purge(3000)
+        self.assertLess(large, small * 2)
+        self.assertFalse(PurchaseOrder.objects.exists())
+    
+    def test_truncate_resets_sequences(self):
+        """Truncar esvazia as tabelas em ordem e reinicia os ids"""
+        from .purge import purge_all
+        
+        self.create_orders(5)
+        supplier = Supplier.objects.get()
+        DeliveryReceipt.objects.create(
+            cargo_number="CG001", manifest_date=date.today(), supplier=supplier,
+            invoice_number="NF001", issue_date=date.today(),
+            purchase_order=PurchaseOrder.objects.first(),
+        )
+        progress = []
+        counts = purge_all(progress=progress.append)
+        
+        self.assertEqual(counts['orders_purchaseorder'], 5)
+        self.assertEqual(counts['orders_deliveryreceipt'], 1)
+        self.assertEqual(len(progress), 6)
+        self.assertFalse(Supplier.objects.exists())
+        self.assertEqual(Supplier.objects.create(code="F1", name="Novo").pk, 1)
+
+
+class JobQueueTest(TestCase):
+    """Testes da fila de tarefas em segundo plano"""
+    
+    def setUp(self):
+        from . import jobs
+        
+        self.calls = []
+        
+        def flaky(ctx, fail_times=0):
+            self.calls.append(ctx.job.attempts)
+            if len(self.calls) <= fail_times:
+                raise RuntimeError('falha temporária')
+            ctx.progress(1, 2, message='metade')
+            return {'ok': True}
+        
+        def cancellable(ctx):
+            from .models import Job
+            Job.objects.filter(pk=ctx.job.pk).update(cancel_requested=True)
+            ctx.progress(1, 10)
+            self.calls.append('não deveria chegar aqui')
+        
+        jobs.JOBS['test_flaky'] = flaky
+        jobs.JOBS['test_cancel'] = cancellable
+        self.addCleanup(jobs.JOBS.pop, 'test_flaky')
+        self.addCleanup(jobs.JOBS.pop, 'test_cancel')
+    
+    def test_runs_job_and_records_result(self):
+        """O worker executa a tarefa e grava resultado e progresso"""
+        from .jobs import enqueue, work
+        
+        job = enqueue('test_flaky')
+        self.assertEqual(work(drain=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUCCEEDED')
+        self.assertEqual(job.result, {'ok': True})
+        self.assertEqual(job.progress, 100)
+    
+    def test_retries_with_backoff_then_fails(self):
+        """Falhas voltam para a fila com espera até esgotar as tentativas"""
+        from .jobs import enqueue, work
+        from .models import Job
+        
+        job = enqueue('test_flaky', {'fail_times': 5}, max_attempts=2)
+        with self.assertLogs('orders.jobs', 'WARNING'):
+            work(drain=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'QUEUED')
+        self.assertGreater(job.run_after, job.created_at)
+        self.assertIn('falha temporária', job.error)
+        
+        # A espera ainda não passou: nada a executar
+        self.assertEqual(work(drain=True), 0)
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        with self.assertLogs('orders.jobs', 'WARNING'):
+            work(drain=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertEqual(self.calls, [1, 2])
+    
+    def test_cancellation(self):
+        """Cancelar remove da fila ou interrompe no próximo progresso"""
+        from .jobs import cancel, enqueue, work
+        
+        queued = enqueue('test_flaky')
+        self.assertTrue(cancel(queued.pk))
+        running = enqueue('test_cancel')
+        work(drain=True)
+        
+        queued.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(queued.status, 'CANCELLED')
+        self.assertEqual(running.status, 'CANCELLED')
+        self.assertEqual(self.calls, [])
+        self.assertFalse(cancel(running.pk))
+    
+    def test_backup_and_restore_report_progress(self):
+        """Backup e restauração informam o progresso por lote e podem ser cancelados no meio"""
+        import os
+        import tempfile
+        from contextlib import redirect_stdout
+        from io import StringIO
+        from django.test import override_settings
+        from .jobs import JobCancelled, backup_job, restore_job
+        
+        for i in range(3):
+            Supplier.objects.create(code=f"FOR{i}", name=f"Fornecedor {i}")
+        handle, file = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, file)
+        
+        class Context:
+            def __init__(self, cancel_at=None):
+                self.calls = []
+                self.cancel_at = cancel_at
+            
+            def progress(self, done, total=None, message=''):
+                self.calls.append((done, total))
+                if done == self.cancel_at:
+                    raise JobCancelled()
+        
+        ctx = Context()
+        with override_settings(BACKUP_CHUNK_SIZE=2), redirect_stdout(StringIO()):
+            backup_job(ctx, file)
+            self.assertEqual(ctx.calls, [(2, 3), (3, 3)])
+            
+            ctx = Context()
+            restore_job(ctx, file)
+            self.assertEqual(ctx.calls, [(0, 3), (2, 3), (3, 3)])
+            self.assertEqual(Supplier.objects.count(), 3)
+            
+            # Cancelada antes de apagar o banco, a restauração não muda nada
+            with self.assertRaises(JobCancelled):
+                restore_job(Context(cancel_at=0), file)
+            self.assertEqual(Supplier.objects.count(), 3)
+    
+    def test_job_endpoints(self):
+        """Enfileirar, consultar e cancelar pela API (somente administradores)"""
+        from django.contrib.auth.models import User
+        
+        self.assertEqual(self.client.get('/api/jobs/').status_code, 403)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin123"))
+        
+        created = self.client.post('/api/jobs/', {'kind': 'test_flaky'}, content_type='application/json')
+        self.assertEqual(created.status_code, 202)
+        job_id = created.json()['id']
+        self.assertEqual(self.client.get(f'/api/jobs/{job_id}/').json()['status'], 'QUEUED')
+        
+        cancelled = self.client.post(f'/api/jobs/{job_id}/cancel/')
+        self.assertEqual(cancelled.json()['status'], 'CANCELLED')
+        self.assertEqual(self.client.post(f'/api/jobs/{job_id}/cancel/').status_code, 409)
+        
+        unknown = self.client.post('/api/jobs/', {'kind': 'nope'}, content_type='application/json')
+        self.assertEqual(unknown.status_code, 400)
+        invalid = self.client.post('/api/jobs/', {'kind': 'diagnostics', 'params': {'repeat': 0}},
+                                   content_type='application/json')
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(len(self.client.get('/api/jobs/').json()), 1)
+        
+        from django.core.management import CommandError, call_command
+        with self.assertRaises(CommandError):
+            call_command('db_diagnostics', repeat=0)
+
+    
+    def test_stale_jobs_requeued_until_attempts_run_out(self):
+        """Tarefa sem sinal do worker volta à fila; sem tentativas restantes, falha"""
+        from django.utils import timezone
+        from .jobs import enqueue, requeue_stale
+        from .models import Job
+        
+        old = timezone.now() - timedelta(hours=1)
+        retry = enqueue('test_flaky', max_attempts=2)
+        exhausted = enqueue('test_flaky', max_attempts=2)
+        Job.objects.filter(pk=retry.pk).update(status=Job.RUNNING, attempts=1, heartbeat_at=old)
+        Job.objects.filter(pk=exhausted.pk).update(status=Job.RUNNING, attempts=2, heartbeat_at=old)
+        
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(Job.objects.get(pk=retry.pk).status, 'QUEUED')
+        self.assertEqual(Job.objects.get(pk=exhausted.pk).status, 'FAILED')
+
+
+@override_settings(JOBS_HEARTBEAT_INTERVAL=0.05, JOBS_STALE_AFTER=0.2)
+class JobHeartbeatTest(TransactionTestCase):
+    """O worker sinaliza a tarefa em execução mesmo sem progresso informado"""
+    
+    def test_long_job_without_progress_is_not_requeued(self):
+        """Uma tarefa longa sem ctx.progress() continua RUNNING para requeue_stale"""
+        import time
+        from . import jobs
+        from .models import Job
+        
+        seen = []
+        
+        def silent(ctx):
+            time.sleep(0.5)
+            seen.append((jobs.requeue_stale(), Job.objects.get(pk=ctx.job.pk).status))
+            return {}
+        
+        jobs.JOBS['test_silent'] = silent
+        self.addCleanup(jobs.JOBS.pop, 'test_silent')
+        job = jobs.enqueue('test_silent')
+        self.assertEqual(jobs.work(drain=True), 1)
+        self.assertEqual(seen, [(0, 'RUNNING')])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('SUCCEEDED', 1))
+
+class BulkStatusTest(TestCase):
+    """Testes da alteração de status em lote"""
+    
+    def setUp(self):
+        from django.contrib.auth.models import User
+        
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.orders = [
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=date.today(),
+                fornecedor=self.supplier,
+                quantidade_itens=10,
+                followup_date=date.today(),
+                armazenamento="01",
+            )
+            for i in range(5)
+        ]
+        self.receipt = DeliveryReceipt.objects.create(
+            cargo_number="CG001",
+            manifest_date=date.today(),
+            supplier=self.supplier,
+            invoice_number="NF001",
+            issue_date=date.today(),
+        )
+        self.client.force_login(User.objects.create_user("doca", password="doca123"))
+    
+    def post(self, payload):
+        return self.client.post('/api/bulk-status/', payload, content_type='application/json')
+    
+    def test_updates_batch_with_one_invalidation(self):
+        """Um UPDATE em lote, novas versões e uma invalidação por modelo"""
+        from unittest import mock
+        from .models import ChangeLogEntry
+        
+        versions = {o['id']: o['version'] for o in self.client.get('/api/orders/').json()['results']}
+        payload = {
+            'orders': [{'id': o.pk, 'status': 'FINALIZADO', 'version': versions[o.pk]} for o in self.orders],
+            'deliveries': [{'id': self.receipt.pk, 'status': 'FINALIZADO', 'version': self.receipt.sync_seq}],
+        }
+        with mock.patch('orders.signals.invalidate_tags') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.post(payload)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(invalidate.call_count, 2)
+        self.assertEqual(PurchaseOrder.objects.filter(status='FINALIZADO').count(), 5)
+        updated = {row['id']: row['version'] for row in response.json()['updated']['orders']}
+        for order in PurchaseOrder.objects.all():
+            self.assertEqual(order.sync_seq, updated[order.pk])
+            self.assertGreater(order.sync_seq, versions[order.pk])
+        self.assertEqual(
+            ChangeLogEntry.objects.filter(resource='orders', action='UPDATE', fields=['status']).count(), 5)
+    
+    def test_conflict_rolls_back_whole_batch(self):
+        """Uma versão desatualizada cancela o lote inteiro"""
+        stale = self.orders[1].sync_seq
+        self.orders[1].status = 'PARCIAL'
+        self.orders[1].save()
+        
+        response = self.post({'orders': [
+            {'id': self.orders[0].pk, 'status': 'FINALIZADO', 'version': self.orders[0].sync_seq},
+            {'id': self.orders[1].pk, 'status': 'FINALIZADO', 'version': stale},
+            {'id': 9999, 'status': 'FINALIZADO', 'version': 1},
+        ]})
+        
+        self.assertEqual(response.status_code, 409)
+        conflicts = response.json()['conflicts']
+        self.assertEqual([c['reason'] for c in conflicts], ['version', 'not_found'])
+        self.assertEqual(conflicts[0]['current_status'], 'PARCIAL')
+        self.assertFalse(PurchaseOrder.objects.filter(status='FINALIZADO').exists())
+    
+    def test_validation_and_authentication(self):
+        """Status inválido gera 400; sem login, 403"""
+        response = self.post({'orders': [{'id': self.orders[0].pk, 'status': 'X', 'version': 1}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.post({'pedidos': []}).status_code, 400)
+        
+        self.client.logout()
+        self.assertEqual(self.post({'orders': []}).status_code, 403)
+
+
+class DockClaimTest(TestCase):
+    """Testes da reserva de recebimentos na doca"""
+    
+    def setUp(self):
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        DeliveryReceipt.objects.bulk_create([
+            DeliveryReceipt(
+                cargo_number=f"CG{i:03d}",
+                manifest_date=date.today() - timedelta(days=i % 3),
+                supplier=self.supplier,
+                invoice_number=f"NF{i:03d}",
+                issue_date=date.today(),
+            )
+            for i in range(6)
+        ])
+    
+    def test_claims_are_exclusive_and_expire(self):
+        """Operadores recebem recebimentos distintos; reservas vencidas voltam à fila"""
+        from django.utils import timezone
+        from .dock import claim
+        
+        first = claim('ana', 4)
+        second = claim('bruno', 4)
+        self.assertEqual(len(first), 4)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({r.pk for r in first} & {r.pk for r in second})
+        self.assertEqual(first[0].manifest_date, date.today() - timedelta(days=2))
+        self.assertEqual(claim('carla', 1), [])
+        
+        DeliveryReceipt.objects.filter(pk=first[0].pk).update(claim_expires_at=timezone.now())
+        self.assertEqual([r.pk for r in claim('carla', 5)], [first[0].pk])
+    
+    def test_claim_does_not_change_version(self):
+        """Reservar não altera a versão nem gera change-log"""
+        from .dock import claim
+        from .models import ChangeLogEntry
+        
+        before = dict(DeliveryReceipt.objects.values_list('id', 'sync_seq'))
+        log_size = ChangeLogEntry.objects.count()
+        claim('ana', 6)
+        self.assertEqual(dict(DeliveryReceipt.objects.values_list('id', 'sync_seq')), before)
+        self.assertEqual(ChangeLogEntry.objects.count(), log_size)
+    
+    def test_claim_release_endpoints(self):
+        """Reservar, renovar, liberar e finalizar pela API"""
+        from django.contrib.auth.models import User
+        
+        self.assertEqual(self.client.post('/api/dock/claim/').status_code, 403)
+        self.client.force_login(User.objects.create_user("ana", password="ana123"))
+        
+        claimed = self.client.post('/api/dock/claim/', {'count': 3}, content_type='application/json').json()
+        ids = [r['id'] for r in claimed['receipts']]
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(claimed['receipts'][0]['claimed_by'], 'ana')
+        
+        renewed = self.client.post('/api/dock/renew/', {'ids': ids}, content_type='application/json')
+        self.assertEqual(renewed.json(), {'renewed': 3})
+        released = self.client.post('/api/dock/release/', {'ids': ids[:1]}, content_type='application/json')
+        self.assertEqual(released.json(), {'released': 1})
+        completed = self.client.post('/api/dock/release/', {'ids': ids[1:], 'complete': True},
+                                     content_type='application/json')
+        self.assertEqual(completed.json(), {'released': 2})
+        self.assertEqual(DeliveryReceipt.objects.filter(status='FINALIZADO').count(), 2)
+        self.assertFalse(DeliveryReceipt.objects.exclude(claimed_by='').exists())
+
+
+# Mede só a reserva: os indicadores dos fornecedores disputariam o banco em memória
+@override_settings(SCORECARDS_AUTO_UPDATE=False)
+class DockConcurrencyTest(TransactionTestCase):
+    """Vários terminais reservando ao mesmo tempo"""
+    
+    WORKERS = 8
+    RECEIPTS = 400
+    
+    def setUp(self):
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        DeliveryReceipt.objects.bulk_create([
+            DeliveryReceipt(
+                cargo_number=f"CG{i:04d}",
+                manifest_date=date.today(),
+                supplier=supplier,
+                invoice_number=f"NF{i:04d}",
+                issue_date=date.today(),
+            )
+            for i in range(self.RECEIPTS)
+        ])
+    
+    def drain(self, workers):
+        """Cada worker reserva e finaliza lotes até a fila esvaziar"""
+        import threading
+        import time
+        from django.db import connection
+        from .dock import claim, release
+        
+        claimed = []
+        errors = []
+        lock = threading.Lock()
+        
+        def worker(name):
+            try:
+                while True:
+                    batch = claim(name, 5)
+                    if not batch:
+                        return
+                    with lock:
+                        claimed.extend(r.pk for r in batch)
+                    release(name, [r.pk for r in batch], complete=True)
+            except Exception as exc:
+                # Um worker que morre deixa a fila para os outros: o teste passaria mesmo assim
+                with lock:
+                    errors.append(f'{name}: {exc!r}')
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=worker, args=(f'op{i}',)) for i in range(workers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(errors, [])
+        return claimed, elapsed
+    
+    def test_no_double_claims(self):
+        """Nenhum recebimento é reservado duas vezes e todos são processados"""
+        claimed, elapsed = self.drain(self.WORKERS)
+        self.assertEqual(len(claimed), self.RECEIPTS)
+        self.assertEqual(len(set(claimed)), self.RECEIPTS)
+        self.assertFalse(DeliveryReceipt.objects.filter(status='PENDENTE').exists())
+    
+    def test_throughput_does_not_collapse(self):
+        """Mais terminais não derrubam a vazão (no SQLite as gravações são serializadas)"""
+        _claimed, single = self.drain(1)
+        DeliveryReceipt.objects.update(status='PENDENTE')
+        claimed, concurrent = self.drain(self.WORKERS)
+        self.assertEqual(len(set(claimed)), self.RECEIPTS)
+        self.assertLess(concurrent, single * 3)
+
+
+class ReconciliationTest(TestCase):
+    """Testes da conciliação automática pedido <-> recebimento"""
+    
+    def setUp(self):
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.today = date.today()
+    
+    def order(self, numero, emissao_days_ago, followup_days, **kwargs):
+        return PurchaseOrder.objects.create(
+            numero_pc=numero,
+            data_emissao=self.today - timedelta(days=emissao_days_ago),
+            fornecedor=kwargs.pop('fornecedor', self.supplier),
+            quantidade_itens=10,
+            followup_date=self.today + timedelta(days=followup_days),
+            armazenamento="01",
+            **kwargs,
+        )
+    
+    def receipt(self, cargo, invoice, status='PENDENTE', supplier=None, **kwargs):
+        return DeliveryReceipt.objects.create(
+            cargo_number=cargo,
+            manifest_date=self.today,
+            supplier=supplier or self.supplier,
+            invoice_number=invoice,
+            issue_date=self.today,
+            status=status,
+            **kwargs,
+        )
+    
+    def test_prefers_free_order_with_nearest_followup(self):
+        """Pedido sem recebimento e com follow-up mais próximo do manifesto; fora da janela é ignorado"""
+        from .reconciliation import reconcile
+        
+        far = self.order("PC001", 10, 20)
+        near = self.order("PC002", 10, 2)
+        self.order("PC003", 200, 0)  # emitido antes da janela
+        self.order("PC004", -1, 0)  # emitido depois da nota
+        first = self.receipt("CG001", "NF001")
+        second = self.receipt("CG002", "NF002", status='FINALIZADO')
+        
+        summary = reconcile(self.today)
+        
+        self.assertEqual(summary['matched'], 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.purchase_order, near)
+        self.assertEqual(second.purchase_order, far)
+        self.assertEqual(PurchaseOrder.objects.get(pk=near.pk).status, 'PARCIAL')
+        self.assertEqual(PurchaseOrder.objects.get(pk=far.pk).status, 'FINALIZADO')
+    
+    def test_unmatched_and_other_suppliers(self):
+        """Sem pedido do fornecedor na janela o recebimento fica sem vínculo"""
+        from .reconciliation import reconcile
+        
+        other = Supplier.objects.create(code="FOR002", name="Outro Fornecedor")
+        self.order("PC001", 10, 0, fornecedor=other)
+        self.order("PC002", 10, 0, status='CANCELADO')
+        receipt = self.receipt("CG001", "NF001")
+        
+        summary = reconcile(self.today)
+        
+        self.assertEqual((summary['matched'], summary['unmatched']), (0, 1))
+        receipt.refresh_from_db()
+        self.assertIsNone(receipt.purchase_order)
+    
+    def test_dry_run_and_tracking(self):
+        """A simulação não grava; a execução gera versões, change-log e uma invalidação por modelo"""
+        from unittest import mock
+        from .models import ChangeLogEntry
+        from .reconciliation import reconcile
+        
+        order = self.order("PC001", 10, 0)
+        receipts = [self.receipt(f"CG00{i}", f"NF00{i}") for i in range(3)]
+        versions = {r.pk: r.sync_seq for r in receipts}
+        
+        summary = reconcile(self.today, dry_run=True)
+        self.assertEqual(summary['matched'], 3)
+        self.assertFalse(DeliveryReceipt.objects.filter(purchase_order__isnull=False).exists())
+        
+        with mock.patch('orders.signals.invalidate_tags') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                reconcile(self.today)
+        
+        self.assertEqual(invalidate.call_count, 2)
+        updated = DeliveryReceipt.objects.filter(purchase_order=order)
+        self.assertEqual(updated.count(), 3)
+        seqs = [r.sync_seq for r in updated]
+        self.assertEqual(len(set(seqs)), 3)
+        self.assertTrue(all(r.sync_seq > versions[r.pk] for r in updated))
+        self.assertEqual(ChangeLogEntry.objects.filter(
+            resource='deliveries', action='UPDATE', fields=['purchase_order']).count(), 3)
+        self.assertEqual(ChangeLogEntry.objects.filter(
+            resource='orders', action='UPDATE', fields=['status']).count(), 1)
+    
+    def test_command(self):
+        """O comando informa o resumo e valida a data"""
+        from io import StringIO
+        from contextlib import redirect_stdout
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        
+        self.order("PC001", 10, 0)
+        self.receipt("CG001", "NF001")
+        output = StringIO()
+        with redirect_stdout(output):
+            call_command('reconcile_receipts', date=self.today.isoformat())
+        self.assertIn('1 de 1 recebimentos vinculados', output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('reconcile_receipts', date='ontem')
+
+
+class BarcodeLookupTest(TestCase):
+    """Testes da consulta por código de barras"""
+    
+    def setUp(self):
+        from .lookup import clear_cache
+        clear_cache()
+        
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.order = PurchaseOrder.objects.create(
+            numero_pc="PC2024001",
+            data_emissao=date.today(),
+            fornecedor=self.supplier,
+            quantidade_itens=10,
+            followup_date=date.today(),
+            armazenamento="01",
+        )
+        self.receipt = DeliveryReceipt.objects.create(
+            cargo_number="CG001",
+            manifest_date=date.today(),
+            supplier=self.supplier,
+            invoice_number="NF001",
+            issue_date=date.today(),
+            purchase_order=self.order,
+        )
+    
+    def get(self, code):
+        return self.client.get('/api/lookup/', {'code': code})
+    
+    def test_exact_match_on_each_identifier(self):
+        """Número PC, carga e nota resolvem por igualdade; parte do código não"""
+        response = self.get(" PC2024001\n")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([o['id'] for o in response.json()['orders']], [self.order.pk])
+        self.assertEqual(response.json()['deliveries'], [])
+        
+        for code in ("CG001", "NF001"):
+            data = self.get(code).json()
+            self.assertEqual([d['id'] for d in data['deliveries']], [self.receipt.pk])
+        
+        self.assertEqual(self.get("PC2024").status_code, 404)
+        self.assertEqual(self.get("X" * 30).status_code, 404)
+        self.assertEqual(self.get("").status_code, 400)
+    
+    def test_uses_indexes(self):
+        """As consultas usam os índices das colunas, sem varrer a tabela"""
+        from django.db import connection
+        
+        for column in ('numero_pc', 'cargo_number', 'invoice_number'):
+            model = PurchaseOrder if column == 'numero_pc' else DeliveryReceipt
+            queryset = model.objects.filter(**{column: 'X'})
+            plan = queryset.explain()
+            if connection.vendor == 'sqlite':
+                self.assertIn('INDEX', plan)
+    
+    def test_cache_hits_until_invalidated(self):
+        """Acertos repetidos vêm do cache; uma alteração invalida a entrada"""
+        first = self.get("CG001")
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.get("CG001")
+        self.assertEqual(second['X-Cache'], 'HIT')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.receipt.status = 'FINALIZADO'
+            self.receipt.save()
+        third = self.get("CG001")
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.json()['deliveries'][0]['status'], 'FINALIZADO')
+    
+    def test_lru_eviction(self):
+        """O cache descarta o item usado há mais tempo"""
+        from .lookup import LRUCache
+        
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(len(cache), 2)
+
+
+class DuplicateInvoiceTest(TestCase):
+    """Testes da detecção de notas recebidas em duplicidade"""
+    
+    def setUp(self):
+        from django.contrib.auth.models import User
+        
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.other = Supplier.objects.create(code="FOR002", name="Outro Fornecedor")
+        self.receipt = DeliveryReceipt.objects.create(
+            cargo_number="CG001",
+            manifest_date=date.today(),
+            supplier=self.supplier,
+            invoice_number="NF001",
+            issue_date=date.today(),
+        )
+        self.user = User.objects.create_user("doca", password="doca123")
+    
+    def row(self, invoice, supplier=None):
+        return {
+            'cargo_number': 'CG100',
+            'manifest_date': date.today().isoformat(),
+            'supplier': (supplier or self.supplier).pk,
+            'invoice_number': invoice,
+            'issue_date': date.today().isoformat(),
+        }
+    
+    def test_constraint(self):
+        """O banco recusa a mesma nota do mesmo fornecedor"""
+        from django.db import IntegrityError, transaction
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DeliveryReceipt.objects.create(
+                cargo_number="CG002", manifest_date=date.today(), supplier=self.supplier,
+                invoice_number="NF001", issue_date=date.today())
+        # Outro fornecedor pode usar o mesmo número
+        DeliveryReceipt.objects.create(
+            cargo_number="CG002", manifest_date=date.today(), supplier=self.other,
+            invoice_number="NF001", issue_date=date.today())
+    
+    def test_bulk_check_in_one_query(self):
+        """Um lote é conferido com uma consulta: notas existentes e repetidas"""
+        from .duplicates import check_invoices
+        
+        pairs = [(self.supplier.pk, "NF001"), (self.other.pk, "NF001"),
+                 (self.supplier.pk, "NF002"), (self.supplier.pk, "NF002")]
+        with self.assertNumQueries(1):
+            duplicates = check_invoices(pairs)
+        self.assertEqual(
+            [(d['index'], d['reason']) for d in duplicates], [(0, 'exists'), (3, 'repeated')])
+        self.assertEqual(duplicates[0]['existing_id'], self.receipt.pk)
+        self.assertEqual(duplicates[1]['first_index'], 2)
+    
+    def test_api_rejects_duplicates_before_writing(self):
+        """POST em lote grava tudo ou, com uma nota duplicada, nada"""
+        self.client.force_login(self.user)
+        post = lambda data: self.client.post('/api/deliveries/', data, content_type='application/json')
+        
+        response = post([self.row("NF002"), self.row("NF001")])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['duplicates'][0]['index'], 1)
+        self.assertEqual(DeliveryReceipt.objects.count(), 1)
+        
+        response = post([self.row("NF002"), self.row("NF001", self.other)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([r['supplier']['code'] for r in response.json()], ["FOR001", "FOR002"])
+        self.assertEqual(DeliveryReceipt.objects.count(), 3)
+        
+        response = post(self.row("NF003"))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['invoice_number'], "NF003")
+        self.assertEqual(post(self.row("NF004", Supplier(pk=9999))).status_code, 400)
+    
+    def test_api_requires_authentication(self):
+        """Sem login só a leitura é permitida"""
+        response = self.client.post('/api/deliveries/', self.row("NF002"), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get('/api/deliveries/').status_code, 200)
+    
+    def test_restore_refuses_duplicates(self):
+        """A restauração recusa um backup com notas repetidas antes de apagar o banco"""
+        from .maintenance import find_backup_duplicates
+        
+        fields = {'supplier': self.supplier.pk, 'invoice_number': 'NF010'}
+        data = [
+            {'model': 'orders.supplier', 'pk': self.supplier.pk, 'fields': {}},
+            {'model': 'orders.deliveryreceipt', 'pk': 1, 'fields': fields},
+            {'model': 'orders.deliveryreceipt', 'pk': 2, 'fields': dict(fields)},
+        ]
+        self.assertEqual(find_backup_duplicates(data), [
+            {'pk': 2, 'supplier': self.supplier.pk, 'invoice_number': 'NF010'}])
+
+
+class FollowupCalendarTest(TestCase):
+    """Testes do calendário de follow-up"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        
+        self.today = date.today()
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.other = Supplier.objects.create(code="FOR002", name="Outro Fornecedor")
+        specs = [
+            (0, self.supplier, "01", 10, 'PENDENTE'),
+            (0, self.other, "02", 5, 'PARCIAL'),
+            (2, self.supplier, "01", 7, 'PENDENTE'),
+            (2, self.supplier, "01", 100, 'FINALIZADO'),  # fechado: fora
+            (-1, self.supplier, "01", 100, 'PENDENTE'),  # antes do início
+            (40, self.supplier, "01", 100, 'PENDENTE'),  # depois do horizonte
+        ]
+        for i, (offset, supplier, storage, items, status) in enumerate(specs):
+            PurchaseOrder.objects.create(
+                numero_pc=f"PC2024{i:03d}",
+                data_emissao=self.today - timedelta(days=10),
+                fornecedor=supplier,
+                quantidade_itens=items,
+                followup_date=self.today + timedelta(days=offset),
+                armazenamento=storage,
+                status=status,
+            )
+    
+    def test_daily_totals_in_one_query(self):
+        """Um dia por entrada, com zeros, a partir de uma única consulta"""
+        from .followup import followup_calendar
+        
+        with self.assertNumQueries(1):
+            calendar = followup_calendar(self.today, 30)
+        self.assertEqual(len(calendar), 30)
+        self.assertEqual(calendar[0], {'date': self.today.isoformat(), 'orders': 2, 'items': 15})
+        self.assertEqual(calendar[1]['orders'], 0)
+        self.assertEqual(calendar[2]['items'], 7)
+    
+    def test_grouping_and_filters(self):
+        """Agrupamento por armazém/fornecedor e filtros da listagem"""
+        data = self.client.get('/api/calendar/', {'days': 7, 'group_by': 'fornecedor'}).json()
+        self.assertEqual(data['calendar'][0]['groups'], {
+            'FOR001': {'orders': 1, 'items': 10}, 'FOR002': {'orders': 1, 'items': 5}})
+        
+        data = self.client.get('/api/calendar/', {'days': 7, 'armazenamento': '02'}).json()
+        self.assertEqual([day['orders'] for day in data['calendar'][:3]], [1, 0, 0])
+        
+        self.assertEqual(self.client.get('/api/calendar/', {'group_by': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/calendar/', {'days': 0}).status_code, 400)
+    
+    def test_cached_until_orders_change(self):
+        """A resposta fica em cache e é recalculada após uma alteração"""
+        self.assertEqual(self.client.get('/api/calendar/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/calendar/')['X-Cache'], 'HIT')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            order = PurchaseOrder.objects.get(numero_pc="PC2024000")
+            order.status = 'FINALIZADO'
+            order.save()
+        response = self.client.get('/api/calendar/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['calendar'][0]['orders'], 1)
+    
+    def test_query_uses_index(self):
+        """A consulta usa o índice (status, followup_date)"""
+        from django.db import connection
+        
+        queryset = PurchaseOrder.objects.filter(
+            status__in=['PENDENTE', 'PARCIAL'], followup_date__gte=self.today)
+        if connection.vendor == 'sqlite':
+            self.assertIn('status_', queryset.explain())
+
+
+@skipUnless(forecast_available(), 'numpy não instalado')
+class ForecastTest(TestCase):
+    """Testes da previsão de volume de recebimento"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.other = Supplier.objects.create(code="FOR002", name="Outro Fornecedor")
+    
+    def test_weekday_pattern_vectorized(self):
+        """Séries com padrão semanal são previstas com o índice do dia da semana"""
+        import numpy as np
+        from .forecast import fit, predict
+        
+        start = date(2024, 1, 1)  # segunda-feira
+        weeks = 20
+        pattern = np.array([10, 8, 6, 6, 4, 2, 0], dtype=float)
+        values = np.vstack([np.tile(pattern, weeks), np.tile(pattern * 3, weeks), np.zeros(7 * weeks)])
+        
+        level, index = fit(values, start, window=28, season_weeks=8)
+        predicted = predict(level, index, start + timedelta(days=7 * weeks), 7)
+        
+        np.testing.assert_allclose(predicted[0], pattern)
+        np.testing.assert_allclose(predicted[1], pattern * 3)
+        np.testing.assert_allclose(predicted[2], 0)
+    
+    def test_history_from_active_and_archived(self):
+        """O histórico soma recebimentos ativos e arquivados por dia, armazém e fornecedor"""
+        from django.utils import timezone
+        from .forecast import load_history
+        from .models import ArchivedDeliveryReceipt, ArchivedPurchaseOrder
+        
+        today = date.today()
+        order = PurchaseOrder.objects.create(
+            numero_pc="PC001", data_emissao=today - timedelta(days=10), fornecedor=self.supplier,
+            quantidade_itens=10, followup_date=today - timedelta(days=2), armazenamento="01")
+        for i in range(2):
+            DeliveryReceipt.objects.create(
+                cargo_number=f"CG{i}", manifest_date=today - timedelta(days=2), supplier=self.supplier,
+                invoice_number=f"NF{i}", issue_date=today, purchase_order=order)
+        archived = ArchivedPurchaseOrder.objects.create(
+            id=999, numero_pc="PC999", data_emissao=today - timedelta(days=20), fornecedor=self.other,
+            quantidade_itens=5, followup_date=today - timedelta(days=5), armazenamento="02",
+            status='FINALIZADO', updated_at=timezone.now())
+        ArchivedDeliveryReceipt.objects.create(
+            id=999, cargo_number="CG9", manifest_date=today - timedelta(days=5), supplier=self.other,
+            invoice_number="NF9", issue_date=today, status='FINALIZADO', purchase_order=archived,
+            updated_at=timezone.now())
+        
+        history = load_history('receipts', today - timedelta(days=7), today)
+        self.assertEqual(history.values.shape, (2, 7))
+        row = history.keys.index(("01", self.supplier.pk))
+        self.assertEqual(history.values[row, 5], 2)
+        self.assertEqual(history.values[history.keys.index(("02", self.other.pk)), 2], 1)
+    
+    def test_endpoint_grouping_and_cache(self):
+        """Previsão por armazém ou fornecedor, em cache até chegar um dado novo"""
+        from .generators import TestDataGenerator
+        
+        generator = TestDataGenerator()
+        generator.suppliers = [self.supplier, self.other]
+        generator.create_history(years=1, orders_per_day=5)
+        
+        response = self.client.get('/api/forecast/', {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        data = response.json()
+        self.assertEqual(len(data['dates']), 7)
+        self.assertTrue(all(len(s['forecast']) == 7 for s in data['series']))
+        self.assertTrue(set(s['key'] for s in data['series']) <= set(generator.storage_options))
+        self.assertEqual(self.client.get('/api/forecast/', {'days': 7})['X-Cache'], 'HIT')
+        
+        data = self.client.get('/api/forecast/', {'days': 7, 'group_by': 'fornecedor'}).json()
+        self.assertEqual({s['key'] for s in data['series']}, {"FOR001", "FOR002"})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            DeliveryReceipt.objects.create(
+                cargo_number="CGX", manifest_date=date.today(), supplier=self.supplier,
+                invoice_number="NFX", issue_date=date.today())
+        self.assertEqual(self.client.get('/api/forecast/', {'days': 7})['X-Cache'], 'MISS')
+        
+        self.assertEqual(self.client.get('/api/forecast/', {'measure': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/forecast/', {'days': 1000}).status_code, 400)
+
+
+class SupplierScorecardTest(TestCase):
+    """Testes dos indicadores de desempenho dos fornecedores"""
+    
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+            self.other = Supplier.objects.create(code="FOR002", name="Outro Fornecedor")
+        self.followup = date(2024, 3, 1)
+    
+    def create_order(self, numero, supplier=None, status='FINALIZADO'):
+        return PurchaseOrder.objects.create(
+            numero_pc=numero, data_emissao=self.followup - timedelta(days=10), fornecedor=supplier or self.supplier,
+            quantidade_itens=10, followup_date=self.followup, armazenamento="01", status=status)
+    
+    def create_receipt(self, order, delay, entry=None, exit_=None):
+        from datetime import time
+        count = DeliveryReceipt.objects.count()
+        return DeliveryReceipt.objects.create(
+            cargo_number=f"CG{count}", manifest_date=self.followup + timedelta(days=delay),
+            supplier=order.fornecedor, invoice_number=f"NF{count}", issue_date=self.followup,
+            purchase_order=order, entry_time=entry and time(*entry), exit_time=exit_ and time(*exit_))
+    
+    def test_compute_metrics(self):
+        """Prazo, atraso médio e p95, entregas parciais e permanência na doca"""
+        from .scorecards import compute
+        
+        on_time = self.create_order("PC001")
+        self.create_receipt(on_time, -1, entry=(8, 0), exit_=(8, 30))
+        partial = self.create_order("PC002")
+        self.create_receipt(partial, 4, entry=(9, 0), exit_=(10, 30))
+        self.create_receipt(partial, 6)
+        late = self.create_order("PC003")
+        self.create_receipt(late, 10)
+        self.create_order("PC004", status='PENDENTE')
+        cancelled = self.create_order("PC005", status='CANCELADO')
+        self.create_receipt(cancelled, 30)
+        
+        card = compute([self.supplier.pk, self.other.pk])
+        self.assertEqual(card[self.supplier.pk]['orders_total'], 4)
+        self.assertEqual(card[self.supplier.pk]['orders_delivered'], 3)
+        self.assertAlmostEqual(card[self.supplier.pk]['on_time_rate'], 1 / 3)
+        self.assertAlmostEqual(card[self.supplier.pk]['avg_delay_days'], 14 / 3)
+        self.assertGreater(card[self.supplier.pk]['p95_delay_days'], 4)
+        self.assertAlmostEqual(card[self.supplier.pk]['partial_ratio'], 1 / 3)
+        self.assertEqual(card[self.supplier.pk]['avg_dwell_minutes'], 60)
+        self.assertIsNone(card[self.other.pk]['on_time_rate'])
+    
+    def test_incremental_update(self):
+        """Gravações, update em lote e exclusões atualizam só os indicadores afetados"""
+        from .jobs import work
+        from .models import SupplierScorecard
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.create_order("PC001")
+            self.create_receipt(order, 0)
+        work(drain=True)
+        card = SupplierScorecard.objects.get(supplier=self.supplier)
+        self.assertEqual(card.on_time_rate, 1)
+        
+        # update() não dispara post_save, mas passa pelo change-log
+        from .signals import bulk_updated
+        with self.captureOnCommitCallbacks(execute=True):
+            receipts = DeliveryReceipt.objects.filter(purchase_order=order)
+            receipts.update(manifest_date=self.followup + timedelta(days=5))
+            bulk_updated.send(sender=DeliveryReceipt, ids=list(receipts.values_list('id', flat=True)),
+                              fields=['manifest_date'])
+        work(drain=True)
+        card.refresh_from_db()
+        self.assertEqual(card.on_time_rate, 0)
+        self.assertEqual(card.avg_delay_days, 5)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            DeliveryReceipt.objects.filter(purchase_order=order).delete()
+        work(drain=True)
+        card.refresh_from_db()
+        self.assertEqual(card.orders_delivered, 0)
+        self.assertIsNone(card.on_time_rate)
+    
+    def test_rebuild_in_chunks(self):
+        """A reconstrução recalcula todos os fornecedores em lotes e posiciona o consumidor"""
+        from .models import ChangeLogConsumer, ChangeLogEntry, SupplierScorecard
+        from .scorecards import CONSUMER, process_pending, rebuild
+        
+        self.create_receipt(self.create_order("PC001"), 2)
+        self.create_receipt(self.create_order("PC002", supplier=self.other), 0)
+        
+        calls = []
+        self.assertEqual(rebuild(chunk_size=1, progress=lambda done, total: calls.append((done, total))), 2)
+        self.assertEqual(calls, [(1, 2), (2, 2)])
+        self.assertEqual(SupplierScorecard.objects.get(supplier=self.supplier).avg_delay_days, 2)
+        self.assertEqual(SupplierScorecard.objects.get(supplier=self.other).on_time_rate, 1)
+        self.assertEqual(ChangeLogConsumer.objects.get(name=CONSUMER).position,
+                         ChangeLogEntry.objects.order_by('-id').values_list('id', flat=True).first())
+        self.assertEqual(process_pending(), 0)
+    
+    def test_ranking_endpoint(self):
+        """O ranking lê os indicadores gravados, sem agregar na requisição"""
+        from .scorecards import rebuild
+        
+        self.create_receipt(self.create_order("PC001"), 3)
+        self.create_receipt(self.create_order("PC002", supplier=self.other), 0)
+        Supplier.objects.create(code="FOR003", name="Sem Entregas")
+        rebuild()
+        
+        with self.assertNumQueries(2):  # contagem da página + página
+            response = self.client.get('/api/suppliers/scorecards/')
+        self.assertEqual(response.status_code, 200)
+        codes = [row['supplier']['code'] for row in response.json()['results']]
+        self.assertEqual(codes, ["FOR002", "FOR001"])
+        
+        response = self.client.get('/api/suppliers/scorecards/', {'ordering': '-avg_delay_days'})
+        self.assertEqual(response.json()['results'][0]['supplier']['code'], "FOR001")
+        response = self.client.get('/api/suppliers/scorecards/', {'min_orders': 0})
+        self.assertEqual(response.json()['count'], 3)
+
+
+class SupplierScorecardQueueTest(TransactionTestCase):
+    """A atualização dos indicadores sai da requisição para a fila de tarefas"""
+    
+    def test_one_job_per_transaction(self):
+        """Muitas gravações numa transação agendam uma só tarefa"""
+        from unittest import mock
+        from django.db import transaction
+        from . import scorecards
+        from .jobs import work
+        from .models import Job, SupplierScorecard
+        
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        Job.objects.all().delete()
+        followup = date(2024, 3, 1)
+        with mock.patch.object(scorecards, 'enqueue_update', wraps=scorecards.enqueue_update) as enqueue_update:
+            with transaction.atomic():
+                for i in range(20):
+                    order = PurchaseOrder.objects.create(
+                        numero_pc=f"PC{i:03d}", data_emissao=followup - timedelta(days=10), fornecedor=supplier,
+                        quantidade_itens=10, followup_date=followup, armazenamento="01", status='FINALIZADO')
+                    DeliveryReceipt.objects.create(
+                        cargo_number=f"CG{i}", manifest_date=followup, supplier=supplier, invoice_number=f"NF{i}",
+                        issue_date=followup, purchase_order=order)
+        self.assertEqual(enqueue_update.call_count, 1)
+        self.assertEqual(Job.objects.filter(kind=scorecards.JOB_KIND, status=Job.QUEUED).count(), 1)
+        self.assertFalse(SupplierScorecard.objects.exists())
+        
+        # Com a tarefa ainda na fila, outra transação não enfileira de novo
+        supplier.save()
+        self.assertEqual(Job.objects.filter(kind=scorecards.JOB_KIND).count(), 1)
+        
+        self.assertEqual(work(drain=True), 1)
+        card = SupplierScorecard.objects.get(supplier=supplier)
+        self.assertEqual((card.orders_delivered, card.on_time_rate), (20, 1))
+    
+    def test_rolled_back_transaction_does_not_block_next(self):
+        """Uma transação desfeita não impede a próxima de enfileirar a tarefa"""
+        from django.db import transaction
+        from . import scorecards
+        from .models import Job
+        
+        supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        order = PurchaseOrder.objects.create(
+            numero_pc="PC001", data_emissao=date(2024, 2, 20), fornecedor=supplier, quantidade_itens=10,
+            followup_date=date(2024, 3, 1), armazenamento="01", status='FINALIZADO')
+        Job.objects.all().delete()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                PurchaseOrder.objects.filter(pk=order.pk).delete()
+                raise RuntimeError
+        self.assertFalse(Job.objects.exists())
+        
+        with transaction.atomic():
+            supplier.name = "Fornecedor Renomeado"
+            supplier.save()
+        self.assertEqual(Job.objects.filter(kind=scorecards.JOB_KIND, status=Job.QUEUED).count(), 1)
+
+
+@skipUnless(columnar_available(), 'pyarrow não instalado')
+class ColumnarExportTest(TestCase):
+    """Testes da exportação colunar para BI"""
+    
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(__import__('shutil').rmtree, self.directory, True)
+        self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+        self.today = date(2024, 3, 10)
+    
+    def create_order(self, numero, days_ago, armazenamento="01"):
+        return PurchaseOrder.objects.create(
+            numero_pc=numero, data_emissao=self.today - timedelta(days=days_ago), fornecedor=self.supplier,
+            quantidade_itens=10, followup_date=self.today, armazenamento=armazenamento)
+    
+    def test_partitions_dictionary_and_archived(self):
+        """Uma partição por dia, colunas de dicionário e arquivados intercalados"""
+        from django.utils import timezone
+        from .columnar import dataset, export_all
+        from .models import ArchivedPurchaseOrder
+        
+        for i in range(5):
+            self.create_order(f"PC{i}", i % 2, armazenamento=f"0{i % 3}")
+        ArchivedPurchaseOrder.objects.create(
+            id=999, numero_pc="PC999", data_emissao=self.today - timedelta(days=1), fornecedor=self.supplier,
+            quantidade_itens=5, followup_date=self.today, armazenamento="01", status='FINALIZADO',
+            updated_at=timezone.now())
+        
+        summaries = export_all(directory=self.directory, chunk_size=2)
+        self.assertEqual([s['rows'] for s in summaries], [1, 6, 0])
+        
+        table = dataset('orders', self.directory).to_table()
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(table.column('data_emissao').to_pylist().count(self.today), 3)
+        self.assertTrue(str(table.schema.field('status').type).startswith('dictionary'))
+        self.assertTrue(str(table.schema.field('armazenamento').type).startswith('dictionary'))
+        rows = {row['numero_pc']: row for row in table.to_pylist()}
+        self.assertTrue(rows["PC999"]['archived'])
+        self.assertFalse(rows["PC0"]['archived'])
+        self.assertEqual(sorted(__import__('os').listdir(f"{self.directory}/orders")),
+                         [f"data_emissao={self.today - timedelta(days=1)}", f"data_emissao={self.today}"])
+    
+    def test_incremental_writes_only_new_days(self):
+        """O incremental só regrava a última partição e os dias novos"""
+        import os
+        from .columnar import export_table
+        
+        self.create_order("PC1", 3)
+        self.create_order("PC2", 2)
+        self.assertEqual(export_table('orders', self.directory)['files'], 2)
+        old = f"{self.directory}/orders/data_emissao={self.today - timedelta(days=3)}/part.parquet"
+        modified = os.path.getmtime(old)
+        
+        self.create_order("PC3", 2)
+        self.create_order("PC4", 0)
+        summary = export_table('orders', self.directory)
+        self.assertEqual(summary['since'], (self.today - timedelta(days=2)).isoformat())
+        self.assertEqual((summary['files'], summary['rows']), (2, 3))
+        self.assertEqual(os.path.getmtime(old), modified)
+        
+        PurchaseOrder.objects.filter(numero_pc="PC1").delete()
+        summary = export_table('orders', self.directory, full=True, file_format='parquet')
+        self.assertEqual(summary['rows'], 3)
+        self.assertFalse(os.path.exists(old))
+    
+    def test_arrow_format(self):
+        """Formato Arrow (stream IPC) com dicionários diferentes por bloco"""
+        import pyarrow as pa
+        from .columnar import export_table
+        
+        for i in range(4):
+            self.create_order(f"PC{i}", 0, armazenamento=f"0{i}")
+        export_table('orders', self.directory, file_format='arrow', chunk_size=1)
+        path = f"{self.directory}/orders/data_emissao={self.today}/part.arrows"
+        table = pa.ipc.open_stream(path).read_all()
+        self.assertEqual(sorted(table.column('armazenamento').to_pylist()), ["00", "01", "02", "03"])
+
+
+class ThrottlingTest(TestCase):
+    """Testes do limite por cliente e do descarte de carga"""
+    
+    BUDGETS = {'default': (1, 3), 'stats': (1, 1), 'health': (1, 10)}
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from .throttling import _memory_buckets, latency
+        cache.clear()
+        _memory_buckets.clear()
+        latency.reset()
+        self.addCleanup(_memory_buckets.clear)
+        self.addCleanup(latency.reset)
+        Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+    
+    def test_token_bucket_per_client_and_route(self):
+        """Cada cliente tem um balde por rota; sem fichas, 429 com Retry-After"""
+        with self.settings(THROTTLE_BUDGETS=self.BUDGETS):
+            statuses = [self.client.get('/api/suppliers/').status_code for _ in range(4)]
+            self.assertEqual(statuses, [200, 200, 200, 429])
+            response = self.client.get('/api/suppliers/', HTTP_ORIGIN='http://localhost:5173')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '1')
+            # O frontend, em outra origem, só lê o cabeçalho se ele for exposto
+            self.assertIn('Retry-After', response['Access-Control-Expose-Headers'])
+            
+            # Outra rota e outro cliente têm baldes próprios
+            self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+            self.assertEqual(self.client.get('/api/suppliers/', REMOTE_ADDR='10.0.0.2').status_code, 200)
+            
+            # Orçamento próprio das estatísticas
+            self.assertEqual(self.client.get('/api/stats/').status_code, 200)
+            self.assertEqual(self.client.get('/api/stats/').status_code, 429)
+    
+    def test_memory_buckets_drop_full_buckets(self):
+        """Baldes que voltaram a ficar cheios saem da memória, sem mudar o limite"""
+        from .throttling import MemoryBuckets
+        
+        buckets = MemoryBuckets(sweep_interval=10)
+        for i in range(100):
+            self.assertEqual(buckets.take(f'ip:{i}', 1, 3, 0), 0)
+        self.assertEqual(buckets.take('ip:0', 1, 3, 0), 0)
+        self.assertEqual(buckets.take('ip:0', 1, 3, 0), 0)
+        self.assertEqual(buckets.take('ip:0', 1, 3, 0), 1)
+        self.assertEqual(len(buckets._buckets), 100)
+        
+        # Aos 10 s todos os baldes de uma ficha gasta já se recompuseram
+        self.assertEqual(buckets.take('ip:new', 1, 3, 10), 0)
+        self.assertEqual(list(buckets._buckets), ['ip:new'])
+        self.assertEqual([buckets.take('ip:0', 1, 3, 10) for _ in range(4)], [0, 0, 0, 1])
+    
+    def test_shared_cache_buckets(self):
+        """Com THROTTLE_CACHE_ALIAS o estado fica no cache"""
+        with self.settings(THROTTLE_BUDGETS=self.BUDGETS, THROTTLE_CACHE_ALIAS='default'):
+            statuses = [self.client.get('/api/suppliers/').status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+    
+    def test_load_shedding(self):
+        """Com o banco lento, a API responde 429, o health check segue e as estatísticas saem do cache"""
+        from .throttling import latency
+        
+        fresh = self.client.get('/api/stats/').json()
+        latency.add(5000)
+        
+        response = self.client.get('/api/orders/', {'page_size': 100})
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 10)
+        
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(response.json(), fresh)
+        
+        response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'degraded')
+        
+        # Sem amostras recentes, a média deixa de valer
+        with self.settings(LOAD_SHED_WINDOW=0):
+            self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+
+
+@override_settings(SITES={
+    'planta1': {'database': 'site_a', 'warehouses': ['01'], 'hosts': ['planta1.local']},
+    'planta2': {'database': 'site_b', 'warehouses': ['02'], 'hosts': []},
+})
+class SiteRoutingTest(TestCase):
+    """Testes do roteamento por site, com dois bancos SQLite no lugar das plantas"""
+    
+    databases = {'default', 'site_a', 'site_b'}
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from .throttling import _memory_buckets
+        cache.clear()
+        _memory_buckets.clear()
+        with self.captureOnCommitCallbacks(using='default', execute=True):
+            self.supplier = Supplier.objects.create(code="FOR001", name="Fornecedor Teste LTDA")
+    
+    def create_order(self, numero, armazenamento="01", followup=None):
+        return PurchaseOrder.objects.create(
+            numero_pc=numero, data_emissao=date.today(), fornecedor_id=self.supplier.pk, quantidade_itens=10,
+            followup_date=followup or date.today(), armazenamento=armazenamento)
+    
+    def test_shared_supplier_catalog(self):
+        """Fornecedores são gravados no catálogo e replicados para todos os sites"""
+        for alias in ('default', 'site_a', 'site_b'):
+            self.assertEqual(Supplier.objects.using(alias).get(pk=self.supplier.pk).code, "FOR001")
+        
+        with self.captureOnCommitCallbacks(using='default', execute=True):
+            self.supplier.name = "Novo Nome"
+            self.supplier.save()
+        self.assertEqual(Supplier.objects.using('site_b').get(pk=self.supplier.pk).name, "Novo Nome")
+        
+        from .routing import use_site
+        with use_site('planta1'):
+            self.create_order("PC001")
+        with self.captureOnCommitCallbacks(using='default', execute=True):
+            Supplier.objects.using('default').get(pk=self.supplier.pk).delete()
+        self.assertFalse(Supplier.objects.using('site_a').exists())
+        self.assertFalse(PurchaseOrder.objects.using('site_a').exists())
+    
+    def test_site_from_header_host_and_warehouse(self):
+        """O site vem do cabeçalho, do host ou, fora de uma requisição, do armazém"""
+        from .models import ChangeLogEntry
+        from .routing import use_site
+        
+        with use_site('planta1'):
+            order = self.create_order("PC001")
+        # save() sem site: o roteador recebe a instância e usa o armazém
+        PurchaseOrder(numero_pc="PC002", data_emissao=date.today(), fornecedor_id=self.supplier.pk,
+                      quantidade_itens=10, followup_date=date.today(), armazenamento="02").save()
+        self.assertEqual(list(PurchaseOrder.objects.using('site_a').values_list('numero_pc', flat=True)), ["PC001"])
+        self.assertEqual(list(PurchaseOrder.objects.using('site_b').values_list('numero_pc', flat=True)), ["PC002"])
+        self.assertFalse(PurchaseOrder.objects.using('default').exists())
+        # O change-log fica no banco do registro
+        self.assertTrue(ChangeLogEntry.objects.using('site_a').filter(resource='orders', object_id=order.pk).exists())
+        
+        response = self.client.get('/api/orders/', HTTP_X_SITE='planta1')
+        self.assertEqual([row['numero_pc'] for row in response.json()['results']], ["PC001"])
+        response = self.client.get('/api/orders/', HTTP_X_SITE='planta2')
+        self.assertEqual([row['numero_pc'] for row in response.json()['results']], ["PC002"])
+        response = self.client.get('/api/orders/', HTTP_HOST='planta1.local')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(self.client.get('/api/orders/', HTTP_X_SITE='outra').status_code, 400)
+    
+    def test_lookup_cache_per_site(self):
+        """O cache da consulta por código não devolve o registro de outro site"""
+        from .lookup import clear_cache
+        from .routing import use_site
+        
+        clear_cache()
+        self.addCleanup(clear_cache)
+        with use_site('planta1'):
+            self.create_order("PCX")
+        
+        first = self.client.get('/api/lookup/', {'code': 'PCX'}, HTTP_X_SITE='planta1')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/lookup/', {'code': 'PCX'}, HTTP_X_SITE='planta1')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/lookup/', {'code': 'PCX'}, HTTP_X_SITE='planta2').status_code, 404)
+    
+    def test_job_runs_on_site_that_queued_it(self):
+        """A tarefa enfileirada com X-Site roda no banco daquele site"""
+        from django.contrib.auth.models import User
+        from . import jobs
+        from .models import Job
+        from .routing import use_site
+        
+        jobs.JOBS['test_count'] = lambda ctx: {'orders': PurchaseOrder.objects.count()}
+        self.addCleanup(jobs.JOBS.pop, 'test_count')
+        with use_site('planta2'):
+            self.create_order("PC001", armazenamento="02")
+        
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin123"))
+        created = self.client.post('/api/jobs/', {'kind': 'test_count'}, content_type='application/json',
+                                   HTTP_X_SITE='planta2')
+        self.assertEqual(created.json()['site'], 'planta2')
+        jobs.work(drain=True)
+        self.assertEqual(Job.objects.get(pk=created.json()['id']).result, {'orders': 1})
+    
+    def test_measurements_and_purge_use_site_database(self):
+        """Consultas lentas, latência e purge alcançam o banco do site, não só o catálogo"""
+        from .models import SlowQuery
+        from .purge import purge_all
+        from .routing import use_site
+        from .throttling import latency
+        
+        with use_site('planta1'):
+            self.create_order("PC001")
+        with use_site('planta2'):
+            self.create_order("PC002", armazenamento="02")
+        
+        latency.reset()
+        self.addCleanup(latency.reset)
+        with self.settings(SLOW_QUERY_LOG_ENABLED=True, SLOW_QUERY_THRESHOLD_MS=0, RESPONSE_CACHE_ENABLED=False):
+            self.client.get('/api/orders/', HTTP_X_SITE='planta1')
+        self.assertIsNotNone(latency.current())
+        entry = SlowQuery.objects.filter(sql__contains='orders_purchaseorder', sql__startswith='SELECT').first()
+        self.assertIsNotNone(entry)
+        self.assertTrue(entry.plan)
+        
+        with use_site('planta1'):
+            counts = purge_all()
+        self.assertEqual(counts['orders_purchaseorder'], 1)
+        self.assertFalse(PurchaseOrder.objects.using('site_a').exists())
+        self.assertFalse(Supplier.objects.using('site_a').exists())
+        self.assertEqual(PurchaseOrder.objects.using('site_b').count(), 1)
+    
+    def test_global_stats(self):
+        """As estatísticas globais somam os sites e trazem o detalhe de cada um"""
+        from .routing import use_site
+        
+        yesterday = date.today() - timedelta(days=1)
+        with use_site('planta1'):
+            self.create_order("PC001")
+            self.create_order("PC002", followup=yesterday)
+        with use_site('planta2'):
+            self.create_order("PC003", armazenamento="02")
+        
+        data = self.client.get('/api/stats/global/').json()
+        self.assertEqual((data['previsto_hoje'], data['atrasada']), (2, 1))
+        self.assertEqual(data['sites']['planta1']['previsto_hoje'], 1)
+        self.assertEqual(data['sites']['planta2']['previsto_hoje'], 1)
+        self.assertEqual(self.client.get('/api/stats/', HTTP_X_SITE='planta2').json()['atrasada'], 0)
+
+
+class PerformanceTest(SeededTestCase):
+    """Testes com volume: a massa é semeada uma vez por processo e restaurada antes de cada teste"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from .throttling import _memory_buckets
+        cache.clear()
+        _memory_buckets.clear()
+    
+    def cancel_everything(self):
+        """Confere a massa intacta e a altera; o outro teste a encontra restaurada"""
+        self.assertEqual(PurchaseOrder.objects.count(), 5000)
+        self.assertLess(PurchaseOrder.objects.filter(status='CANCELADO').count(), 5000)
+        PurchaseOrder.objects.update(status='CANCELADO')
+        Supplier.objects.filter(status='INATIVO').update(name="ALTERADO")
+    
+    def test_restored_before_each_test(self):
+        """O banco volta à massa semeada antes de cada teste"""
+        self.cancel_everything()
+    
+    def test_restored_before_each_test_again(self):
+        """O banco volta à massa semeada antes de cada teste (par do teste acima)"""
+        self.cancel_everything()
+    
+    def test_dashboard_stats_over_dataset(self):
+        """As estatísticas do dashboard batem com as contagens diretas no banco"""
+        today = date.today()
+        data = self.client.get('/api/stats/').json()
+        self.assertEqual(data['atrasada'], PurchaseOrder.objects.filter(
+            followup_date__lt=today, status__in=['PENDENTE', 'PARCIAL']).count())
+        self.assertGreater(data['atrasada'], 0)
+    
+    def test_order_list_queries_do_not_grow_with_page(self):
+        """A listagem de pedidos faz as mesmas consultas para 10 ou 100 linhas"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        counts = []
+        for page_size in (10, 100):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/orders/', {'page_size': page_size})
+            self.assertEqual(len(response.json()['results']), page_size)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+    
+    def test_scorecards_cover_dataset(self):
+        """Os indicadores reconstruídos na semeadura cobrem todos os pedidos não cancelados"""
+        from django.db.models import Sum
+        from .models import SupplierScorecard
+        
+        total = SupplierScorecard.objects.aggregate(total=Sum('orders_total'))['total']
+        self.assertEqual(total, PurchaseOrder.objects.exclude(status='CANCELADO').count())
+    
+    @skipUnless(forecast_available(), "numpy não instalado")
+    def test_forecast_over_history(self):
+        """A previsão usa o histórico de dois anos e traz uma série por armazém"""
+        from .forecast import forecast
+        
+        result = forecast('receipts', days=7)
+        self.assertEqual([series['key'] for series in result['series']], ['01', '02', '03', '04', '05'])
+        self.assertEqual(len(result['dates']), 7)
+
+
+class TestRunnerTimingTest(TestCase):
+    """Testes do runner: processos paralelos e histórico do tempo total"""
+    
+    def test_parallel_from_settings(self):
+        """TEST_PARALLEL vale quando --parallel não é informado"""
+        from .testing import FastTestRunner
+        
+        with override_settings(TEST_PARALLEL=3):
+            self.assertEqual(FastTestRunner().parallel, 3)
+            self.assertEqual(FastTestRunner(parallel=1).parallel, 1)
+            self.assertEqual(FastTestRunner(pdb=True).parallel, 0)
+    
+    def test_timing_history_and_target(self):
+        """Cada execução completa é registrada e comparada com a meta"""
+        import logging
+        import tempfile
+        import unittest
+        from pathlib import Path
+        from .testing import FastTestRunner, load_timings
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'timings.jsonl'
+            with override_settings(TEST_TIMINGS_FILE=path, TEST_TARGET_SECONDS=10):
+                runner = FastTestRunner(parallel=2, logger=logging.getLogger('orders.tests.runner'))
+                runner.result = unittest.TestResult()
+                runner.result.testsRun = 90
+                with self.assertLogs('orders.tests.runner') as logs:
+                    runner.report_timing(8.0, 0)
+                    runner.report_timing(12.5, 1)
+                
+                timings = load_timings(path)
+        
+        self.assertEqual([(t['seconds'], t['tests'], t['failed'], t['processes']) for t in timings],
+                         [(8.0, 90, 0, 2), (12.5, 90, 1, 2)])
+        output = '\n'.join(logs.output)
+        self.assertIn('Execuções anteriores: 8.0 s', output)
+        self.assertEqual(output.count('Acima da meta'), 1)
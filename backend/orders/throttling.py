@@ -0,0 +1,215 @@
+"""
+Limite de requisições por cliente e proteção do banco sob carga.
+
+TokenBucketThrottle (throttle do DRF) mantém um balde de fichas por
+cliente (usuário autenticado ou IP) e rota. Cada requisição gasta uma
+ficha; o balde se recompõe à taxa do orçamento até a capacidade. As rotas
+de THROTTLE_ROUTES usam orçamentos próprios (ex.: estatísticas e health
+check); as demais, o orçamento "default", com um balde por rota. Sem
+fichas, a resposta é 429 com Retry-After.
+
+O estado dos baldes fica na memória do processo (um dicionário, sem I/O)
+ou, com THROTTLE_CACHE_ALIAS, num cache compartilhado entre os processos.
+No cache a leitura e a gravação do balde não são atômicas: sob disputa,
+o limite é aproximado.
+
+LoadSheddingMiddleware cronometra as consultas de cada requisição, em todos
+os bancos (catálogo e sites), e mantém a média móvel (EWMA) da latência
+no processo. Acima de LOAD_SHED_LATENCY_MS, as rotas da API respondem 429
+sem chegar à view,
+exceto as de LOAD_SHED_EXEMPT: o health check continua consultando o banco
+(e serve de sonda) e as estatísticas devolvem a última resposta em cache.
+Sem novas amostras por LOAD_SHED_WINDOW segundos, a média deixa de valer.
+"""
+
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+from .routing import execute_wrapper
+
+DEFAULT_BUDGETS = {'default': (10, 50)}
+
+
+class MemoryBuckets:
+    """
+    Baldes na memória do processo. Como no cache, um balde vale até estar
+    cheio de novo: a partir daí equivale a um balde novo e é descartado na
+    varredura, feita durante take() a cada `sweep_interval` segundos.
+    """
+
+    def __init__(self, sweep_interval=60):
+        self.sweep_interval = sweep_interval
+        # {chave: (fichas, atualizado em, cheio em)}
+        self._buckets = {}
+        self._next_sweep = None
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, capacity, now):
+        with self._lock:
+            if self._next_sweep is None or now >= self._next_sweep:
+                self._sweep(now)
+            tokens, updated, _full = self._buckets.get(key, (capacity, now, now))
+            tokens, wait = _refill_and_take(tokens, updated, rate, capacity, now)
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return wait
+
+    def _sweep(self, now):
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self._next_sweep = now + self.sweep_interval
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._next_sweep = None
+
+
+class CacheBuckets:
+    """Baldes num cache do Django, compartilhados entre processos"""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, key, rate, capacity, now):
+        cache = caches[self.alias]
+        cache_key = f'throttle:{key}'
+        tokens, updated = cache.get(cache_key) or (capacity, now)
+        tokens, wait = _refill_and_take(tokens, updated, rate, capacity, now)
+        # Expira quando o balde estaria cheio de novo
+        cache.set(cache_key, (tokens, now), math.ceil((capacity - tokens) / rate) + 1)
+        return wait
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+def _refill_and_take(tokens, updated, rate, capacity, now):
+    """Recompõe o balde e tenta gastar uma ficha: (fichas, espera em segundos)"""
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+_memory_buckets = MemoryBuckets()
+
+
+def get_buckets():
+    alias = getattr(settings, 'THROTTLE_CACHE_ALIAS', None)
+    return CacheBuckets(alias) if alias else _memory_buckets
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return (match.url_name or match.view_name) if match else request.path
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Balde de fichas por cliente e rota (THROTTLE_BUDGETS, THROTTLE_ROUTES)"""
+
+    def get_client(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.delay = 0
+        if not getattr(settings, 'THROTTLE_ENABLED', True):
+            return True
+
+        route = route_name(request)
+        scope = getattr(settings, 'THROTTLE_ROUTES', {}).get(route, 'default')
+        budgets = getattr(settings, 'THROTTLE_BUDGETS', DEFAULT_BUDGETS)
+        rate, capacity = budgets.get(scope, budgets['default'])
+
+        key = f'{scope}:{route}:{self.get_client(request)}'
+        self.delay = get_buckets().take(key, rate, capacity, time.monotonic())
+        return self.delay == 0
+
+    def wait(self):
+        return math.ceil(self.delay) if self.delay else None
+
+
+class DatabaseLatency:
+    """Média móvel exponencial da duração das consultas, por processo"""
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.average_ms = 0.0
+        self.updated = None
+        self._lock = threading.Lock()
+
+    def add(self, duration_ms):
+        with self._lock:
+            if self.updated is None:
+                self.average_ms = duration_ms
+            else:
+                self.average_ms += self.alpha * (duration_ms - self.average_ms)
+            self.updated = time.monotonic()
+
+    def current(self):
+        """Média em ms, ou None sem amostras nos últimos LOAD_SHED_WINDOW segundos"""
+        window = getattr(settings, 'LOAD_SHED_WINDOW', 10)
+        with self._lock:
+            if self.updated is None or time.monotonic() - self.updated > window:
+                return None
+            return self.average_ms
+
+    def reset(self):
+        with self._lock:
+            self.average_ms = 0.0
+            self.updated = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add((time.perf_counter() - start) * 1000)
+
+
+latency = DatabaseLatency()
+
+
+def is_overloaded():
+    """Se o banco está lento demais e a API deve descartar carga"""
+    if not getattr(settings, 'LOAD_SHED_ENABLED', True):
+        return False
+    average = latency.current()
+    return average is not None and average > getattr(settings, 'LOAD_SHED_LATENCY_MS', 500)
+
+
+def retry_after():
+    """Segundos até a média atual deixar de valer"""
+    window = getattr(settings, 'LOAD_SHED_WINDOW', 10)
+    updated = latency.updated
+    remaining = window - (time.monotonic() - updated) if updated is not None else 0
+    return max(1, math.ceil(remaining))
+
+
+class LoadSheddingMiddleware:
+    """Mede a latência do banco e recusa requisições da API quando ela passa do limite"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'LOAD_SHED_ENABLED', True):
+            return self.get_response(request)
+        with execute_wrapper(latency):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not request.path.startswith('/api/') or not is_overloaded():
+            return None
+        if route_name(request) in getattr(settings, 'LOAD_SHED_EXEMPT', ['health-check', 'dashboard-stats']):
+            return None
+        response = JsonResponse({'detail': 'Servidor sobrecarregado. Tente novamente em instantes.'}, status=429)
+        response['Retry-After'] = str(retry_after())
+        return response
@@ -8,14 +8,48 @@ urlpatterns = [
     
     # Fornecedores
     path('suppliers/', views.SupplierListView.as_view(), name='supplier-list'),
+    path('suppliers/scorecards/', views.SupplierScorecardListView.as_view(), name='supplier-scorecards'),
     
     # Recebimentos
     path('deliveries/', views.DeliveryReceiptListView.as_view(), name='delivery-list'),
     
+    # Consulta por código de barras (PC, carga ou nota)
+    path('lookup/', views.barcode_lookup, name='barcode-lookup'),
+    
+    # Alteração de status em lote
+    path('bulk-status/', views.bulk_status, name='bulk-status'),
+    
+    # Fila de trabalho da doca
+    path('dock/claim/', views.dock_claim, name='dock-claim'),
+    path('dock/release/', views.dock_release, name='dock-release'),
+    path('dock/renew/', views.dock_renew, name='dock-renew'),
+    
+    # Sincronização incremental
+    path('changes/', views.changes_feed, name='changes-feed'),
+    
     # Estatísticas do dashboard
     path('stats/', views.dashboard_stats, name='dashboard-stats'),
+    path('stats/global/', views.global_stats, name='global-stats'),
+    
+    # Calendário de follow-up (carga prevista por dia)
+    path('calendar/', views.followup_calendar_view, name='followup-calendar'),
+    
+    # Previsão do volume de recebimento
+    path('forecast/', views.inbound_forecast, name='inbound-forecast'),
+    
+    # Várias requisições numa só chamada
+    path('batch/', views.batch, name='batch'),
     
     # Health check
     path('health/', views.health_check, name='health-check'),
+    
+    # Tarefas em segundo plano (somente administradores)
+    path('jobs/', views.job_list, name='job-list'),
+    path('jobs/<int:pk>/', views.job_detail, name='job-detail'),
+    path('jobs/<int:pk>/cancel/', views.job_cancel, name='job-cancel'),
+    
+    # Profiling (somente administradores)
+    path('profiles/', views.profile_list, name='profile-list'),
+    path('profiles/<int:pk>/', views.profile_detail, name='profile-detail'),
 ]
 
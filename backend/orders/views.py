@@ -1,19 +1,40 @@
 from rest_framework import generics, filters
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.db.models import Count, Q
 from datetime import date, timedelta
-from .models import PurchaseOrder, Supplier, DeliveryReceipt
-from .serializers import PurchaseOrderSerializer, SupplierSerializer, DeliveryReceiptSerializer
+from .models import (
+    PurchaseOrder, Supplier, DeliveryReceipt, PurchaseOrderHistory, DeliveryReceiptHistory, Job, SupplierScorecard,
+)
+from .serializers import (
+    PurchaseOrderSerializer, SupplierSerializer, DeliveryReceiptSerializer, DockReceiptSerializer, JobSerializer,
+    DeliveryReceiptImportSerializer, SupplierScorecardSerializer,
+)
+from .renderers import CompactJSONRenderer
+from .cache import (
+    CachedListMixin, TAG_ORDERS, TAG_SUPPLIERS, TAG_DELIVERIES, build_cache_key, get_cache, get_or_compute,
+)
+from . import dock, forecast, jobs, lookup, profiling, routing, throttling
+from .sync import changes_since, current_cursor
+from .batch import BatchError, parse_batch, reference_date, run_batch
+from .archive import include_archived
+from .bulk import BulkStatusError, VersionConflict, apply_bulk_status, parse_bulk_status
+from .duplicates import DuplicateInvoice, create_receipts
+from .followup import FILTERS as CALENDAR_FILTERS, CalendarError, followup_calendar, parse_days
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 11
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class PurchaseOrderListView(generics.ListAPIView):
+class PurchaseOrderListView(CachedListMixin, generics.ListAPIView):
+    cache_prefix = 'orders'
+    cache_tags = (TAG_ORDERS, TAG_SUPPLIERS)
     queryset = PurchaseOrder.objects.select_related('fornecedor').all()
     serializer_class = PurchaseOrderSerializer
     pagination_class = StandardResultsSetPagination
@@ -22,24 +43,109 @@ class PurchaseOrderListView(generics.ListAPIView):
     search_fields = ['numero_pc', 'fornecedor__name', 'fornecedor__code']
     ordering_fields = ['data_emissao', 'followup_date', 'numero_pc']
     ordering = ['-data_emissao']
+    renderer_classes = [JSONRenderer, CompactJSONRenderer]
+    
+    def get_selected_fields(self):
+        if not hasattr(self, '_selected_fields'):
+            self._selected_fields = self.serializer_class.select_fields(self.request.query_params)
+        return self._selected_fields
+    
+    def get_queryset(self):
+        # ?include_archived=1 consulta a view com os pedidos ativos e arquivados
+        model = PurchaseOrderHistory if include_archived(self.request) else PurchaseOrder
+        selected = self.get_selected_fields()
+        if selected is None:
+            return model.objects.select_related('fornecedor')
+        
+        # Carrega apenas as colunas usadas; sem fornecedor, nem faz o JOIN
+        sources = self.serializer_class.Meta.field_sources
+        columns = {'id'} | {column for field in selected for column in sources[field]}
+        queryset = model.objects.all()
+        if 'fornecedor' in selected:
+            queryset = queryset.select_related('fornecedor')
+        return queryset.only(*columns)
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['selected_fields'] = self.get_selected_fields()
+        return context
 
 class PurchaseOrderDetailView(generics.RetrieveAPIView):
     queryset = PurchaseOrder.objects.select_related('fornecedor').all()
     serializer_class = PurchaseOrderSerializer
+    
+    def get_queryset(self):
+        if include_archived(self.request):
+            return PurchaseOrderHistory.objects.select_related('fornecedor')
+        return super().get_queryset()
 
-class SupplierListView(generics.ListAPIView):
+class SupplierListView(CachedListMixin, generics.ListAPIView):
+    cache_prefix = 'suppliers'
+    cache_tags = (TAG_SUPPLIERS,)
     queryset = Supplier.objects.filter(status='ATIVO').order_by('name')
     serializer_class = SupplierSerializer
 
-class DeliveryReceiptListView(generics.ListAPIView):
+class SupplierScorecardListView(generics.ListAPIView):
+    """
+    Ranking dos fornecedores pelos indicadores gravados (?ordering=), sem
+    agregação na requisição. ?min_orders= exige um mínimo de pedidos entregues.
+    """
+    serializer_class = SupplierScorecardSerializer
+    pagination_class = StandardResultsSetPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['on_time_rate', 'avg_delay_days', 'p95_delay_days', 'partial_ratio',
+                       'avg_dwell_minutes', 'orders_delivered', 'orders_total']
+    ordering = ['-on_time_rate', 'supplier']
+    
+    def get_queryset(self):
+        try:
+            min_orders = int(self.request.query_params.get('min_orders', 1))
+        except ValueError:
+            min_orders = 1
+        return (SupplierScorecard.objects.select_related('supplier')
+                .filter(orders_delivered__gte=min_orders))
+
+class DeliveryReceiptListView(CachedListMixin, generics.ListCreateAPIView):
+    cache_prefix = 'deliveries'
+    cache_tags = (TAG_DELIVERIES, TAG_SUPPLIERS)
     queryset = DeliveryReceipt.objects.select_related('supplier').all()
     serializer_class = DeliveryReceiptSerializer
     pagination_class = StandardResultsSetPagination
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    
+    def get_queryset(self):
+        if include_archived(self.request):
+            return DeliveryReceiptHistory.objects.select_related('supplier')
+        return super().get_queryset()
+    
+    def create(self, request, *args, **kwargs):
+        """Recebe um recebimento ou uma lista; notas duplicadas recusam o lote inteiro"""
+        many = isinstance(request.data, list)
+        max_rows = getattr(settings, 'RECEIPT_CREATE_MAX_ROWS', 500)
+        if many and len(request.data) > max_rows:
+            return Response({'detail': f'No máximo {max_rows} recebimentos por lote.'}, status=400)
+        
+        serializer = DeliveryReceiptImportSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data if many else [serializer.validated_data]
+        
+        suppliers = Supplier.objects.in_bulk({row['supplier_id'] for row in rows})
+        unknown = sorted({row['supplier_id'] for row in rows} - set(suppliers))
+        if unknown:
+            return Response({'detail': f"Fornecedores inexistentes: {', '.join(map(str, unknown))}"}, status=400)
+        
+        try:
+            created = create_receipts([DeliveryReceipt(**row) for row in rows])
+        except DuplicateInvoice as e:
+            return Response({'detail': 'Notas já recebidas ou repetidas; nada foi gravado.',
+                             'duplicates': e.duplicates}, status=409)
+        for receipt in created:
+            receipt.supplier = suppliers[receipt.supplier_id]
+        data = DeliveryReceiptSerializer(created, many=True).data
+        return Response(data if many else data[0], status=201)
 
-@api_view(['GET'])
-def dashboard_stats(request):
-    """Endpoint para estatísticas do dashboard"""
-    today = date.today()
+def dashboard_counts(today):
+    """Contagens do dashboard no banco do site atual"""
     tomorrow = today + timedelta(days=1)
     
     # Pedidos previstos para hoje
@@ -66,14 +172,199 @@ def dashboard_stats(request):
         status='FINALIZADO'
     ).count()
     
-    return Response({
+    return {
         'previsto_hoje': previsto_hoje,
         'atrasada': atrasada,
         'previsto_amanha': previsto_amanha,
         'finalizado': finalizado,
-        'data_atualizacao': today.isoformat()
+    }
+
+@api_view(['GET'])
+def dashboard_stats(request):
+    """Endpoint para estatísticas do dashboard"""
+    today = reference_date(request)
+    
+    # Banco sobrecarregado: devolve a última resposta calculada do dia
+    stale_key = f'resp-stale:stats:{routing.current_site()}:{today.isoformat()}'
+    if throttling.is_overloaded():
+        data = get_cache().get(stale_key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'STALE'
+            return response
+    
+    data = {**dashboard_counts(today), 'data_atualizacao': today.isoformat()}
+    get_cache().set(stale_key, data, 86400)
+    return Response(data)
+
+@api_view(['GET'])
+def global_stats(request):
+    """Estatísticas do dashboard somadas de todos os sites, com o detalhe de cada um"""
+    today = reference_date(request)
+    by_site = routing.for_each_site(lambda: dashboard_counts(today))
+    totals = {name: sum(counts[name] for counts in by_site.values()) for name in next(iter(by_site.values()))}
+    return Response({**totals, 'data_atualizacao': today.isoformat(), 'sites': by_site})
+
+@api_view(['GET'])
+def followup_calendar_view(request):
+    """Pedidos em aberto e itens previstos por dia de follow-up, a partir de hoje"""
+    try:
+        days = parse_days(request.query_params.get('days'))
+    except CalendarError as e:
+        return Response({'detail': str(e)}, status=400)
+    start = reference_date(request)
+    group_by = request.query_params.get('group_by') or None
+    filters = {name: request.query_params[name] for name in CALENDAR_FILTERS if request.query_params.get(name)}
+    
+    def compute():
+        return {'start': start.isoformat(), 'days': days,
+                'calendar': followup_calendar(start, days, group_by, filters)}
+    
+    try:
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+            return Response(compute())
+        # A data inicial entra na chave: o calendário é recalculado a cada dia
+        params = request.query_params.copy()
+        params['start'] = start.isoformat()
+        data, hit = get_or_compute(build_cache_key('calendar', params, (TAG_ORDERS, TAG_SUPPLIERS)), compute)
+    except CalendarError as e:
+        return Response({'detail': str(e)}, status=400)
+    response = Response(data)
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+@api_view(['GET'])
+def inbound_forecast(request):
+    """Previsão do volume diário por armazém (ou fornecedor) para os próximos dias"""
+    if not forecast.is_available():
+        return Response({'detail': 'Previsão indisponível: instale o pacote numpy.'}, status=503)
+    
+    measure = request.query_params.get('measure', 'receipts')
+    group_by = request.query_params.get('group_by', 'armazenamento')
+    max_days = getattr(settings, 'FORECAST_MAX_DAYS', 90)
+    try:
+        days = int(request.query_params.get('days', getattr(settings, 'FORECAST_DAYS', 14)))
+    except ValueError:
+        return Response({'detail': 'days deve ser um inteiro.'}, status=400)
+    if not 1 <= days <= max_days:
+        return Response({'detail': f'days deve estar entre 1 e {max_days}.'}, status=400)
+    if measure not in forecast.MEASURES or group_by not in forecast.GROUPINGS:
+        return Response({'detail': f"Use measure={'|'.join(forecast.MEASURES)} "
+                                   f"e group_by={'|'.join(forecast.GROUPINGS)}."}, status=400)
+    
+    today = reference_date(request)
+    
+    def compute():
+        return forecast.forecast(measure, days, group_by, today=today)
+    
+    # Vale até chegar um dado novo (troca das tags) ou virar o dia
+    params = request.query_params.copy()
+    params['start'] = today.isoformat()
+    key = build_cache_key('forecast', params, (TAG_ORDERS, TAG_DELIVERIES, TAG_SUPPLIERS))
+    data, hit = get_or_compute(key, compute, getattr(settings, 'FORECAST_CACHE_TIMEOUT', 86400))
+    response = Response(data)
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+@api_view(['GET'])
+def changes_feed(request):
+    """Alterações e exclusões desde o cursor informado em ?since="""
+    # ?since=latest devolve apenas o cursor atual, sem alterações
+    if request.query_params.get('since') == 'latest':
+        return Response({'cursor': current_cursor()})
+    
+    try:
+        cursor = int(request.query_params.get('since', 0))
+        limit = int(request.query_params.get('limit', 500))
+    except ValueError:
+        return Response({'detail': 'Parâmetros since e limit devem ser inteiros.'}, status=400)
+    
+    limit = max(1, min(limit, 1000))
+    return Response(changes_since(max(cursor, 0), limit))
+
+@api_view(['POST'])
+def batch(request):
+    """Executa várias requisições GET da API numa única chamada"""
+    try:
+        items = parse_batch(request.data)
+    except BatchError as e:
+        return Response({'detail': str(e)}, status=400)
+    
+    return Response({'responses': run_batch(request._request, items)})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_status(request):
+    """Altera o status de vários pedidos e recebimentos numa única transação"""
+    try:
+        changes = parse_bulk_status(request.data)
+    except BulkStatusError as e:
+        return Response({'detail': str(e)}, status=400)
+    
+    try:
+        updated = apply_bulk_status(changes)
+    except VersionConflict as e:
+        return Response({'detail': 'Registros alterados por outra pessoa; nada foi gravado.',
+                         'conflicts': e.conflicts}, status=409)
+    return Response({'updated': updated})
+
+@api_view(['GET'])
+def barcode_lookup(request):
+    """Pedidos e recebimentos cujo número PC, carga ou nota é exatamente ?code="""
+    code = lookup.normalize_code(request.query_params.get('code'))
+    if not code:
+        return Response({'detail': 'Informe o código em ?code=.'}, status=400)
+    if len(code) > lookup.MAX_CODE_LENGTH:
+        return Response({'detail': 'Código não encontrado.'}, status=404)
+    
+    result, hit = lookup.lookup(code)
+    if not result['orders'] and not result['deliveries']:
+        return Response({'detail': 'Código não encontrado.'}, status=404)
+    response = Response(result)
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+def _receipt_ids(request):
+    ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+        return None
+    return ids
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dock_claim(request):
+    """Reserva os próximos recebimentos pendentes para o operador"""
+    try:
+        count = int(request.data.get('count', 1))
+    except (TypeError, ValueError):
+        return Response({'detail': 'count deve ser um inteiro.'}, status=400)
+    
+    count = max(1, min(count, getattr(settings, 'DOCK_CLAIM_MAX', 50)))
+    receipts = dock.claim(request.user.get_username(), count)
+    return Response({
+        'receipts': DockReceiptSerializer(receipts, many=True).data,
+        'lease_seconds': int(dock.lease_duration().total_seconds()),
     })
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dock_release(request):
+    """Devolve à fila (ou finaliza, com "complete") recebimentos reservados"""
+    ids = _receipt_ids(request)
+    if ids is None:
+        return Response({'detail': 'Envie {"ids": [...]}.'}, status=400)
+    released = dock.release(request.user.get_username(), ids, complete=bool(request.data.get('complete')))
+    return Response({'released': released})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dock_renew(request):
+    """Estende o prazo das reservas do operador"""
+    ids = _receipt_ids(request)
+    if ids is None:
+        return Response({'detail': 'Envie {"ids": [...]}.'}, status=400)
+    return Response({'renewed': dock.renew(request.user.get_username(), ids)})
+
 @api_view(['GET'])
 def health_check(request):
     """Health check para monitoramento"""
@@ -81,9 +372,12 @@ def health_check(request):
         # Verificar conectividade com banco
         count = PurchaseOrder.objects.count()
         
+        # Latência média das consultas neste processo (orders/throttling.py)
+        latency_ms = throttling.latency.current()
         return Response({
-            'status': 'healthy',
+            'status': 'degraded' if throttling.is_overloaded() else 'healthy',
             'database': 'connected',
+            'database_latency_ms': round(latency_ms, 1) if latency_ms is not None else None,
             'total_orders': count,
             'timestamp': date.today().isoformat()
         })
@@ -92,4 +386,61 @@ def health_check(request):
             'status': 'unhealthy',
             'error': str(e),
             'timestamp': date.today().isoformat()
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminUser])
+def job_list(request):
+    """Últimas tarefas; POST enfileira uma nova ({"kind": ..., "params": {...}})"""
+    if request.method == 'POST':
+        params = request.data.get('params') or {}
+        if not isinstance(params, dict):
+            return Response({'detail': 'params deve ser um objeto.'}, status=400)
+        try:
+            job = jobs.enqueue(request.data.get('kind'), params)
+        except ValueError as e:
+            return Response({'detail': str(e), 'kinds': sorted(jobs.JOBS)}, status=400)
+        return Response(JobSerializer(job).data, status=202)
+    
+    queryset = Job.objects.all()
+    if request.query_params.get('status'):
+        queryset = queryset.filter(status=request.query_params['status'])
+    return Response(JobSerializer(queryset[:50], many=True).data)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def job_detail(request, pk):
+    """Status, progresso e resultado da tarefa"""
+    job = Job.objects.filter(pk=pk).first()
+    if job is None:
+        return Response({'detail': 'Tarefa não encontrada.'}, status=404)
+    return Response(JobSerializer(job).data)
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def job_cancel(request, pk):
+    """Cancela a tarefa na fila ou pede a interrupção da que está em execução"""
+    if not Job.objects.filter(pk=pk).exists():
+        return Response({'detail': 'Tarefa não encontrada.'}, status=404)
+    if not jobs.cancel(pk):
+        return Response({'detail': 'A tarefa já terminou.'}, status=409)
+    return Response(JobSerializer(Job.objects.get(pk=pk)).data)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """Lista os últimos perfis capturados (sem a árvore de chamadas)"""
+    summaries = [
+        {key: value for key, value in profile.items() if key not in ('top_functions', 'call_tree')}
+        for profile in profiling.store.all()
+    ]
+    return Response(summaries)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_detail(request, pk):
+    """Perfil completo: fases, funções mais custosas e árvore de chamadas"""
+    profile = profiling.store.get(pk)
+    if profile is None:
+        return Response({'detail': 'Perfil não encontrado.'}, status=404)
+    return Response(profile)
@@ -2,32 +2,31 @@ import React, { useState } from 'react';
 import Header from './components/Header/Header';
 import Dashboard from './components/Dashboard/Dashboard';
 import OrderTable from './components/OrderTable/OrderTable';
-import { useStats, useOrders, useOnlineStatus } from './hooks/useApi';
+import { useDashboard, useOnlineStatus } from './hooks/useApi';
 import './App.css';
 
 function App() {
   const [currentPage, setCurrentPage] = useState(1);
   const [filters, setFilters] = useState({});
   
-  // Hooks para dados da API
-  const { data: stats, loading: statsLoading, error: statsError, refetch: refetchStats } = useStats({
-    refreshInterval: 30000 // 30 segundos
-  });
-  
-  const { data: orders, loading: ordersLoading, error: ordersError, refetch: refetchOrders } = useOrders({
+  // Estatísticas e pedidos numa única requisição (/api/batch/)
+  const { stats, orders, loading, error, refetch } = useDashboard({
     page: currentPage,
     ...filters
   }, {
-    refreshInterval: 60000 // 1 minuto
+    refreshInterval: 30000 // 30 segundos
   });
+  const statsLoading = loading;
+  const ordersLoading = loading;
+  const statsError = error;
+  const ordersError = error;
   
   const isOnline = useOnlineStatus();
 
   // Função para refresh geral
   const handleRefresh = () => {
     console.log('🔄 Atualizando dados...');
-    refetchStats();
-    refetchOrders();
+    refetch();
   };
 
   // Função para mudança de página
@@ -1,17 +1,21 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 
 // Serviço de API simples
-const API_BASE_URL = 'http://localhost:8000/api';
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+const SITE = import.meta.env.VITE_SITE;
 
 const apiRequest = async (endpoint, options = {}) => {
   const url = `${API_BASE_URL}${endpoint}`;
   
   try {
     const response = await fetch(url, {
+      ...options,
       headers: {
         'Content-Type': 'application/json',
+        // Planta atendida por este frontend (vários sites, um banco por site)
+        ...(SITE ? { 'X-Site': SITE } : {}),
+        ...options.headers,
       },
-      ...options,
     });
     
     if (!response.ok) {
@@ -58,30 +62,116 @@ export function useStats(options = {}) {
   return { data, loading, error, refetch: fetchStats };
 }
 
+// Várias requisições GET numa única chamada a /batch/
+const batchRequest = async (requests) => {
+  const { responses } = await apiRequest('/batch/', {
+    method: 'POST',
+    body: JSON.stringify({ requests }),
+  });
+  
+  const bodies = {};
+  Object.entries(responses).forEach(([id, response]) => {
+    if (response.status >= 400) {
+      throw new Error(`HTTP error! status: ${response.status} (${id})`);
+    }
+    bodies[id] = response.body;
+  });
+  return bodies;
+};
+
+const buildOrdersPath = (params) => {
+  const searchParams = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      searchParams.append(key, value);
+    }
+  });
+  
+  const queryString = searchParams.toString();
+  return queryString ? `/orders/?${queryString}` : '/orders/';
+};
+
+// Campos dos pedidos de que dependem os filtros e a busca da listagem
+const FILTER_FIELDS = {
+  status: ['status'],
+  fornecedor__code: ['fornecedor'],
+  armazenamento: ['armazenamento'],
+  search: ['numero_pc', 'fornecedor'],
+};
+const DEFAULT_ORDERING = '-data_emissao';
+
+// Campos que, se mudarem, podem tirar o pedido da página ou mudar sua posição
+const dependentFields = (params = {}) => {
+  const fields = new Set();
+  Object.entries(FILTER_FIELDS).forEach(([param, names]) => {
+    if (params[param]) {
+      names.forEach((name) => fields.add(name));
+    }
+  });
+  (params.ordering || DEFAULT_ORDERING).split(',').forEach((key) => {
+    fields.add(key.trim().replace(/^-/, ''));
+  });
+  return [...fields];
+};
+
+// Aplica o feed de /changes/ à página atual. Retorna null quando a alteração
+// não pode ser aplicada no lugar e a página precisa ser recarregada
+const applyOrderChanges = (page, feed, params = {}) => {
+  if (!page || feed.has_more || feed.changed.suppliers.length > 0) {
+    return null;
+  }
+  
+  const currentById = new Map(page.results.map((order) => [order.id, order]));
+  const fields = dependentFields(params);
+  const movesRow = (order) => fields.some(
+    (field) => JSON.stringify(order[field]) !== JSON.stringify(currentById.get(order.id)[field]),
+  );
+  const changedOrders = feed.changed.orders;
+  // Um pedido novo na página, excluído fora dela (o total muda) ou que
+  // deixou de atender o filtro ou a ordenação exige recarregar
+  const needsReload = changedOrders.some((order) => !currentById.has(order.id) || movesRow(order))
+    || feed.deleted.orders.some((id) => !currentById.has(id));
+  
+  if (needsReload) {
+    return null;
+  }
+  if (changedOrders.length === 0 && feed.deleted.orders.length === 0) {
+    return page;
+  }
+  
+  const byId = new Map(changedOrders.map((order) => [order.id, order]));
+  const deleted = new Set(feed.deleted.orders);
+  return {
+    ...page,
+    count: page.count - deleted.size,
+    results: page.results
+      .filter((order) => !deleted.has(order.id))
+      .map((order) => byId.get(order.id) || order),
+  };
+};
+
 export function useOrders(params = {}, options = {}) {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  // Cursor da sincronização incremental (/changes/)
+  const cursorRef = useRef(null);
 
   const fetchOrders = async () => {
     try {
       setLoading(true);
       setError(null);
       
-      const searchParams = new URLSearchParams();
-      Object.entries(params).forEach(([key, value]) => {
-        if (value !== undefined && value !== null && value !== '') {
-          searchParams.append(key, value);
-        }
-      });
-      
-      const queryString = searchParams.toString();
-      const endpoint = queryString ? `/orders/?${queryString}` : '/orders/';
-      
+      const endpoint = buildOrdersPath(params);
       console.log('📋 Buscando pedidos:', endpoint);
-      const result = await apiRequest(endpoint);
-      console.log('📋 Pedidos recebidos:', result);
-      setData(result);
+      // Cursor lido antes da página, para não perder alterações no meio
+      const result = await batchRequest([
+        { id: 'cursor', path: '/api/changes/?since=latest' },
+        { id: 'orders', path: `/api${endpoint}` },
+      ]);
+      console.log('📋 Pedidos recebidos:', result.orders);
+      cursorRef.current = result.cursor.cursor;
+      setData(result.orders);
     } catch (err) {
       console.error('❌ Erro ao buscar pedidos:', err);
       setError(err.message);
@@ -90,11 +180,33 @@ export function useOrders(params = {}, options = {}) {
     }
   };
 
+  // Busca apenas o que mudou desde o último cursor
+  const pollChanges = async () => {
+    if (cursorRef.current === null) {
+      return fetchOrders();
+    }
+    
+    try {
+      const feed = await apiRequest(`/changes/?since=${cursorRef.current}&limit=200`);
+      const patched = applyOrderChanges(data, feed, params);
+      if (patched === null) {
+        return fetchOrders();
+      }
+      cursorRef.current = feed.cursor;
+      setData(patched);
+    } catch (err) {
+      console.error('❌ Erro ao sincronizar pedidos:', err);
+    }
+  };
+
+  const pollRef = useRef(pollChanges);
+  pollRef.current = pollChanges;
+
   useEffect(() => {
     fetchOrders();
     
     if (options.refreshInterval) {
-      const interval = setInterval(fetchOrders, options.refreshInterval);
+      const interval = setInterval(() => pollRef.current(), options.refreshInterval);
       return () => clearInterval(interval);
     }
   }, [JSON.stringify(params), options.refreshInterval]);
@@ -102,6 +214,77 @@ export function useOrders(params = {}, options = {}) {
   return { data, loading, error, refetch: fetchOrders };
 }
 
+// Estatísticas e pedidos do dashboard numa única requisição (/batch/)
+export function useDashboard(params = {}, options = {}) {
+  const [stats, setStats] = useState(null);
+  const [orders, setOrders] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const cursorRef = useRef(null);
+  const ordersRef = useRef(null);
+  ordersRef.current = orders;
+
+  const fetchDashboard = async () => {
+    try {
+      setLoading(true);
+      setError(null);
+      
+      const result = await batchRequest([
+        { id: 'stats', path: '/api/stats/' },
+        { id: 'cursor', path: '/api/changes/?since=latest' },
+        { id: 'orders', path: `/api${buildOrdersPath(params)}` },
+      ]);
+      console.log('📊 Dashboard recebido:', result);
+      cursorRef.current = result.cursor.cursor;
+      setStats(result.stats);
+      setOrders(result.orders);
+    } catch (err) {
+      console.error('❌ Erro ao buscar dashboard:', err);
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Atualização periódica: estatísticas + alterações desde o cursor
+  const pollDashboard = async () => {
+    if (cursorRef.current === null) {
+      return fetchDashboard();
+    }
+    
+    try {
+      const result = await batchRequest([
+        { id: 'stats', path: '/api/stats/' },
+        { id: 'changes', path: `/api/changes/?since=${cursorRef.current}&limit=200` },
+      ]);
+      setStats(result.stats);
+      
+      const patched = applyOrderChanges(ordersRef.current, result.changes, params);
+      if (patched === null) {
+        return fetchDashboard();
+      }
+      cursorRef.current = result.changes.cursor;
+      setOrders(patched);
+    } catch (err) {
+      console.error('❌ Erro ao atualizar dashboard:', err);
+    }
+  };
+
+  const pollRef = useRef(pollDashboard);
+  pollRef.current = pollDashboard;
+
+  useEffect(() => {
+    fetchDashboard();
+    
+    if (options.refreshInterval) {
+      const interval = setInterval(() => pollRef.current(), options.refreshInterval);
+      return () => clearInterval(interval);
+    }
+  }, [JSON.stringify(params), options.refreshInterval]);
+
+  return { stats, orders, loading, error, refetch: fetchDashboard };
+}
+
 export function useOnlineStatus() {
   const [isOnline, setIsOnline] = useState(navigator.onLine);
 
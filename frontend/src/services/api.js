@@ -1,4 +1,5 @@
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+const SITE = import.meta.env.VITE_SITE;
 
 class ApiService {
   async request(endpoint, options = {}) {
@@ -7,6 +8,8 @@ class ApiService {
     const config = {
       headers: {
         'Content-Type': 'application/json',
+        // Planta atendida por este frontend (vários sites, um banco por site)
+        ...(SITE ? { 'X-Site': SITE } : {}),
       },
       ...options,
     };
@@ -15,7 +18,11 @@ class ApiService {
       const response = await fetch(url, config);
       
       if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
+        const error = new Error(`HTTP error! status: ${response.status}`);
+        error.status = response.status;
+        // 429: limite de requisições ou servidor sobrecarregado; aguardar Retry-After segundos
+        error.retryAfter = Number(response.headers?.get('Retry-After')) || null;
+        throw error;
       }
       
       return await response.json();
@@ -30,6 +37,11 @@ class ApiService {
     return this.request('/stats/');
   }
 
+  // Estatísticas somadas de todos os sites, com o detalhe de cada um
+  async getGlobalStats() {
+    return this.request('/stats/global/');
+  }
+
   // Pedidos de compra
   async getOrders(params = {}) {
     const searchParams = new URLSearchParams();
@@ -52,6 +64,25 @@ class ApiService {
     return this.request('/suppliers/');
   }
 
+  // Ranking dos fornecedores; ordering: ex. '-on_time_rate', 'avg_delay_days'
+  async getSupplierScorecards({ ordering = '-on_time_rate', minOrders = 1, page = 1 } = {}) {
+    return this.request(`/suppliers/scorecards/?ordering=${ordering}&min_orders=${minOrders}&page=${page}`);
+  }
+
+  // Carga prevista por dia de follow-up; groupBy: 'armazenamento' ou 'fornecedor'
+  async getFollowupCalendar({ days = 30, groupBy, armazenamento, fornecedor } = {}) {
+    const params = new URLSearchParams({ days });
+    if (groupBy) params.set('group_by', groupBy);
+    if (armazenamento) params.set('armazenamento', armazenamento);
+    if (fornecedor) params.set('fornecedor__code', fornecedor);
+    return this.request(`/calendar/?${params}`);
+  }
+
+  // Previsão diária; measure: receipts | orders | items, groupBy: armazenamento | fornecedor
+  async getForecast({ days = 14, measure = 'receipts', groupBy = 'armazenamento' } = {}) {
+    return this.request(`/forecast/?days=${days}&measure=${measure}&group_by=${groupBy}`);
+  }
+
   // Health check
   async healthCheck() {
     return this.request('/health/');
@@ -62,6 +93,62 @@ class ApiService {
     return this.request(`/orders/${id}/`);
   }
 
+  // Pedidos/recebimentos com o número PC, carga ou nota lido pelo scanner
+  async lookupCode(code) {
+    return this.request(`/lookup/?code=${encodeURIComponent(code)}`);
+  }
+
+  // Alterações desde o cursor (sincronização incremental)
+  async getChanges(since, limit = 500) {
+    return this.request(`/changes/?since=${since}&limit=${limit}`);
+  }
+
+  // Várias requisições GET numa única chamada
+  async batch(requests) {
+    return this.request('/batch/', {
+      method: 'POST',
+      body: JSON.stringify({ requests }),
+    });
+  }
+
+  // Inclui recebimentos; notas já recebidas recusam o lote (409, "duplicates")
+  async createDeliveries(deliveries) {
+    return this.request('/deliveries/', {
+      method: 'POST',
+      body: JSON.stringify(deliveries),
+    });
+  }
+
+  // Status de vários pedidos/recebimentos: [{ id, status, version }]
+  async bulkStatus({ orders = [], deliveries = [] }) {
+    return this.request('/bulk-status/', {
+      method: 'POST',
+      body: JSON.stringify({ orders, deliveries }),
+    });
+  }
+
+  // Fila da doca: reserva, libera (ou finaliza) e renova recebimentos
+  async dockClaim(count = 1) {
+    return this.request('/dock/claim/', {
+      method: 'POST',
+      body: JSON.stringify({ count }),
+    });
+  }
+
+  async dockRelease(ids, complete = false) {
+    return this.request('/dock/release/', {
+      method: 'POST',
+      body: JSON.stringify({ ids, complete }),
+    });
+  }
+
+  async dockRenew(ids) {
+    return this.request('/dock/renew/', {
+      method: 'POST',
+      body: JSON.stringify({ ids }),
+    });
+  }
+
   // Recebimentos
   async getDeliveries(params = {}) {
     const searchParams = new URLSearchParams(params);